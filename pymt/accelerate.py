@@ -7,6 +7,7 @@ this module. It's designed to enhance performance of :
     * event dispatching (EventDispatcher class)
     * event traversal (Widget class, on_update and on_draw)
     * collide method (Widget class, collide_point)
+    * touch scaling (Touch class, scale_for_screen)
 
 Accelerate module use cython, and is activated by default, if cython is
 correctly installed. Please refer to http://www.cython.org/ about how
@@ -17,6 +18,10 @@ You can control the usage of accelerate module with env variable ::
     PYMT_USE_ACCELERATE
 
 If the env is set to 0, the module will be deactivated.
+
+Accelerated functions are installed with accelerate_method(). The python
+implementation stay available with python_method(), to check that both give
+the same result.
 '''
 
 __all__ = ('accelerate', )
@@ -26,6 +31,20 @@ from pymt import pymt_options, pymt_logger
 #: Accelerate module (None mean that the module is not available)
 accelerate = None
 
+# (class, method name) -> python implementation replaced by accelerate module
+_python_methods = {}
+
+def accelerate_method(cls, name, func):
+    '''Replace the method <name> of <cls> by the accelerated function
+    <func>. The python implementation is kept for python_method()'''
+    _python_methods[(cls, name)] = cls.__dict__[name]
+    setattr(cls, name, func)
+
+def python_method(cls, name):
+    '''Return the python implementation of the method <name> of <cls>, even
+    if the method have been accelerated'''
+    return _python_methods.get((cls, name), cls.__dict__[name])
+
 # try to use cython is available
 if pymt_options.get('use_accelerate'):
     try:
@@ -9,22 +9,28 @@ __all__ = (
     'getEventLoop',
     'pymt_event_listeners', 'touch_event_listeners',
     'pymt_providers',
-    'getWindow', 'setWindow'
+    'getWindow', 'setWindow',
+    'getFrameProfiler', 'setFrameProfiler',
+    'getLatencyTracer', 'setLatencyTracer'
 )
 
 import pymt
 import sys
 import os
+import threading
 from pymt.logger import pymt_logger
+from pymt.config import pymt_config
 from pymt.exceptions import pymt_exception_manager, ExceptionManager
 from pymt.clock import getClock
-from pymt.input import TouchFactory, pymt_postproc_modules
+from pymt.input import TouchFactory, pymt_postproc_modules, InputEventBatch
 
 # private vars
 touch_list              = []
 pymt_window             = None
 pymt_providers          = []
 pymt_evloop             = None
+frame_profiler          = None
+latency_tracer          = None
 frame_dt                = 0.01 # non-zero value to prevent user zero division
 
 #: List of event listeners
@@ -54,19 +60,64 @@ def setWindow(win):
     global pymt_window
     pymt_window = win
 
+def getFrameProfiler():
+    '''Return the frame profiler used by the main loop, or None'''
+    return frame_profiler
+
+def setFrameProfiler(profiler):
+    '''Set the frame profiler used by the main loop. The profiler must
+    implement frame_start(), mark(phase) and frame_end(). mark() is called
+    after each phase of the frame, with the name of the phase.
+    Set to None to remove the profiler.
+    '''
+    global frame_profiler
+    frame_profiler = profiler
+
+def getLatencyTracer():
+    '''Return the input latency tracer used by the main loop, or None'''
+    return latency_tracer
+
+def setLatencyTracer(tracer):
+    '''Set the input latency tracer used by the main loop. The tracer must
+    implement postproc(events), dispatch(touch) and flip(). They are called
+    with the events coming out of the postproc modules, before the dispatch
+    of each event, and after the window flip. The time where an event have
+    been received is in touch.time_event.
+    Set to None to remove the tracer.
+    '''
+    global latency_tracer
+    latency_tracer = tracer
+
 def getEventLoop():
     '''Return the default TouchEventLoop object'''
     return pymt_evloop
 
 class TouchEventLoop(object):
     '''Main event loop. This loop handle update of input + dispatch event
+
+    When the window don't need to be redrawn (see the `redraw` mode of the
+    window), the loop sleep until the next scheduled clock event, a call to
+    wakeup(), or at most `idle_timeout` seconds. Input providers that read
+    their device in a thread should call wakeup() when new events are
+    available. Others are polled every `idle_timeout` seconds.
     '''
     def __init__(self):
         super(TouchEventLoop, self).__init__()
         self.quit = False
         self.input_events = []
+        # (touch uid, event) -> (event, touch), in arrival order
+        self._input_queue = {}
+        #: Number of input events coalesced since the start
+        self.coalesced_events = 0
         self.postproc_modules = []
         self.status = 'idle'
+        self._wakeup = threading.Event()
+
+        #: Maximum time to sleep when nothing need to be redrawn (seconds)
+        self.idle_timeout = 0.05
+        if pymt_config is not None:
+            self.idle_timeout = pymt_config.getint(
+                'pymt', 'idle_timeout') / 1000.
 
     def start(self):
         '''Must be call only one time before run().
@@ -92,8 +143,30 @@ class TouchEventLoop(object):
             provider.stop()
         self.status = 'stopped'
 
+    def wakeup(self):
+        '''Wake up the loop if it's sleeping. Can be called from any thread.'''
+        self._wakeup.set()
+
+    def sleep(self, timeout=None):
+        '''Sleep until the next scheduled clock event, a call to wakeup(), or
+        the timeout (default to idle_timeout).'''
+        if timeout is None:
+            timeout = self.idle_timeout
+        next_timeout = getClock().get_next_timeout()
+        if next_timeout is not None:
+            timeout = min(timeout, next_timeout)
+        if timeout > 0 and self._wakeup.wait(timeout):
+            self._wakeup.clear()
+
     def add_postproc_module(self, mod):
-        '''Add a postproc input module (DoubleTap, RetainTouch are default)'''
+        '''Add a postproc input module (DoubleTap, RetainTouch are default)
+
+        A module implement process(events), that take and return a list of
+        (type, touch). It can implement process_batch(batch) instead, that
+        take and return a :class:`~pymt.input.postproc.batch.InputEventBatch`
+        with all the events of the frame as numpy columns. If both are
+        available, process_batch() is used.
+        '''
         self.postproc_modules.append(mod)
 
     def remove_postproc_module(self, mod):
@@ -142,7 +215,13 @@ class TouchEventLoop(object):
                 # and do to_local until the widget
                 try:
                     if parent:
-                        touch.apply_transform_2d(parent.to_widget)
+                        # cached window to widget matrix, if available
+                        matrix = getattr(parent, 'to_widget_affine', None)
+                        matrix = matrix and matrix()
+                        if matrix is not None:
+                            touch.apply_affine_2d(matrix)
+                        else:
+                            touch.apply_transform_2d(parent.to_widget)
                     else:
                         touch.apply_transform_2d(wid.to_widget)
                         touch.apply_transform_2d(wid.to_parent)
@@ -173,26 +252,59 @@ class TouchEventLoop(object):
         touch.grab_state = False
 
     def _dispatch_input(self, event, touch):
-        ev = (event, touch)
-        # remove the save event for the touch if exist
-        if ev in self.input_events[:]:
-            self.input_events.remove(ev)
-        self.input_events.append(ev)
+        # the same event for the same touch is already queued: the touch
+        # object is shared, so the queued event already have the last values.
+        # keep it at his place to not break the down/move/up order.
+        key = (touch.uid, event)
+        queue = self._input_queue
+        if key in queue:
+            self.coalesced_events += 1
+            return
+        queue[key] = (event, touch)
 
     def dispatch_input(self):
         '''Called by idle() to read events from input providers,
         pass event to postproc, and dispatch final events'''
+        profiler = frame_profiler
+
         # first, aquire input events
         for provider in pymt_providers:
             provider.update(dispatch_fn=self._dispatch_input)
-
-        # execute post-processing modules
+        if self._input_queue:
+            self.input_events.extend(self._input_queue.values())
+            self._input_queue.clear()
+        if profiler:
+            profiler.mark('input')
+
+        # execute post-processing modules. modules with a process_batch()
+        # method work on the whole batch, others on the list of events.
+        batch = InputEventBatch(self.input_events)
         for mod in self.postproc_modules:
-            self.input_events = mod.process(events=self.input_events)
+            process_batch = getattr(mod, 'process_batch', None)
+            if process_batch is not None:
+                batch = process_batch(batch)
+            else:
+                batch = InputEventBatch(mod.process(events=batch.events))
+            if profiler:
+                profiler.mark('postproc.%s' % mod.__class__.__name__)
+        self.input_events = batch.events
 
         # real dispatch input
-        for event, touch in self.input_events:
-            self.post_dispatch_input(event=event, touch=touch)
+        tracer = latency_tracer
+        if tracer:
+            tracer.postproc(self.input_events)
+            for event, touch in self.input_events:
+                tracer.dispatch(touch)
+                self.post_dispatch_input(event=event, touch=touch)
+        else:
+            for event, touch in self.input_events:
+                self.post_dispatch_input(event=event, touch=touch)
+        if profiler:
+            profiler.mark('dispatch')
+
+        # any widget can react to a touch, redraw.
+        if self.input_events and pymt_window:
+            pymt_window.invalidate()
 
         self.input_events = []
 
@@ -200,20 +312,48 @@ class TouchEventLoop(object):
         '''This function is called every frames. By default :
         * it "tick" the clock to the next frame
         * read all input and dispatch event
-        * dispatch on_update + on_draw + on_flip on window
+        * dispatch on_update + on_draw + on_flip on window. on_draw and
+          on_flip are skipped if the window don't need to be redrawn.
         '''
+        # nothing to redraw, wait for something to do
+        if not touch_list and \
+           (pymt_window is None or not pymt_window.need_redraw()):
+            self.sleep()
+
+        profiler = frame_profiler
+        if profiler:
+            profiler.frame_start()
+
         # update dt
         global frame_dt
         frame_dt = getClock().tick()
+        if profiler:
+            profiler.mark('clock')
 
         # read and dispatch input from providers
         self.dispatch_input()
 
         if pymt_window:
             pymt_window.dispatch_events()
+            if profiler:
+                profiler.mark('events')
             pymt_window.dispatch_event('on_update')
-            pymt_window.dispatch_event('on_draw')
-            pymt_window.dispatch_event('on_flip')
+            if profiler:
+                profiler.mark('update')
+            if pymt_window.need_redraw():
+                pymt_window.begin_redraw()
+                pymt_window.dispatch_event('on_draw')
+                pymt_window.end_redraw()
+                if profiler:
+                    profiler.mark('draw')
+                pymt_window.dispatch_event('on_flip')
+                if profiler:
+                    profiler.mark('flip')
+                if latency_tracer:
+                    latency_tracer.flip()
+
+        if profiler:
+            profiler.frame_end()
 
         # don't loop if we don't have listeners !
         if len(pymt_event_listeners) == 0:
@@ -1,5 +1,10 @@
+# cython: language_level=3, binding=True
 '''
 Accelerate: provide acceleration for some critical function of PyMT
+
+Every function here must behave exactly like the python implementation it
+replace. Functions are compiled with binding=True, so they can be installed
+as methods of a class.
 '''
 
 # ----------------------------------------------------------------------------
@@ -13,16 +18,13 @@ def eventdispatcher_dispatch_event(self, event_type, *args):
     if event_type not in self._event_types:
         return
 
-    _event_stack = self._event_stack
-    # search handler stack for matching event handlers
-    if _event_stack is not None:
-        for frame in _event_stack:
-            wkhandler = frame.get(event_type, None)
-            if wkhandler is None:
-                continue
+    # call handlers from the handler stack
+    _event_handlers = self._event_handlers
+    if _event_handlers is not None:
+        for wkhandler in _event_handlers.get(event_type, ()):
             handler = wkhandler()
             if handler is None:
-                frame.remove(wkhandler)
+                self._remove_dead_handler(event_type, wkhandler)
                 continue
             try:
                 if handler(*args):
@@ -35,7 +37,7 @@ def eventdispatcher_dispatch_event(self, event_type, *args):
         # call event
         if getattr(self, event_type)(*args):
             return True
-    except TypeError, e:
+    except TypeError:
         self._raise_dispatch_exception(
             event_type, args, getattr(self, event_type))
 
@@ -56,13 +58,46 @@ def widget_on_draw(self):
         for w in self.children[:]:
             w.dispatch_event('on_draw')
 
-def widget_collide_point(self, double x, double y):
-    cdef double ox, oy, ow, oh
-    ox, oy = self.x, self.y
-    ow, oh = self.width, self.height
+def widget_collide_point(self, x, y):
+    # don't type the coordinates: converting them to double cost more than the
+    # comparisons on python numbers.
     if not self.visible:
         return False
-    if x > ox  and x < ox + ow and \
+    ox, oy = self.pos
+    ow, oh = self.size
+    if x > ox and x < ox + ow and \
        y > oy and y < oy + oh:
         return True
 
+
+# ----------------------------------------------------------------------------
+#
+# Touch part
+#
+# ----------------------------------------------------------------------------
+
+def touch_scale_for_screen(self, w, h, p=None, rotation=0):
+    cdef double sx = self.sx, sy = self.sy
+    cdef double fw = w, fh = h
+    if rotation == 0:
+        self.x = sx * fw
+        self.y = sy * fh
+    elif rotation == 90:
+        sx, sy = sy, 1 - sx
+        self.x = sx * fh
+        self.y = sy * fw
+    elif rotation == 180:
+        sx, sy = 1 - sx, 1 - sy
+        self.x = sx * fw
+        self.y = sy * fh
+    elif rotation == 270:
+        sx, sy = 1 - sy, sx
+        self.x = sx * fh
+        self.y = sy * fw
+
+    if p:
+        self.z = self.sz * float(p)
+    if self.oxpos is None:
+        self.dxpos = self.oxpos = self.x
+        self.dypos = self.oypos = self.y
+        self.dzpos = self.ozpos = self.z
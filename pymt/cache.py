@@ -15,10 +15,28 @@ How to use the cache ::
 
 If the instance is NULL, the cache may have trash it, because you've
 not used the label since 5 seconds, and you've reach the limit.
+
+When the limit is reached, the least recently used object of the category is
+removed. A category can also be bounded by memory usage instead of count ::
+
+    # keep at most 64MB of textures
+    Cache.register('mytextures', max_size=64 * 1024 * 1024)
+    Cache.append('mytextures', filename, texture)
+
+The size of each object can be given with the `size` parameter of append(). If
+not, it's estimated with `Cache.get_object_size()`.
+
+Every category count his hits, misses, evictions and timeouts. You can get
+them with `Cache.stats()` ::
+
+    stats = Cache.stats('mycache')
+    print(stats['hits'], stats['misses'], stats['hit_rate'])
 '''
 
 __all__ = ('Cache', )
 
+from collections import OrderedDict
+from heapq import heappush, heappop
 from pymt.logger import pymt_logger
 from pymt.clock import getClock
 
@@ -27,9 +45,11 @@ class Cache(object):
 
     _categories = {}
     _objects = {}
+    _timeouts = {}
+    _timeouts_seq = 0
 
     @staticmethod
-    def register(category, limit=None, timeout=None):
+    def register(category, limit=None, timeout=None, max_size=None):
         '''Register a new category in cache, with limit
 
         :Parameters:
@@ -41,17 +61,28 @@ class Cache(object):
             `timeout` : double (optionnal)
                 Time to delete the object when it's not used.
                 if None, no timeout is applied.
+            `max_size` : int (optionnal)
+                Maximum size (in bytes) of all the objects in the cache.
+                If None, no size limit is applied.
         '''
         Cache._categories[category] = {
             'limit': limit,
-            'timeout': timeout
+            'timeout': timeout,
+            'max_size': max_size,
+            'size': 0,
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'timeouts': 0
         }
-        Cache._objects[category] = {}
-        pymt_logger.debug('Cache: register <%s> with limit=%s, timeout=%ss' %
-            (category, str(limit), str(timeout)))
+        Cache._objects[category] = OrderedDict()
+        Cache._timeouts[category] = []
+        pymt_logger.debug('Cache: register <%s> with limit=%s, timeout=%ss, '
+                          'max_size=%s' % (category, str(limit), str(timeout),
+                                           str(max_size)))
 
     @staticmethod
-    def append(category, key, obj, timeout=None):
+    def append(category, key, obj, timeout=None, size=None):
         '''Add a new object in the cache.
 
         :Parameters:
@@ -63,23 +94,51 @@ class Cache(object):
                 Object to store in cache
             `timeout` : double (optionnal)
                 Custom time to delete the object if it's not used.
+            `size` : int (optionnal)
+                Size of the object in bytes. If None, the size is estimated.
         '''
         try:
             cat = Cache._categories[category]
         except KeyError:
             pymt_logger.warning('Cache: category <%s> not exist' % category)
             return
+        objects = Cache._objects[category]
         timeout = timeout or cat['timeout']
-        # FIXME: activate purge when limit is hit
-        #limit = cat['limit']
-        #if limit is not None and len(Cache._objects[category]) >= limit:
-        #    Cache._purge_oldest(category)
-        Cache._objects[category][key] = {
+
+        # replace an existing object
+        if key in objects:
+            Cache._remove_entry(category, key)
+
+        max_size = cat['max_size']
+        if size is None:
+            size = Cache.get_object_size(obj)
+
+        # free some room
+        limit = cat['limit']
+        if limit is not None and len(objects) >= limit:
+            Cache._purge_oldest(category, len(objects) - limit + 1)
+        if max_size is not None and cat['size'] + size > max_size:
+            Cache._purge_size(category, cat['size'] + size - max_size)
+
+        now = getClock().get_time()
+        entry = {
             'object': obj,
             'timeout': timeout,
-            'lastaccess': getClock().get_time(),
-            'timestamp': getClock().get_time()
+            'lastaccess': now,
+            'timestamp': now,
+            'size': size,
+            'seq': None
         }
+        objects[key] = entry
+        cat['size'] += size
+
+        # index the object by deadline. The heap keep only the key, so an
+        # object removed or evicted is not retained by it.
+        if timeout is not None:
+            Cache._timeouts_seq += 1
+            entry['seq'] = Cache._timeouts_seq
+            heappush(Cache._timeouts[category],
+                     (now + timeout, Cache._timeouts_seq, key))
 
     @staticmethod
     def get(category, key, default=None):
@@ -94,10 +153,18 @@ class Cache(object):
                 Default value to be returned if key is not found
         '''
         try:
-            Cache._objects[category][key]['lastaccess'] = getClock().get_time()
-            return Cache._objects[category][key]['object']
+            objects = Cache._objects[category]
         except Exception:
             return default
+        try:
+            entry = objects[key]
+        except Exception:
+            Cache._categories[category]['misses'] += 1
+            return default
+        Cache._categories[category]['hits'] += 1
+        entry['lastaccess'] = getClock().get_time()
+        objects.move_to_end(key)
+        return entry['object']
 
     @staticmethod
     def get_timestamp(category, key, default=None):
@@ -133,6 +200,36 @@ class Cache(object):
         except Exception:
             return default
 
+    @staticmethod
+    def get_size(category):
+        '''Get the size (in bytes) used by a category. This is an
+        approximation, see get_object_size().
+
+        :Parameters:
+            `category` : str
+                Identifier of the category
+        '''
+        try:
+            return Cache._categories[category]['size']
+        except Exception:
+            return 0
+
+    @staticmethod
+    def get_object_size(obj):
+        '''Estimate the size of an object in bytes. Textures and images are
+        accounted as RGBA, strings by their length. Other objects
+        count as 0.'''
+        if obj is None or obj is False:
+            return 0
+        if isinstance(obj, (str, bytes, bytearray)):
+            return len(obj)
+        texture = getattr(obj, 'texture', obj)
+        try:
+            width, height = texture.width, texture.height
+            return int(width * height * 4)
+        except Exception:
+            return 0
+
     @staticmethod
     def remove(category, key=None):
         '''Purge the cache
@@ -145,32 +242,44 @@ class Cache(object):
         '''
         try:
             if key is not None:
-                del Cache._objects[category][key]
+                Cache._remove_entry(category, key)
             else:
-                Cache._objects[category] = {}
+                Cache._categories[category]['size'] = 0
+                Cache._objects[category] = OrderedDict()
+                Cache._timeouts[category] = []
         except Exception:
             pass
 
+    @staticmethod
+    def _remove_entry(category, key):
+        entry = Cache._objects[category].pop(key)
+        Cache._categories[category]['size'] -= entry['size']
+        return entry
+
     @staticmethod
     def _purge_oldest(category, maxpurge=1):
-        print('PURGE', category)
-        import heapq
-        heap_list = []
-        for key in Cache._objects[category]:
-            obj = Cache._objects[category][key]
-            if obj['lastaccess'] == obj['timestamp']:
-                continue
-            heapq.heappush(heap_list, (obj['lastaccess'], key))
-            print('<<<', obj['lastaccess'])
+        objects = Cache._objects[category]
+        cat = Cache._categories[category]
         n = 0
-        while n < maxpurge:
-            try:
-                lastaccess, key = heapq.heappop(heap_list)
-                print('=>', key, lastaccess, getClock().get_time())
-            except Exception:
-                return
-            del Cache._objects[category][key]
+        while n < maxpurge and objects:
+            key, entry = objects.popitem(last=False)
+            cat['size'] -= entry['size']
+            n += 1
+        cat['evictions'] += n
+        return n
 
+    @staticmethod
+    def _purge_size(category, size):
+        objects = Cache._objects[category]
+        cat = Cache._categories[category]
+        n = 0
+        while size > 0 and objects:
+            key, entry = objects.popitem(last=False)
+            cat['size'] -= entry['size']
+            size -= entry['size']
+            n += 1
+        cat['evictions'] += n
+        return n
 
     @staticmethod
     def _purge_by_timeout(dt):
@@ -190,33 +299,78 @@ class Cache(object):
                 Cache._categories[category]['timeout'] = timeout
                 continue
 
-            for key in list(Cache._objects[category].keys())[:]:
+            # only visit the objects that may have expired. An object that
+            # have been accessed since is pushed back with his new deadline.
+            objects = Cache._objects[category]
+            heap = Cache._timeouts[category]
+            while heap and heap[0][0] < curtime:
+                deadline, seq, key = heappop(heap)
+                entry = objects.get(key)
+                if entry is None or entry['seq'] != seq:
+                    # removed or replaced
+                    continue
+                deadline = entry['lastaccess'] + entry['timeout']
+                if deadline < curtime:
+                    Cache._remove_entry(category, key)
+                    Cache._categories[category]['timeouts'] += 1
+                else:
+                    heappush(heap, (deadline, seq, key))
 
-                lastaccess  = Cache._objects[category][key]['lastaccess']
-                objtimeout  = Cache._objects[category][key]['timeout']
+    @staticmethod
+    def stats(category=None):
+        '''Return the statistics of a category, or of all the categories if
+        category is None. Statistics of a category is a dict with theses
+        keys :
+
+            * count: number of objects in the cache
+            * limit, timeout, max_size: category configuration
+            * size: approximate memory used by the objects, in bytes
+            * hits, misses: number of get() that found / not found the object
+            * hit_rate: hits / (hits + misses), or None if no get() was done
+            * evictions: number of objects removed due to limit or max_size
+            * timeouts: number of objects removed due to timeout
 
-                # take the object timeout if available
-                if objtimeout is not None:
-                    timeout = objtimeout
+        :Parameters:
+            `category` : str (optionnal)
+                Identifier of the category
+        '''
+        if category is None:
+            return dict((x, Cache.stats(x)) for x in Cache._categories)
+        cat = Cache._categories[category]
+        stats = dict(cat)
+        stats['count'] = len(Cache._objects[category])
+        total = cat['hits'] + cat['misses']
+        stats['hit_rate'] = cat['hits'] / float(total) if total else None
+        return stats
 
-                # no timeout, cancel
-                if timeout is None:
-                    continue
+    @staticmethod
+    def reset_stats(category=None):
+        '''Reset the counters of a category, or of all the categories if
+        category is None.
 
-                if curtime - lastaccess > timeout:
-                    del Cache._objects[category][key]
+        :Parameters:
+            `category` : str (optionnal)
+                Identifier of the category
+        '''
+        if category is None:
+            categories = list(Cache._categories.keys())
+        else:
+            categories = [category]
+        for category in categories:
+            cat = Cache._categories[category]
+            for key in ('hits', 'misses', 'evictions', 'timeouts'):
+                cat[key] = 0
 
     @staticmethod
     def print_usage():
         '''Print the cache usage on the console'''
         print('Cache usage :')
-        for category in Cache._categories:
-            print(' * %s : %d / %s, timeout=%s' % (
-                category.capitalize(),
-                len(Cache._objects[category]),
-                str(Cache._categories[category]['limit']),
-                str(Cache._categories[category]['timeout'])
-            ))
+        for category, stats in Cache.stats().items():
+            print(' * %s : %d / %s, timeout=%s, size=%d, hits=%d, misses=%d,'
+                  ' evictions=%d, timeouts=%d' % (
+                category.capitalize(), stats['count'], str(stats['limit']),
+                str(stats['timeout']), stats['size'], stats['hits'],
+                stats['misses'], stats['evictions'], stats['timeouts']))
 
 # install the schedule clock for purging
 getClock().schedule_interval(Cache._purge_by_timeout, 1)
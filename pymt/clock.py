@@ -13,21 +13,61 @@ You can add new event like this ::
     getClock().schedule_once(my_callback, 5)
 
 If the callback return False, the schedule will be removed.
+
+Scheduled events are stored in a heap, ordered by their next deadline. Only
+the events that are due are visited on each tick, so having a lot of long
+intervals scheduled doesn't cost anything per frame. schedule_once() and
+schedule_interval() return a handle, that can be used to cancel the event
+without searching it ::
+
+    event = getClock().schedule_interval(my_callback, 0.5)
+    # ...
+    event.cancel()
+
+The number of frames per second can be limited with `max_fps`. tick() will
+sleep until the end of the frame ::
+
+    getClock().max_fps = 60
 '''
 
 __all__ =  ('Clock', 'getClock')
 
 import time
+from itertools import count
+from heapq import heappush, heappop, heapify
 from pymt.weakmethod import WeakMethod
 
 class _Event(object):
 
-    def __init__(self, loop, callback, timeout, starttime):
+    __slots__ = ('loop', 'callback', 'timeout', 'deadline', 'cancelled',
+                 '_clock', '_inheap', '_last_dt', '_dt', '_seq', '_key')
+
+    def __init__(self, loop, callback, timeout, starttime, clock=None):
         self.loop = loop
         self.callback = WeakMethod(callback)
         self.timeout = timeout
+        self.deadline = starttime + timeout
+        self.cancelled = False
+        self._clock = clock
+        self._inheap = False
         self._last_dt = starttime
         self._dt = 0.
+        self._seq = 0
+        self._key = None
+
+    def __lt__(self, other):
+        # events with the same deadline are called in the scheduling order
+        if self.deadline == other.deadline:
+            return self._seq < other._seq
+        return self.deadline < other.deadline
+
+    def cancel(self):
+        '''Cancel the event. It will not be called anymore.'''
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self._clock is not None:
+            self._clock._release(self)
 
     def do(self, dt):
         if self.callback.is_dead():
@@ -42,6 +82,7 @@ class _Event(object):
         # calculate current timediff for this event
         self._dt = curtime - self._last_dt
         self._last_dt = curtime
+        self.deadline = curtime + self.timeout
 
         # call the callback
         if self.callback.is_dead():
@@ -64,7 +105,8 @@ class _Event(object):
 class Clock(object):
     '''A clock object, that support events'''
     __slots__ = ('_dt', '_last_fps_tick', '_last_tick', '_fps',
-            '_fps_counter', '_events')
+            '_fps_counter', '_heap', '_handles', '_cancelled', '_max_fps',
+            '_seq')
 
     def __init__(self):
         self._dt = 0
@@ -72,13 +114,28 @@ class Clock(object):
         self._fps = 0
         self._fps_counter = 0
         self._last_fps_tick = None
-        self._events = []
+        # heap of _Event, ordered by deadline, then by push order
+        self._heap = []
+        self._seq = count()
+        # callback key -> dict of _Event (used as an ordered set), used by
+        # unschedule(). see _get_key().
+        self._handles = {}
+        # number of cancelled events still present in the heap
+        self._cancelled = 0
+        self._max_fps = 0
 
     def tick(self):
         '''Advance clock to the next step. Must be called every frame.
         The default clock have the tick() function called by PyMT'''
-        # tick the current time
+        # wait the end of the frame if the fps is limited
         current = time.time()
+        if self._max_fps > 0:
+            remaining = self._last_tick + 1. / self._max_fps - current
+            if remaining > 0:
+                time.sleep(remaining)
+                current = time.time()
+
+        # tick the current time
         self._dt = current - self._last_tick
         self._fps_counter += 1
         self._last_tick = current
@@ -104,28 +161,127 @@ class Clock(object):
         '''Get the last tick made by the clock'''
         return self._last_tick
 
+    def _get_max_fps(self):
+        return self._max_fps
+    def _set_max_fps(self, fps):
+        self._max_fps = max(0, float(fps or 0))
+    max_fps = property(_get_max_fps, _set_max_fps,
+        doc='Maximum number of frames per second. tick() sleep to not go '
+            'faster. 0 mean no limit.')
+
+    def get_next_deadline(self):
+        '''Return the time of the next scheduled event, or None if no event
+        is scheduled'''
+        heap = self._heap
+        while heap and heap[0].cancelled:
+            heappop(heap)._inheap = False
+            self._cancelled -= 1
+        if not heap:
+            return None
+        return heap[0].deadline
+
+    def get_next_timeout(self):
+        '''Return the time (in seconds) before the next scheduled event, or
+        None if no event is scheduled. The time can be negative if an event
+        is late.'''
+        deadline = self.get_next_deadline()
+        if deadline is None:
+            return None
+        return deadline - time.time()
+
     def schedule_once(self, callback, timeout=0):
         '''Schedule an event in <timeout> seconds'''
-        event = _Event(False, callback, timeout, self._last_tick)
-        self._events.append(event)
-        return event
+        return self._schedule(_Event(False, callback, timeout,
+                                     self._last_tick, self))
 
     def schedule_interval(self, callback, timeout):
         '''Schedule a event to be call every <timeout> seconds'''
-        event = _Event(True, callback, timeout, self._last_tick)
-        self._events.append(event)
-        return event
+        return self._schedule(_Event(True, callback, timeout,
+                                     self._last_tick, self))
 
     def unschedule(self, callback):
-        '''Remove a previous schedule event'''
-        self._events = [x for x in self._events if x.callback() != callback]
+        '''Remove a previous schedule event. The callback can be the function
+        used for scheduling, or the event returned by schedule_once() or
+        schedule_interval().'''
+        if isinstance(callback, _Event):
+            callback.cancel()
+            return
+        events = self._handles.get(self._get_key(callback))
+        if not events:
+            return
+        for event in list(events):
+            if event.callback() == callback:
+                event.cancel()
+
+    def _get_key(self, callback):
+        # the events of a bound method are grouped by instance, so
+        # unscheduling one instance doesn't visit the events of the others.
+        try:
+            return callback.__func__, id(callback.__self__)
+        except AttributeError:
+            return callback
+
+    def _schedule(self, event):
+        callback = event.callback
+        if callback._obj is None:
+            key = callback._func
+        else:
+            key = callback._func, id(callback._obj())
+        event._key = key
+        events = self._handles.get(key)
+        if events is None:
+            events = self._handles[key] = {}
+        events[event] = None
+        event._inheap = True
+        event._seq = next(self._seq)
+        heappush(self._heap, event)
+        return event
+
+    def _release(self, event):
+        # called when an event is cancelled: forget the handle, and leave the
+        # event in the heap until it reach the top.
+        key = event._key
+        events = self._handles.get(key)
+        if events is not None:
+            events.pop(event, None)
+            if not events:
+                del self._handles[key]
+        if event._inheap:
+            self._cancelled += 1
+            # too much garbage in the heap, rebuild it.
+            if self._cancelled > 32 and self._cancelled > len(self._heap) / 2:
+                for x in self._heap:
+                    if x.cancelled:
+                        x._inheap = False
+                self._heap[:] = [x for x in self._heap if not x.cancelled]
+                heapify(self._heap)
+                self._cancelled = 0
 
     def _process_events(self):
-        for event in self._events[:]:
-            if event.tick(self._last_tick) == False:
-                # event may be already removed by the callback
-                if event in self._events:
-                    self._events.remove(event)
+        curtime = self._last_tick
+        heap = self._heap
+
+        # pop all the due events first: events scheduled from a callback will
+        # be processed on the next tick.
+        due = []
+        while heap and heap[0].deadline <= curtime:
+            event = heappop(heap)
+            event._inheap = False
+            if event.cancelled:
+                self._cancelled -= 1
+                continue
+            due.append(event)
+
+        for event in due:
+            # event may be already cancelled by another callback
+            if event.cancelled:
+                continue
+            if event.tick(curtime) == False:
+                event.cancel()
+            elif not event.cancelled:
+                event._inheap = True
+                event._seq = next(self._seq)
+                heappush(heap, event)
 
 
 # create a default clock
@@ -11,7 +11,7 @@ from pymt.logger import pymt_logger
 from pymt import pymt_home_dir, pymt_config_fn, logger
 
 # Version number of current configuration format
-PYMT_CONFIG_VERSION = 16
+PYMT_CONFIG_VERSION = 19
 
 #: PyMT configuration object
 pymt_config = None
@@ -175,6 +175,18 @@ if not 'PYMT_DOC_INCLUDE' in os.environ:
             # ability to rotate the window
             pymt_config.setdefault('graphics', 'rotation', '0')
 
+        elif pymt_config_version == 16:
+            # redraw only when needed
+            pymt_config.setdefault('graphics', 'redraw', 'always')
+
+        elif pymt_config_version == 17:
+            # maximum sleep of the main loop when idle (ms)
+            pymt_config.setdefault('pymt', 'idle_timeout', '50')
+
+        elif pymt_config_version == 18:
+            # batch the graphx primitives in vertex arrays
+            pymt_config.setdefault('graphics', 'batch', '1')
+
         else:
             # for future.
             break
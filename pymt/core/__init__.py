@@ -77,3 +77,4 @@ from pymt.core.clipboard import *
 
 # only after core loading, load extensions
 from .text.markup import *
+from .text.atlas import *
@@ -265,7 +265,11 @@ class LabelBase(BaseObject):
         # get data from provider
         data = self._render_end()
         assert(data)
+        self._update_texture(data)
 
+    def _update_texture(self, data):
+        '''Create or update the texture with the data rendered by the
+        provider'''
         # create texture is necessary
         if self.texture is None:
             self.texture = pymt.Texture.create(*self.size)
@@ -279,7 +283,6 @@ class LabelBase(BaseObject):
         # update texture
         self.texture.blit_data(data)
 
-
     def refresh(self):
         '''Force re-rendering of the label'''
         # first pass, calculating width/height
@@ -290,16 +293,10 @@ class LabelBase(BaseObject):
         self._size = sz[0] + self.options['padding_x'] * 2, \
                      sz[1] + self.options['padding_y'] * 2
 
-    def draw(self):
-        '''Draw the label'''
-        if self.texture is None:
-            return
-        if not len(self.label):
-            # it's a empty label, don't waste time to draw it
-            return
-
-        dx = 0
-        dy = 0
+    def _get_draw_rect(self):
+        '''Return the position (x, y) of the bottom-left corner of the
+        content, and his size (width, height), with the anchors and the
+        viewport applied'''
         x, y = self.pos
         w, h = self.size
         anchor_x = self.options['anchor_x']
@@ -332,6 +329,20 @@ class LabelBase(BaseObject):
         elif anchor_y == 'top':
             y -= h - padding_y
 
+        return x, y, w, h
+
+    def draw(self):
+        '''Draw the label'''
+        if self.texture is None:
+            return
+        if not len(self.label):
+            # it's a empty label, don't waste time to draw it
+            return
+
+        x, y, w, h = self._get_draw_rect()
+        viewport_size = self.viewport_size
+        viewport_pos = self.viewport_pos
+
         alpha = 1
         if len(self.options['color']) > 3:
             alpha = self.options['color'][3]
@@ -0,0 +1,319 @@
+'''
+Atlas: Draw text from a shared texture of glyphs
+
+A normal label render his whole text in his own texture: every new text is
+rasterized by the text provider and uploaded to the graphic card. This is
+slow for labels that change all the time, like a value of a slider, a timer
+or a FPS counter.
+
+An :class:`AtlasLabel` use a :class:`GlyphAtlas` instead, a texture shared
+by all the labels of the same font, where each glyph is rasterized only once.
+A label is drawn as one quad per glyph, so changing his text only compute
+new vertices ::
+
+    drawLabel('%d FPS' % fps, atlas=True)
+    label = MTLabel(label='0', atlas=True)
+
+The atlas of a font is created on the first use, and grow when he is full.
+
+.. warning::
+    Glyphs are placed one after each other, without kerning or ligatures.
+    Markup is not supported, and the text color is applied to the whole
+    label. With a viewport, only the glyphs fully inside it are drawn.
+'''
+
+__all__ = ('GlyphAtlas', 'AtlasLabel', 'get_glyph_atlas')
+
+import numpy
+from pymt.logger import pymt_logger
+from pymt.texture import Texture
+from pymt.graphx.colors import set_color
+from pymt.graphx.statement import gx_texture, gx_matrix
+from . import Label, LabelBase
+from OpenGL.GL import GL_FLOAT, GL_QUADS, GL_VERTEX_ARRAY, \
+        GL_TEXTURE_COORD_ARRAY, glEnableClientState, glDisableClientState, \
+        glVertexPointer, glTexCoordPointer, glDrawArrays, glTranslatef
+
+#: Font parameters -> GlyphAtlas
+glyph_atlas_cache = {}
+
+class GlyphAtlas(object):
+    '''Texture containing the glyphs of a font, packed in rows.
+
+    The glyphs are measured when they are added, but rasterized and uploaded
+    only in :meth:`update`, when the OpenGL context is available.
+
+    :Parameters:
+        `options`: dict
+            Font parameters (font_size, font_name, bold, italic)
+        `size`: int, default to 512
+            Initial width and height of the texture, must be a power of 2
+        `max_size`: int, default to 2048
+            Maximum height of the texture. When it's full, the atlas is
+            cleared, and the labels add their glyphs again.
+        `rasterizer`: LabelBase, default to None
+            Label of the text provider used to measure and render the glyphs.
+            If None, a label of the current provider is created.
+    '''
+
+    #: Space between glyphs, to prevent bleeding with linear filtering
+    padding = 1
+
+    def __init__(self, options, size=512, max_size=2048, rasterizer=None):
+        self.options = dict((k, options[k]) for k in (
+            'font_size', 'font_name', 'bold', 'italic'))
+        self.width = self.height = size
+        self.max_size = max_size
+        self.texture = None
+        #: Glyph -> (x, y, width, height) in the texture, y from the top
+        self.glyphs = {}
+        #: Incremented when the position of the glyphs in the texture
+        #: change, the labels must recompute their texture coordinates
+        self.generation = 0
+        self._rasterizer = rasterizer
+        self._pending = []
+        self._row_x = self._row_y = self._row_height = 0
+
+    @property
+    def rasterizer(self):
+        if self._rasterizer is None:
+            self._rasterizer = Label('', color=(1, 1, 1, 1), **self.options)
+        return self._rasterizer
+
+    def _clear(self):
+        self.glyphs = {}
+        self._pending = []
+        self._row_x = self._row_y = self._row_height = 0
+        self.generation += 1
+
+    def _pack(self, w, h):
+        # place the glyph at the end of the current row, or on a new row.
+        # return None if the texture is full.
+        padding = self.padding
+        if self._row_x + w + padding > self.width:
+            self._row_y += self._row_height
+            self._row_x = self._row_height = 0
+        if self._row_y + h + padding > self.height or \
+           w + padding > self.width:
+            return None
+        x, y = self._row_x, self._row_y
+        self._row_x += w + padding
+        self._row_height = max(self._row_height, h + padding)
+        return x, y
+
+    def add(self, text):
+        '''Measure and place all the glyphs of a text missing in the atlas.
+        Return False if the atlas have been cleared.'''
+        if self._add(text, True):
+            return True
+        # the text is added only once again: the glyphs that still don't fit
+        # in the cleared atlas are not drawn.
+        pymt_logger.warning('Atlas: texture is full, clear it')
+        self._clear()
+        self._add(text, False)
+        return False
+
+    def _add(self, text, can_clear):
+        # return False if the atlas is full and can_clear is True
+        glyphs = self.glyphs
+        for glyph in text:
+            if glyph in glyphs:
+                continue
+            w, h = self.rasterizer.get_extents(glyph)
+            w, h = int(w), int(h)
+            if glyph == '\n' or not w or not h:
+                # nothing to draw, keep only the size
+                glyphs[glyph] = (0, 0, 0 if glyph == '\n' else w, h)
+                continue
+            pos = self._pack(w, h)
+            while pos is None:
+                if w + self.padding > self.width or \
+                   h + self.padding > self.max_size:
+                    pymt_logger.warning('Atlas: glyph <%s> too big' % glyph)
+                    break
+                if self.height < self.max_size:
+                    # the glyphs keep their place, but all are uploaded again
+                    self.height *= 2
+                    self.texture = None
+                    self._pending = [g for g, v in glyphs.items()
+                                     if v[2] and v[3]]
+                    self.generation += 1
+                elif can_clear:
+                    return False
+                else:
+                    pymt_logger.warning('Atlas: no place for glyph <%s>' %
+                                        glyph)
+                    break
+                pos = self._pack(w, h)
+            if pos is None:
+                glyphs[glyph] = (0, 0, w, 0)
+                continue
+            glyphs[glyph] = (pos[0], pos[1], w, h)
+            self._pending.append(glyph)
+        return True
+
+    def get_extents(self, text):
+        '''Return the size (width, height) of a text, glyphs must be added'''
+        glyphs = self.glyphs
+        if not text:
+            self.add(' ')
+            return 0, glyphs[' '][3]
+        w = h = 0
+        for glyph in text:
+            gx, gy, gw, gh = glyphs[glyph]
+            w += gw
+            if gh > h:
+                h = gh
+        return w, h
+
+    def update(self):
+        '''Create the texture, and render the new glyphs in it. Must be
+        called with the OpenGL context.'''
+        if self.texture is None:
+            self.texture = Texture.create(self.width, self.height)
+        if not self._pending:
+            return
+        rasterizer = self.rasterizer
+        texture = self.texture
+        glyphs = self.glyphs
+        for glyph in self._pending:
+            x, y, w, h = glyphs[glyph]
+            rasterizer.size = (w, h)
+            rasterizer._render_begin()
+            rasterizer._render_text(glyph, 0, 0)
+            texture.blit_data(rasterizer._render_end(), pos=(x, y))
+        self._pending = []
+
+def get_glyph_atlas(options):
+    '''Return the shared atlas of a font'''
+    key = tuple(options[k] for k in ('font_size', 'font_name', 'bold',
+                                     'italic'))
+    atlas = glyph_atlas_cache.get(key)
+    if atlas is None:
+        atlas = glyph_atlas_cache[key] = GlyphAtlas(options)
+    return atlas
+
+class AtlasLabel(LabelBase):
+    '''Label drawn with quads from a :class:`GlyphAtlas`.
+
+    :Parameters:
+        `atlas`: GlyphAtlas, default to None
+            Atlas to use. If None (or True), use the shared atlas of the font.
+
+    AtlasLabel support the parameters of :class:`LabelBase`.
+    '''
+    def __init__(self, label, **kwargs):
+        self._atlas = kwargs.get('atlas')
+        self._layout = []
+        self._generation = None
+        self._vertices = None
+        self._tex_coords = None
+        self._layout_size = (0, 0)
+        super(AtlasLabel, self).__init__(label, **kwargs)
+
+    @property
+    def atlas(self):
+        '''Atlas of the label (read only)'''
+        if not isinstance(self._atlas, GlyphAtlas):
+            self._atlas = get_glyph_atlas(self.options)
+        return self._atlas
+
+    def refresh(self):
+        # add all the glyphs before the layout: if the atlas is cleared, it
+        # must not happen in the middle.
+        self.atlas.add(self.label)
+        super(AtlasLabel, self).refresh()
+
+    def get_extents(self, text):
+        atlas = self.atlas
+        atlas.add(text)
+        return atlas.get_extents(text)
+
+    def _render_begin(self):
+        self._layout = []
+
+    def _render_text(self, text, x, y):
+        glyphs = self.atlas.glyphs
+        layout = self._layout
+        for glyph in text:
+            layout.append((glyph, x, y))
+            x += glyphs[glyph][2]
+
+    def _render_end(self):
+        self._layout_size = self.size
+        self._build()
+        return self._vertices, self._tex_coords
+
+    def _update_texture(self, data):
+        # nothing to upload, the glyphs are in the atlas
+        pass
+
+    def _build(self):
+        # compute the quad of each glyph. the layout is from the top-left,
+        # vertices from the bottom-left.
+        atlas = self.atlas
+        glyphs = atlas.glyphs
+        tw, th = float(atlas.width), float(atlas.height)
+        vx, vy = 0, 0
+        vw, vh = self._layout_size
+        if self.viewport_size:
+            vw = min(vw, self.viewport_size[0])
+            vh = min(vh, self.viewport_size[1])
+            if self.viewport_pos:
+                vx, vy = self.viewport_pos
+        vertices = []
+        tex_coords = []
+        for glyph, x, y in self._layout:
+            gx, gy, gw, gh = glyphs[glyph]
+            if not gw or not gh:
+                continue
+            if x < vx or x + gw > vx + vw or y < vy or y + gh > vy + vh:
+                continue
+            x1 = x - vx
+            y1 = vh - (y - vy) - gh
+            x2, y2 = x1 + gw, y1 + gh
+            vertices.extend((x1, y1, x2, y1, x2, y2, x1, y2))
+            u1, v1 = gx / tw, gy / th
+            u2, v2 = (gx + gw) / tw, (gy + gh) / th
+            tex_coords.extend((u1, v2, u2, v2, u2, v1, u1, v1))
+        self._vertices = numpy.array(vertices, dtype='float32')
+        self._tex_coords = numpy.array(tex_coords, dtype='float32')
+        self._generation = atlas.generation
+
+    def draw(self):
+        '''Draw the label'''
+        if self._vertices is None:
+            return
+        atlas = self.atlas
+        if self._generation != atlas.generation:
+            # the atlas changed, glyphs of the layout can be missing
+            atlas.add(''.join(glyph for glyph, x, y in self._layout))
+            self._build()
+        if not len(self._vertices):
+            return
+        atlas.update()
+
+        x, y, w, h = self._get_draw_rect()
+        set_color(*self.options['color'], blend=True)
+        with gx_matrix:
+            glTranslatef(int(x), int(y), 0)
+            with gx_texture(atlas.texture):
+                glEnableClientState(GL_VERTEX_ARRAY)
+                glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+                glVertexPointer(2, GL_FLOAT, 0, self._vertices)
+                glTexCoordPointer(2, GL_FLOAT, 0, self._tex_coords)
+                glDrawArrays(GL_QUADS, 0, len(self._vertices) // 2)
+                glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+                glDisableClientState(GL_VERTEX_ARRAY)
+
+    @property
+    def content_width(self):
+        return self.width
+
+    @property
+    def content_height(self):
+        return self.height
+
+    @property
+    def content_size(self):
+        return self.size
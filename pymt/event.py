@@ -152,24 +152,32 @@ class EventDispatcher(BaseObject):
     '''Generic event dispatcher interface.
 
     See the module docstring for usage.
+
+    For dispatching speed, registered event types are stored in a set, and
+    the handler stack is compiled into a table of event type -> handlers (top
+    first). The table is rebuilt every time the handler stack change. This
+    speed up the unknown events (hidden widgets) and the handler stack. The
+    default `on_<event>` handler is still found with getattr(): a table of
+    functions was not faster, and would ignore the handlers set on the
+    instance.
     '''
 
-    __slots__ = ('_event_types', '_event_stack')
+    __slots__ = ('_event_types', '_event_stack', '_event_handlers')
 
     def __init__(self, **kwargs):
         super(EventDispatcher, self).__init__(**kwargs)
-        self._event_types = []
+        self._event_types = set()
         self._event_stack = None
+        self._event_handlers = None
 
     @property
     def event_types(self):
         '''List of event types available'''
-        return self._event_types
+        return list(self._event_types)
 
     def unregister_event_type(self, event_type):
         '''Remove an event types from the available list'''
-        if event_type in self._event_types:
-            self._event_types.remove(event_type)
+        self._event_types.discard(event_type)
 
     def register_event_type(self, event_type):
         '''Register an event type with the dispatcher.
@@ -186,8 +194,27 @@ class EventDispatcher(BaseObject):
         if not hasattr(self, event_type):
             raise Exception('Missing default handler <%s> in <%s>' % (
                             event_type, self.__class__.__name__))
-        if not event_type in self._event_types:
-            self._event_types.append(event_type)
+        self._event_types.add(event_type)
+
+    def _compile_handlers(self):
+        # rebuild the event type -> handlers table from the handler stack
+        if not self._event_stack:
+            self._event_handlers = None
+            return
+        handlers = {}
+        for frame in self._event_stack:
+            for name, wkhandler in frame.items():
+                if name in handlers:
+                    handlers[name] += (wkhandler, )
+                else:
+                    handlers[name] = (wkhandler, )
+        self._event_handlers = handlers or None
+
+    def _remove_dead_handler(self, event_type, wkhandler):
+        for frame in self._event_stack:
+            if frame.get(event_type) is wkhandler:
+                del frame[event_type]
+        self._compile_handlers()
 
     def push_handlers(self, *args, **kwargs):
         '''Push a level onto the top of the handler stack, then attach zero or
@@ -205,6 +232,7 @@ class EventDispatcher(BaseObject):
         # Place dict full of new handlers at beginning of stack
         self._event_stack.insert(0, {})
         self.set_handlers(*args, **kwargs)
+        self._compile_handlers()
 
     def remove_handler(self, name, handler):
         '''Remove a single event handler.
@@ -231,6 +259,7 @@ class EventDispatcher(BaseObject):
                     break
             except KeyError:
                 pass
+        self._compile_handlers()
 
     def remove_handlers(self, *args, **kwargs):
         '''Remove event handlers from the event stack.
@@ -271,6 +300,12 @@ class EventDispatcher(BaseObject):
             except KeyError:
                 pass
 
+        # Remove the frame if it's empty.
+        if not frame:
+            self._event_stack = [x for x in self._event_stack
+                                 if x is not frame] or None
+        self._compile_handlers()
+
     def _get_handlers(self, args, kwargs):
         '''Implement handler matching on arguments for set_handlers and
         remove_handlers.
@@ -321,6 +356,7 @@ class EventDispatcher(BaseObject):
             self._event_stack = [{}]
 
         self._event_stack[0][name] = WeakMethod(handler)
+        self._compile_handlers()
 
     def dispatch_event(self, event_type, *args):
         '''Dispatch a single event to the attached handlers.
@@ -341,16 +377,13 @@ class EventDispatcher(BaseObject):
         if event_type not in self._event_types:
             return
 
-        # search handler stack for matching event handlers
-        _event_stack = self._event_stack
-        if _event_stack is not None:
-            for frame in _event_stack:
-                wkhandler = frame.get(event_type, None)
-                if wkhandler is None:
-                    continue
+        # call handlers from the handler stack
+        _event_handlers = self._event_handlers
+        if _event_handlers is not None:
+            for wkhandler in _event_handlers.get(event_type, ()):
                 handler = wkhandler()
                 if handler is None:
-                    del frame[wkhandler]
+                    self._remove_dead_handler(event_type, wkhandler)
                     continue
                 try:
                     if handler(*args):
@@ -487,9 +520,9 @@ class EventDispatcher(BaseObject):
 
 # install acceleration
 try:
-    from pymt.accelerate import accelerate
+    from pymt.accelerate import accelerate, accelerate_method
     if accelerate is not None:
-        EventDispatcher.dispatch_event = types.MethodType(
-            accelerate.eventdispatcher_dispatch_event, None, EventDispatcher)
+        accelerate_method(EventDispatcher, 'dispatch_event',
+                          accelerate.eventdispatcher_dispatch_event)
 except ImportError as e:
     pymt_logger.warning('Event: Unable to use accelerate module <%s>' % e)
@@ -2,6 +2,7 @@
 Graphx: package to simplify drawing in OpenGL
 '''
 
+from pymt.graphx.batch import *
 from pymt.graphx.statement import *
 from pymt.graphx.colors import *
 from pymt.graphx.draw import *
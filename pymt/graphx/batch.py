@@ -0,0 +1,276 @@
+'''
+Batch: accumulate graphx primitives and draw them with vertex arrays
+
+By default, every graphx function draw immediately, with one glVertex2f()
+call per point. Inside a batch, the primitives drawn by drawLine(),
+drawRectangle(), drawRoundedRectangle(), drawCircle(), drawPolygon() and
+drawTriangle() are converted to triangles or line segments, and accumulated
+with their color in vertex and color arrays. They are drawn with one
+glDrawArrays() for each run of primitives of the same kind ::
+
+    with gx_batch():
+        for pos, size, color in rects:
+            set_color(*color)
+            drawRectangle(pos=pos, size=size)
+
+The batch is flushed at the end of the block, and before every change of the
+OpenGL state done with the graphx statements (gx_matrix, gx_texture,
+gx_begin, gx_attrib, gx_enable, gx_blending) to keep the drawing order. The
+display lists are compiled without batching.
+
+.. warning::
+    The color must be set with set_color() or gx_color, and the matrix
+    changed inside a gx_matrix statement. If you use OpenGL functions
+    directly inside a batch, call :meth:`GraphxBatch.flush` before. The
+    batched primitives are always drawn with the default alpha blending.
+
+Batching can be disabled with the `batch` token in the `graphics` section of
+the configuration: all the primitives are then drawn immediately.
+'''
+
+__all__ = ('GraphxBatch', 'gx_batch', 'getCurrentBatch')
+
+import os
+import numpy
+import pymt
+from OpenGL.GL import GL_TRIANGLES, GL_LINES, GL_LINE_STRIP, GL_LINE_LOOP, \
+        GL_POLYGON, GL_TRIANGLE_FAN, GL_QUADS, GL_FLOAT, GL_VERTEX_ARRAY, \
+        GL_COLOR_ARRAY, GL_CURRENT_COLOR, GL_LINE_WIDTH, GL_BLEND, \
+        GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ENABLE_BIT, \
+        GL_COLOR_BUFFER_BIT, GL_LINE_BIT, GL_CURRENT_BIT, \
+        glEnableClientState, glDisableClientState, glVertexPointer, \
+        glColorPointer, glDrawArrays, glGetFloatv, glLineWidth, glEnable, \
+        glBlendFunc, glPushAttrib, glPopAttrib
+
+#: Current batch, None if the primitives are drawn immediately
+current_batch = None
+
+# primitives drawn as a convex filled polygon, or as lines
+_filled_styles = (GL_POLYGON, GL_TRIANGLE_FAN, GL_QUADS, GL_TRIANGLES)
+_line_styles = (GL_LINES, GL_LINE_STRIP, GL_LINE_LOOP)
+
+# index of the vertices for each number of points
+_indices_cache = {}
+
+def _get_indices(style, count):
+    key = (style, count)
+    indices = _indices_cache.get(key)
+    if indices is not None:
+        return indices
+    if style in (GL_POLYGON, GL_TRIANGLE_FAN) or \
+       (style == GL_QUADS and count == 4):
+        # fan: (0, i, i + 1)
+        i = numpy.arange(1, count - 1)
+        indices = numpy.column_stack(
+            (numpy.zeros(count - 2, dtype=int), i, i + 1)).ravel()
+    elif style == GL_QUADS:
+        # each quad is splitted in 2 triangles
+        q = numpy.arange(0, count - count % 4, 4)
+        indices = numpy.column_stack(
+            (q, q + 1, q + 2, q, q + 2, q + 3)).ravel()
+    elif style == GL_TRIANGLES:
+        indices = numpy.arange(count - count % 3)
+    elif style == GL_LINES:
+        indices = numpy.arange(count - count % 2)
+    elif style == GL_LINE_STRIP:
+        i = numpy.arange(count - 1)
+        indices = numpy.column_stack((i, i + 1)).ravel()
+    else:
+        # line loop: strip + closing segment
+        i = numpy.arange(count)
+        indices = numpy.column_stack((i, (i + 1) % count)).ravel()
+    _indices_cache[key] = indices
+    return indices
+
+def flush_batch():
+    '''Flush the current batch, if any. Used by the statements before
+    changing the OpenGL state.'''
+    if current_batch is not None:
+        current_batch.flush()
+
+def suspend_batch():
+    '''Flush and deactivate the current batch, return it for
+    :func:`resume_batch`'''
+    global current_batch
+    batch = current_batch
+    if batch is not None:
+        batch.flush()
+        current_batch = None
+    return batch
+
+def resume_batch(batch):
+    '''Activate again a batch returned by :func:`suspend_batch`'''
+    global current_batch
+    current_batch = batch
+
+def batch_color(color):
+    '''Set the color of the next primitives of the current batch, and return
+    the previous one. Return None if there is no batch.'''
+    if current_batch is None or color is None:
+        return None
+    previous = current_batch.color
+    if len(color) == 3:
+        color = (color[0], color[1], color[2], 1.)
+    current_batch.color = tuple(color)
+    return previous
+
+def sync_batch_color():
+    '''Read the color of the current batch from OpenGL, after a change done
+    outside of set_color() (display list, glPopAttrib()...)'''
+    if current_batch is not None:
+        current_batch.color = tuple(glGetFloatv(GL_CURRENT_COLOR).ravel())
+
+def getCurrentBatch():
+    '''Return the current batch, or None'''
+    return current_batch
+
+class GraphxBatch(object):
+    '''Accumulate the primitives of the graphx functions, and draw them with
+    vertex arrays. Use it with the `with` statement, or with
+    :meth:`begin` / :meth:`end`.
+
+    The primitives are kept in runs: a run contain consecutive primitives of
+    the same kind (triangles, or lines of the same width), and is drawn with
+    one glDrawArrays().
+    '''
+
+    #: If False, the batches do nothing and the primitives are drawn
+    #: immediately. Set from the configuration.
+    enabled = True
+
+    def __init__(self):
+        #: Current color of the primitives (r, g, b, a)
+        self.color = (1., 1., 1., 1.)
+        #: Number of glDrawArrays() done since the creation
+        self.draw_count = 0
+        #: Number of primitives added since the creation
+        self.primitive_count = 0
+        # list of [mode, linewidth, vertices arrays, colors arrays]
+        self._runs = []
+        self._previous = None
+        self._active = False
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, extype, value, traceback):
+        self.end()
+
+    def begin(self):
+        '''Start to accumulate the primitives'''
+        global current_batch
+        if not GraphxBatch.enabled or self._active:
+            return
+        # a batch inside another one: draw the primitives of the previous
+        # one first
+        self._previous = suspend_batch()
+        self.color = tuple(glGetFloatv(GL_CURRENT_COLOR).ravel())
+        self._active = True
+        current_batch = self
+
+    def end(self):
+        '''Draw the accumulated primitives, and stop to accumulate'''
+        global current_batch
+        if not self._active:
+            return
+        self.flush()
+        self._active = False
+        current_batch = self._previous
+        self._previous = None
+
+    def add(self, style, points, colors=None, linewidth=None):
+        '''Add a primitive. Return False if the style is not supported: the
+        batch is then flushed, and the primitive must be drawn immediately.
+
+        :Parameters:
+            `style`: opengl begin
+                GL_POLYGON, GL_TRIANGLE_FAN, GL_QUADS, GL_TRIANGLES for
+                filled convex primitives, GL_LINES, GL_LINE_STRIP,
+                GL_LINE_LOOP for lines
+            `points`: list
+                Coordinates of the points (x1, y1, x2, y2...)
+            `colors`: list, default to None
+                Color (r, g, b, a) of each point, else the current color
+            `linewidth`: float, default to None
+                Width of lines, else the current OpenGL line width
+        '''
+        if style in _filled_styles:
+            mode = GL_TRIANGLES
+            linewidth = None
+        elif style in _line_styles:
+            mode = GL_LINES
+            if linewidth is None or linewidth <= 0:
+                linewidth = float(glGetFloatv(GL_LINE_WIDTH))
+        else:
+            self.flush()
+            return False
+
+        vertices = numpy.asarray(points, dtype='float32').reshape(-1, 2)
+        count = len(vertices)
+        if count < 2:
+            return True
+        indices = _get_indices(style, count)
+        if not len(indices):
+            return True
+        vertices = vertices[indices]
+        if colors is None:
+            colors = numpy.empty((len(indices), 4), dtype='float32')
+            colors[:] = self.color
+        else:
+            colors = numpy.asarray(colors, dtype='float32').reshape(-1, 4)
+            colors = colors[indices]
+
+        runs = self._runs
+        if runs and runs[-1][0] == mode and runs[-1][1] == linewidth:
+            run = runs[-1]
+        else:
+            run = [mode, linewidth, [], []]
+            runs.append(run)
+        run[2].append(vertices)
+        run[3].append(colors)
+        self.primitive_count += 1
+        return True
+
+    def flush(self):
+        '''Draw the accumulated primitives'''
+        runs = self._runs
+        if not runs:
+            return
+        self._runs = []
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_LINE_BIT |
+                     GL_CURRENT_BIT)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for mode, linewidth, vertices, colors in runs:
+            if len(vertices) == 1:
+                vertices = vertices[0]
+                colors = colors[0]
+            else:
+                vertices = numpy.concatenate(vertices)
+                colors = numpy.concatenate(colors)
+            if linewidth is not None:
+                glLineWidth(linewidth)
+            glVertexPointer(2, GL_FLOAT, 0, vertices)
+            glColorPointer(4, GL_FLOAT, 0, colors)
+            glDrawArrays(mode, 0, len(vertices))
+            self.draw_count += 1
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glPopAttrib()
+
+#: Alias to create a batch in a with statement
+gx_batch = GraphxBatch
+
+if 'PYMT_DOC' not in os.environ:
+
+    def __pymt_configure_batch():
+        from pymt import pymt_config
+        GraphxBatch.enabled = bool(pymt_config.getint('graphics', 'batch'))
+        if not GraphxBatch.enabled:
+            pymt.pymt_logger.debug('Batch: graphx batching is disabled')
+
+    from pymt import pymt_register_post_configuration
+    pymt_register_post_configuration(__pymt_configure_batch)
@@ -7,6 +7,7 @@ __all__ = ('set_color', )
 from OpenGL.GL import GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_BLEND, \
         glEnable, glDisable, glBlendFunc, glColor3f, glColor4f
 from pymt.utils import get_color_from_hex
+from pymt.graphx.batch import batch_color
 
 def set_color(*colors, **kwargs):
     '''Define current color to be used (as float values between 0 and 1) ::
@@ -54,4 +55,4 @@ def set_color(*colors, **kwargs):
             glBlendFunc(kwargs.get('sfactor'), kwargs.get('dfactor'))
         else:
             glDisable(GL_BLEND)
-
+    batch_color(colors)
@@ -1,22 +1,104 @@
 '''
 CSS: Draw shapes with css attributes !
+
+The rectangles are compiled in display lists, cached by style, size, prefix
+and state. The position is applied when the display list is drawn, so moving
+a widget don't compile a new display list.
+
+The style is identified by his fingerprint, a hashable snapshot of his
+content. With a :class:`CSSStyle` (the style of widgets), the fingerprint is
+computed only after a change of the style.
 '''
 
-__all__ = ('drawCSSRectangle', )
+__all__ = ('drawCSSRectangle', 'CSSStyle', 'css_style_fingerprint')
 
 import os
 from pymt.graphx.draw import drawRectangleAlpha, drawRectangle, \
         drawRoundedRectangle, drawRoundedRectangleAlpha
 from pymt.graphx.colors import set_color
 from pymt.cache import Cache
-from pymt.graphx.statement import GlDisplayList, gx_color
+from pymt.graphx.statement import GlDisplayList, gx_color, gx_matrix
 from OpenGL.GL import GL_LINE_BIT, GL_LINE_LOOP, \
-        glPushAttrib, glPopAttrib, glLineWidth
+        glPushAttrib, glPopAttrib, glLineWidth, glTranslatef
 
 if not 'PYMT_DOC' in os.environ:
     Cache.register('pymt.cssrect', limit=100, timeout=60)
 
 
+def _freeze(value):
+    # hashable version of a style value
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    return ('id', id(value))
+
+def css_style_fingerprint(style):
+    '''Return a hashable value that identify the content of a style. Two
+    styles with the same content have the same fingerprint.'''
+    fingerprint = getattr(style, 'fingerprint', None)
+    if fingerprint is None:
+        fingerprint = frozenset((k, _freeze(v)) for k, v in style.items())
+    return fingerprint
+
+
+class CSSStyle(dict):
+    '''Dictionnary of style, that keep his fingerprint until he is changed.
+
+    .. warning::
+        A value changed in place (like a list) is not detected. Set a new
+        value in the style instead.
+    '''
+    __slots__ = ('_fingerprint', )
+
+    def __init__(self, *largs, **kwargs):
+        super(CSSStyle, self).__init__(*largs, **kwargs)
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        '''Fingerprint of the style, see :func:`css_style_fingerprint`'''
+        fingerprint = self._fingerprint
+        if fingerprint is None:
+            fingerprint = self._fingerprint = frozenset(
+                (k, _freeze(v)) for k, v in self.items())
+        return fingerprint
+
+    def __setitem__(self, key, value):
+        self._fingerprint = None
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._fingerprint = None
+        dict.__delitem__(self, key)
+
+    def update(self, *largs, **kwargs):
+        self._fingerprint = None
+        dict.update(self, *largs, **kwargs)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._fingerprint = None
+        return dict.setdefault(self, key, default)
+
+    def pop(self, *largs):
+        self._fingerprint = None
+        return dict.pop(self, *largs)
+
+    def popitem(self):
+        self._fingerprint = None
+        return dict.popitem(self)
+
+    def clear(self):
+        self._fingerprint = None
+        dict.clear(self)
+
+
 def drawCSSRectangle(pos=(0, 0), size=(100, 100), style=dict(), prefix=None, state=None):
     '''Draw a rectangle with CSS
     
@@ -41,10 +123,13 @@ def drawCSSRectangle(pos=(0, 0), size=(100, 100), style=dict(), prefix=None, sta
         bg_image = style.get('bg-image')
 
     # Check if we have a cached version
-    cache_id = '%s:%s:%s:%s:%s' % (pos, size, style, prefix, state)
+    size = tuple(size)
+    cache_id = (css_style_fingerprint(style), size, prefix, state)
     cache = Cache.get('pymt.cssrect', cache_id)
     if cache:
-        cache.draw()
+        with gx_matrix:
+            glTranslatef(pos[0], pos[1], 0)
+            cache.draw()
         if bg_image:
             bg_image.size = size
             bg_image.pos = pos
@@ -78,6 +163,8 @@ def drawCSSRectangle(pos=(0, 0), size=(100, 100), style=dict(), prefix=None, sta
                 newstyle[k.replace(prefix, '')] = style[k]
         style = newstyle
 
+    # don't change the style of the widget, it would change his fingerprint
+    style = dict(style)
     style.setdefault('border-width', 1.5)
     style.setdefault('border-radius', 0)
     style.setdefault('border-radius-precision', .1)
@@ -86,64 +173,67 @@ def drawCSSRectangle(pos=(0, 0), size=(100, 100), style=dict(), prefix=None, sta
     style.setdefault('draw-alpha-background', 0)
     style.setdefault('alpha-background', (1, 1, .5, .5))
 
-    k = { 'pos': pos, 'size': size }
-
-    new_cache = GlDisplayList()
-    with new_cache:
-
-        if state:
-            set_color(*style['bg-color']) #hack becasue old widgets set this themselves
-
-        linewidth = style.get('border-width')
-
-        bordercolor = None
-        if 'border-color' in style:
-            bordercolor = style['border-color']
-
-        if style['border-radius'] > 0:
-            k.update({
-                'radius': style['border-radius'],
-                'precision': style['border-radius-precision']
-            })
-            if style['draw-background']:
-                drawRoundedRectangle(**k)
-            if style['draw-border']:
-                if linewidth:
-                    glPushAttrib(GL_LINE_BIT)
-                    glLineWidth(linewidth)
-                if bordercolor:
-                    with gx_color(*bordercolor):
+    # the display list is drawn at 0, 0, and translated at the position
+    k = { 'pos': (0, 0), 'size': size }
+
+    with gx_matrix:
+        glTranslatef(pos[0], pos[1], 0)
+        new_cache = GlDisplayList()
+        with new_cache:
+
+            if state:
+                set_color(*style['bg-color']) #hack becasue old widgets set this themselves
+
+            linewidth = style.get('border-width')
+
+            bordercolor = None
+            if 'border-color' in style:
+                bordercolor = style['border-color']
+
+            if style['border-radius'] > 0:
+                k.update({
+                    'radius': style['border-radius'],
+                    'precision': style['border-radius-precision']
+                })
+                if style['draw-background']:
+                    drawRoundedRectangle(**k)
+                if style['draw-border']:
+                    if linewidth:
+                        glPushAttrib(GL_LINE_BIT)
+                        glLineWidth(linewidth)
+                    if bordercolor:
+                        with gx_color(*bordercolor):
+                            drawRoundedRectangle(style=GL_LINE_LOOP, **k)
+                    else:
                         drawRoundedRectangle(style=GL_LINE_LOOP, **k)
-                else:
-                    drawRoundedRectangle(style=GL_LINE_LOOP, **k)
-                if linewidth:
-                    glPopAttrib()
-            if style['draw-alpha-background']:
-                drawRoundedRectangleAlpha(alpha=style['alpha-background'], **k)
-        else:
-            if style['draw-background']:
-                drawRectangle(**k)
-            if style['draw-border']:
-                if linewidth:
-                    glPushAttrib(GL_LINE_BIT)
-                    glLineWidth(linewidth)
-                if bordercolor:
-                    with gx_color(*bordercolor):
+                    if linewidth:
+                        glPopAttrib()
+                if style['draw-alpha-background']:
+                    drawRoundedRectangleAlpha(alpha=style['alpha-background'], **k)
+            else:
+                if style['draw-background']:
+                    drawRectangle(**k)
+                if style['draw-border']:
+                    if linewidth:
+                        glPushAttrib(GL_LINE_BIT)
+                        glLineWidth(linewidth)
+                    if bordercolor:
+                        with gx_color(*bordercolor):
+                            drawRectangle(style=GL_LINE_LOOP, **k)
+                    else:
                         drawRectangle(style=GL_LINE_LOOP, **k)
-                else:
-                    drawRectangle(style=GL_LINE_LOOP, **k)
-                if linewidth:
-                    glPopAttrib()
-            if style['draw-alpha-background']:
-                drawRectangleAlpha(alpha=style['alpha-background'], **k)
-
-
-    # if the drawCSSRectangle is already inside a display list
-    # compilation will not happen, but drawing yes.
-    # so, store only if a cache is created !
-    if new_cache.is_compiled():
-        Cache.append('pymt.cssrect', cache_id, new_cache)
-        new_cache.draw()
+                    if linewidth:
+                        glPopAttrib()
+                if style['draw-alpha-background']:
+                    drawRectangleAlpha(alpha=style['alpha-background'], **k)
+
+
+        # if the drawCSSRectangle is already inside a display list
+        # compilation will not happen, but drawing yes.
+        # so, store only if a cache is created !
+        if new_cache.is_compiled():
+            Cache.append('pymt.cssrect', cache_id, new_cache)
+            new_cache.draw()
 
     if bg_image:
         bg_image.size = size
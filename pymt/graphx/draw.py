@@ -14,6 +14,7 @@ __all__ = (
 
 import os
 import math
+import numpy
 import pymt
 from pymt.cache import Cache
 from pymt.vector import Vector
@@ -22,6 +23,7 @@ from OpenGL.GLU import gluNewQuadric, gluDisk, gluPartialDisk
 from pymt.graphx.paint import *
 from pymt.graphx.statement import *
 from pymt.graphx.colors import *
+from pymt.graphx import batch as graphx_batch
 
 try:
     import pymt.c_ext.c_graphx as c_graphx
@@ -45,6 +47,15 @@ def _make_point_list(points):
     else:
         return list(points)
 
+_circle = None
+def _get_circle():
+    # cos and sin of the 32 slices of a circle, for batching
+    global _circle
+    if _circle is None:
+        angles = numpy.linspace(0, math.pi * 2, 33)
+        _circle = numpy.cos(angles), numpy.sin(angles)
+    return _circle
+
 def getLabel(label, **kwargs):
     '''Get a cached label object
 
@@ -55,6 +66,10 @@ def getLabel(label, **kwargs):
             Font size of label
         `center`: bool, default to True
             Indicate if pos is center or left-right of label
+        `atlas`: bool, default to False
+            If True, the label is drawn from the glyph atlas of the font,
+            see :class:`~pymt.core.text.atlas.AtlasLabel`. Usefull for texts
+            that change often.
 
     getLabel() support all parameters from the Core label. Check `LabelBase`
     class to known all availables parameters.
@@ -80,6 +95,8 @@ def getLabel(label, **kwargs):
     if not obj:
         if kwargs.get('markup'):
             obj = pymt.MarkupLabel(label, **kwargs)
+        elif kwargs.get('atlas'):
+            obj = pymt.AtlasLabel(label, **kwargs)
         else:
             obj = pymt.Label(label, **kwargs)
         if 'nocache' not in kwargs:
@@ -155,58 +172,59 @@ def drawRoundedRectangle(pos=(0,0), size=(100,50), radius=5, color=None,
     if size[1] < radius * 2:
         radius = size[1] / 2
 
+    points = []
+    add = points.extend
+
+    if corners[1]:
+        add((x + radius, y, x + w-radius, y))
+        t = math.pi * 1.5
+        while t < math.pi * 2:
+            add((x + w - radius + math.cos(t) * radius,
+                 y + radius + math.sin(t) * radius))
+            t += precision
+    else:
+        add((x + w, y))
+
+    if corners[2]:
+        add((x + w, y + radius, x + w, y + h - radius))
+        t = 0
+        while t < math.pi * 0.5:
+            add((x + w - radius + math.cos(t) * radius,
+                 y + h -radius + math.sin(t) * radius))
+            t += precision
+    else:
+        add((x + w, y + h))
+
+    if corners[3]:
+        add((x + w -radius, y + h, x + radius, y + h))
+        t = math.pi * 0.5
+        while t < math.pi:
+            add((x  + radius + math.cos(t) * radius,
+                 y + h - radius + math.sin(t) * radius))
+            t += precision
+    else:
+        add((x, y + h))
+
+    if corners[0]:
+        add((x, y + h - radius, x, y + radius))
+        t = math.pi
+        while t < math.pi * 1.5:
+            add((x + radius + math.cos(t) * radius,
+                 y + radius + math.sin(t) * radius))
+            t += precision
+    else:
+        add((x, y))
+
+    batch = graphx_batch.current_batch
+    if batch is not None and batch.add(style, points, linewidth=linewidth):
+        return
+
     if linewidth > 0:
         glPushAttrib(GL_LINE_BIT)
         glLineWidth(linewidth)
 
     with gx_begin(style):
-
-        if corners[1]:
-            glVertex2f(x + radius, y)
-            glVertex2f(x + w-radius, y)
-            t = math.pi * 1.5
-            while t < math.pi * 2:
-                sx = x + w - radius + math.cos(t) * radius
-                sy = y + radius + math.sin(t) * radius
-                glVertex2f(sx, sy)
-                t += precision
-        else:
-            glVertex2f(x + w, y)
-
-        if corners[2]:
-            glVertex2f(x + w, y + radius)
-            glVertex2f(x + w, y + h - radius)
-            t = 0
-            while t < math.pi * 0.5:
-                sx = x + w - radius + math.cos(t) * radius
-                sy = y + h -radius + math.sin(t) * radius
-                glVertex2f(sx, sy)
-                t += precision
-        else:
-            glVertex2f(x + w, y + h)
-
-        if corners[3]:
-            glVertex2f(x + w -radius, y + h)
-            glVertex2f(x + radius, y + h)
-            t = math.pi * 0.5
-            while t < math.pi:
-                sx = x  + radius + math.cos(t) * radius
-                sy = y + h - radius + math.sin(t) * radius
-                glVertex2f(sx, sy)
-                t += precision
-        else:
-            glVertex2f(x, y + h)
-
-        if corners[0]:
-            glVertex2f(x, y + h - radius)
-            glVertex2f(x, y + radius)
-            t = math.pi
-            while t < math.pi * 1.5:
-                sx = x + radius + math.cos(t) * radius
-                sy = y + radius + math.sin(t) * radius
-                glVertex2f (sx, sy)
-                t += precision
-        else:
+        for x, y in zip(points[::2], points[1::2]):
             glVertex2f(x, y)
 
     if linewidth > 0:
@@ -223,6 +241,22 @@ def drawCircle(pos=(0,0), radius=1.0, linewidth=0):
             Radius of circle
     '''
     x, y = pos[0], pos[1]
+    batch = graphx_batch.current_batch
+    if batch is not None:
+        # 32 slices, like gluDisk()
+        cos, sin = _get_circle()
+        outer = numpy.column_stack((x + cos * radius, y + sin * radius))
+        if linewidth > 0:
+            # one quad between the 2 rings for each slice
+            inner_radius = radius - linewidth
+            inner = numpy.column_stack((x + cos * inner_radius,
+                                        y + sin * inner_radius))
+            batch.add(GL_QUADS, numpy.column_stack((
+                inner[:-1], outer[:-1], outer[1:], inner[1:])))
+        else:
+            batch.add(GL_POLYGON, outer[:-1])
+        return
+
     with gx_matrix:
         glTranslatef(x, y, 0)
         glScalef(radius, radius, 1.0)
@@ -257,6 +291,10 @@ def drawPolygon(points, style=GL_POLYGON, linewidth=0):
 
     points = _make_point_list(points)
 
+    batch = graphx_batch.current_batch
+    if batch is not None and batch.add(style, points, linewidth=linewidth):
+        return
+
     # use accelerate version
     if c_graphx:
         c_graphx.drawPolygon(style, points, linewidth)
@@ -306,6 +344,13 @@ def drawRectangle(pos=(0,0), size=(1.0,1.0), style=GL_QUADS):
         `style`: opengl begin, default to GL_QUADS
             Style of rectangle (try GL_LINE_LOOP)
     '''
+    batch = graphx_batch.current_batch
+    if batch is not None:
+        x, y = pos
+        w, h = size
+        if batch.add(style, (x, y, x + w, y, x + w, y + h, x, y + h)):
+            return
+
     # use accelerated version
     if c_graphx:
         c_graphx.drawRectangle(style, pos[0], pos[1], size[0], size[1])
@@ -414,6 +459,16 @@ def drawLine(points, width=None, colors=[]):
     elif l > 4:
         style = GL_LINE_STRIP
 
+    batch = graphx_batch.current_batch
+    if batch is not None:
+        if colors:
+            colors = numpy.asarray(colors, dtype='float32').reshape(-1, 3)
+            colors = numpy.column_stack((colors, numpy.ones(len(colors))))
+        else:
+            colors = None
+        if batch.add(style, points, colors, width):
+            return
+
     if width is not None:
         glPushAttrib(GL_LINE_BIT)
         glLineWidth(width)
@@ -49,11 +49,13 @@ import pymt
 from OpenGL.GL import GL_COMPILE, GL_COMPILE_AND_EXECUTE, \
         GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_BLEND, GL_MODELVIEW, \
         GL_COLOR_BUFFER_BIT, GL_ENABLE_BIT, GL_TEXTURE_2D, GL_DST_COLOR, \
-        GL_ONE, GL_ZERO, \
+        GL_ONE, GL_ZERO, GL_CURRENT_BIT, \
         glEnable, glDisable, glGenLists, glNewList, glEndList, glCallList, \
         glBlendFunc, glMatrixMode, glPushMatrix, glLoadIdentity, glPopAttrib, \
         glPushMatrix, glPopAttrib, glColor3f, glColor4f, glBindTexture, \
         glPopMatrix, glBegin, glEnd, glPushAttrib
+from pymt.graphx.batch import flush_batch, suspend_batch, resume_batch, \
+        batch_color, sync_batch_color
 
 gl_displaylist_generate = False
 class GlDisplayList:
@@ -70,12 +72,18 @@ class GlDisplayList:
         `mode` : str, default to 'compile'
             If mode is 'execute', the code in with will be also compiled + executed.
     '''
+
+    #: Number of display lists compiled since the start of the application.
+    #: Usefull to check that display lists are not compiled at every frame.
+    compile_count = 0
+
     def __init__(self, **kwargs):
         kwargs.setdefault('mode', 'compile')
         self.dl = glGenLists(1)
         self.compiled = False
         self.do_compile = True
         self.mode = GL_COMPILE
+        self._batch = None
         if 'execute' in kwargs.get('mode'):
             self.mode = GL_COMPILE_AND_EXECUTE
 
@@ -88,6 +96,8 @@ class GlDisplayList:
     def start(self):
         '''Start recording GL operation'''
         global gl_displaylist_generate
+        # batched primitives would be drawn after the end of the list
+        self._batch = suspend_batch()
         if gl_displaylist_generate:
             self.do_compile = False
         else:
@@ -101,7 +111,10 @@ class GlDisplayList:
         if self.do_compile:
             glEndList()
             self.compiled = True
+            GlDisplayList.compile_count += 1
             gl_displaylist_generate = False
+        resume_batch(self._batch)
+        self._batch = None
 
     def clear(self):
         '''Clear compiled flag'''
@@ -115,7 +128,10 @@ class GlDisplayList:
         '''Call the list only if it's compiled'''
         if not self.compiled:
             return
+        flush_batch()
         glCallList(self.dl)
+        # the list can change the color
+        sync_batch_color()
 
 class DO:
     '''A way to do multiple action in with statement
@@ -149,10 +165,12 @@ class GlBlending:
         self.dfactor = dfactor
 
     def __enter__(self):
+        flush_batch()
         glEnable(GL_BLEND)
         glBlendFunc(self.sfactor, self.dfactor)
 
     def __exit__(self, extype, value, traceback):
+        flush_batch()
         glDisable(GL_BLEND)
 
 class GlMatrix:
@@ -172,12 +190,14 @@ class GlMatrix:
         self.matrixmode = matrixmode
 
     def __enter__(self):
+        flush_batch()
         glMatrixMode(self.matrixmode)
         glPushMatrix()
         if self.do_loadidentity:
             glLoadIdentity()
 
     def __exit__(self, extype, value, traceback):
+        flush_batch()
         glMatrixMode(self.matrixmode)
         glPopMatrix()
 
@@ -190,9 +210,11 @@ class GlEnable:
         self.flag = flag
 
     def __enter__(self):
+        flush_batch()
         glEnable(self.flag)
 
     def __exit__(self, extype, value, traceback):
+        flush_batch()
         glDisable(self.flag)
 
 gx_enable = GlEnable
@@ -206,6 +228,7 @@ class GlBegin:
         self.flag = flag
 
     def __enter__(self):
+        flush_batch()
         glBegin(self.flag)
 
     def __exit__(self, extype, value, traceback):
@@ -221,14 +244,18 @@ class GlAttrib:
         self.flag = flag
 
     def __enter__(self):
+        flush_batch()
         glPushAttrib(self.flag)
 
     def __exit__(self, extype, value, traceback):
+        flush_batch()
         glPopAttrib()
+        sync_batch_color()
 
 class GlColor:
-    '''Statement of glPushAttrib/glPopAttrib on COLOR BUFFER + color,
-    designed to be use with "with" keyword
+    '''Statement of glPushAttrib/glPopAttrib on COLOR BUFFER + CURRENT +
+    color, designed to be use with "with" keyword. The previous color is
+    restored at the end.
 
     Alias: gx_color.
     '''
@@ -237,16 +264,20 @@ class GlColor:
             self.color = (r, g, b)
         else:
             self.color = (r, g, b, a)
+        self._previous = None
 
     def __enter__(self):
-        glPushAttrib(GL_COLOR_BUFFER_BIT)
+        glPushAttrib(GL_COLOR_BUFFER_BIT | GL_CURRENT_BIT)
         if len(self.color) == 3:
             glColor3f(*self.color)
         else:
             glColor4f(*self.color)
+        self._previous = batch_color(self.color)
 
     def __exit__(self, extype, value, traceback):
         glPopAttrib()
+        batch_color(self._previous)
+        self._previous = None
 
 class GlTexture:
     '''Statement of setting a texture
@@ -265,12 +296,14 @@ class GlTexture:
     def bind(self):
         '''Bind the texture on the current context / texture unit'''
         target = self.get_target()
+        flush_batch()
         glPushAttrib(GL_ENABLE_BIT)
         glEnable(target)
         glBindTexture(target, self.get_id())
 
     def release(self):
         '''Release the current attribute from the binded texture'''
+        flush_batch()
         glPopAttrib()
 
     def get_id(self):
@@ -6,4 +6,5 @@ from pymt.input.postproc import *
 from pymt.input.provider import *
 from pymt.input.factory import *
 from pymt.input.providers import *
+from pymt.input.recorder import *
 from pymt.input.touch import *
@@ -2,9 +2,10 @@
 Input Postproc: analyse and process input (double tap, ignore list...)
 '''
 
-__all__ = ('pymt_postproc_modules', )
+__all__ = ('pymt_postproc_modules', 'InputEventBatch')
 
 import os
+from pymt.input.postproc.batch import InputEventBatch
 from . import doubletap
 from . import ignorelist
 from . import retaintouch
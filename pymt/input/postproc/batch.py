@@ -0,0 +1,132 @@
+'''
+Batch: columnar representation of the input events of one frame
+
+The events of a frame are a list of (type, touch) tuples. InputEventBatch keep
+this list, and expose the interesting values as numpy arrays, so a postproc
+module can test all the events at once instead of looping in Python ::
+
+    def process_batch(self, batch):
+        # keep only the events in the left part of the screen
+        return batch.select(batch.pos[:, 0] < 0.5)
+
+Available columns:
+
+    * `types`: event type, one of EVENT_DOWN, EVENT_MOVE, EVENT_UP (int8)
+    * `ids`: uniq id of the touch, touch.uid (int64)
+    * `pos`: position of the touch in 0-1, touch.sx/touch.sy (float64, Nx2)
+
+Columns are computed the first time they are used, and keeped when a new
+batch is created with select().
+
+Building the columns have a cost: with the few events of an usual frame, a
+loop over `batch.events` is faster. The columns are usefull for the modules
+that receive many events at once.
+
+.. warning::
+    The columns are a snapshot of the touch values when they are computed. If
+    a module change the position of a touch, it must use replace() or create a
+    new batch.
+'''
+
+__all__ = ('InputEventBatch', 'EVENT_DOWN', 'EVENT_MOVE', 'EVENT_UP')
+
+import numpy
+
+EVENT_DOWN = 0
+EVENT_MOVE = 1
+EVENT_UP = 2
+
+_event_codes = {'down': EVENT_DOWN, 'move': EVENT_MOVE, 'up': EVENT_UP}
+
+class InputEventBatch(object):
+    '''Events of one frame, with numpy columns.
+
+    :Parameters:
+        `events` : list
+            List of (type, touch), in dispatch order. The list is used
+            directly, not copied.
+    '''
+
+    __slots__ = ('events', '_types', '_ids', '_pos')
+
+    def __init__(self, events=None):
+        if events is None:
+            events = []
+        self.events = events
+        self._types = None
+        self._ids = None
+        self._pos = None
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __getitem__(self, index):
+        return self.events[index]
+
+    @property
+    def types(self):
+        '''Type of the events (EVENT_DOWN, EVENT_MOVE or EVENT_UP)'''
+        if self._types is None:
+            codes = _event_codes
+            self._types = numpy.array([codes[t] for t, touch in self.events],
+                                      dtype=numpy.int8)
+        return self._types
+
+    @property
+    def ids(self):
+        '''Uniq id of the touchs (touch.uid)'''
+        if self._ids is None:
+            self._ids = numpy.array([touch.uid for t, touch in self.events],
+                                    dtype=numpy.int64)
+        return self._ids
+
+    @property
+    def pos(self):
+        '''Position of the touchs in 0-1 (touch.sx, touch.sy)'''
+        if self._pos is None:
+            events = self.events
+            pos = numpy.empty((len(events), 2))
+            pos[:, 0] = [touch.sx for t, touch in events]
+            pos[:, 1] = [touch.sy for t, touch in events]
+            self._pos = pos
+        return self._pos
+
+    def select(self, mask):
+        '''Return a new batch with only the events selected by `mask`.
+        `mask` can be a boolean array, or an array of indices.'''
+        indices = numpy.flatnonzero(mask) if \
+                numpy.asarray(mask).dtype == bool else mask
+        events = self.events
+        batch = InputEventBatch([events[i] for i in indices.tolist()])
+        if self._types is not None:
+            batch._types = self._types[indices]
+        if self._ids is not None:
+            batch._ids = self._ids[indices]
+        if self._pos is not None:
+            batch._pos = self._pos[indices]
+        return batch
+
+    def replace(self, index, touch):
+        '''Replace the touch of the event at `index`. The type of the event is
+        not changed.'''
+        self.events[index] = (self.events[index][0], touch)
+        if self._ids is not None:
+            self._ids[index] = touch.uid
+        if self._pos is not None:
+            self._pos[index] = touch.sx, touch.sy
+
+    def extend(self, events):
+        '''Add events at the end of the batch'''
+        if not events:
+            return
+        other = InputEventBatch(list(events))
+        if self._types is not None:
+            self._types = numpy.concatenate((self._types, other.types))
+        if self._ids is not None:
+            self._ids = numpy.concatenate((self._ids, other.ids))
+        if self._pos is not None:
+            self._pos = numpy.concatenate((self._pos, other.pos))
+        self.events.extend(other.events)
@@ -12,6 +12,7 @@ movements caused by jitter and will be discarded.
 __all__ = ('InputPostprocDejitter', )
 
 from pymt.config import pymt_config
+from pymt.input.postproc.batch import InputEventBatch
 
 class InputPostprocDejitter(object):
     '''
@@ -33,7 +34,8 @@ class InputPostprocDejitter(object):
     def __init__(self):
         self.jitterdist = pymt_config.getfloat('pymt', 'jitter_distance')
         ignore_devices = pymt_config.get('pymt', 'jitter_ignore_devices')
-        self.ignore_devices = ignore_devices.split(',')
+        self.ignore_devices = [x for x in ignore_devices.split(',') if x]
+        # last position of the touchs (touch uid -> (sx, sy))
         self.last_touches = {}
 
     def taxicab_distance(self, p, q):
@@ -41,26 +43,38 @@ class InputPostprocDejitter(object):
         return abs(p[0]-q[0]) + abs(p[1]-q[1])
 
     def process(self, events):
-        if not self.jitterdist:
-            return events
+        return self.process_batch(InputEventBatch(events)).events
+
+    def process_batch(self, batch):
+        jitterdist = self.jitterdist
+        if not jitterdist:
+            return batch
+        ignore_devices = self.ignore_devices
+        last_touches = self.last_touches
+        events = batch.events
         processed = []
-        for type, touch in events:
-            if touch.device in self.ignore_devices:
-                processed.append((type, touch))
+        for event in events:
+            type, touch = event
+            if ignore_devices and touch.device in ignore_devices:
+                processed.append(event)
                 continue
-            if type == 'down':
-                self.last_touches[touch.id] = touch.spos
-            if type == 'up':
-                del self.last_touches[touch.id]
-            if type != 'move':
-                processed.append((type, touch))
+            if type == 'move':
+                # Check whether the touch moved more than the jitter
+                # distance. Only if the touch has moved more than the jitter
+                # dist we take it into account and dispatch it. Otherwise
+                # suppress it. A touch without down is always accepted.
+                sx, sy = touch.sx, touch.sy
+                last = last_touches.get(touch.uid)
+                if last is None or \
+                   abs(sx - last[0]) + abs(sy - last[1]) > jitterdist:
+                    last_touches[touch.uid] = sx, sy
+                    processed.append(event)
                 continue
-            # Check whether the touch moved more than the jitter distance
-            last_spos = self.last_touches[touch.id]
-            dist = self.taxicab_distance(last_spos, touch.spos)
-            if dist > self.jitterdist:
-                # Only if the touch has moved more than the jitter dist we take
-                # it into account and dispatch it. Otherwise suppress it.
-                self.last_touches[touch.id] = touch.spos
-                processed.append((type, touch))
-        return processed
+            if type == 'down':
+                last_touches[touch.uid] = touch.sx, touch.sy
+            else:
+                last_touches.pop(touch.uid, None)
+            processed.append(event)
+        if len(processed) == len(events):
+            return batch
+        return InputEventBatch(processed)
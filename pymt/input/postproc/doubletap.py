@@ -4,9 +4,12 @@ Double Tap: search touch for a double tap
 
 __all__ = ('InputPostprocDoubleTap', )
 
+from heapq import heappush, heappop
+from math import hypot
 from pymt.config import pymt_config
-from pymt.vector import Vector
+from pymt.spatialindex import SpatialGrid
 from pymt.clock import getClock
+from pymt.input.postproc.batch import InputEventBatch
 
 class InputPostprocDoubleTap(object):
     '''
@@ -20,53 +23,87 @@ class InputPostprocDoubleTap(object):
     Distance parameter is in 0-1000, and time is in millisecond.
     '''
     def __init__(self):
-        self.double_tap_distance = pymt_config.getint('pymt', 'double_tap_distance') / 1000.0
+        self._double_tap_distance = pymt_config.getint('pymt', 'double_tap_distance') / 1000.0
         self.double_tap_time = pymt_config.getint('pymt', 'double_tap_time') / 1000.0
         self.touches = {}
 
+    def _get_double_tap_distance(self):
+        return self._double_tap_distance
+    def _set_double_tap_distance(self, value):
+        self._double_tap_distance = value
+        # the size of the cells depend of the distance, rebuild the index
+        self.touches = self._touches
+    double_tap_distance = property(
+        _get_double_tap_distance, _set_double_tap_distance,
+        doc='Maximum distance between two touches of a double tap (0-1)')
+
+    def _get_touches(self):
+        return self._touches
+    def _set_touches(self, touches):
+        # only the ended touchs can be a double tap candidate. They are
+        # indexed by their initial position, and expired in the order of
+        # their start time.
+        self._touches = touches
+        self._grid = SpatialGrid(
+            cell_size=max(self._double_tap_distance * 2, 0.001))
+        self._expire = []
+        for type, touch in touches.values():
+            self._add_candidate(touch)
+    touches = property(_get_touches, _set_touches,
+        doc='Ended touches that can be a double tap (uid -> (type, touch))')
+
+    def _add_candidate(self, touch):
+        distance = self._double_tap_distance
+        self._grid.update(touch, touch.osxpos - distance,
+                          touch.osypos - distance, distance * 2, distance * 2)
+        heappush(self._expire, (touch.time_start, touch.uid, touch))
+
     def find_double_tap(self, ref):
         '''Find a double tap touch within self.touches.
         The touch must be not a previous double tap, and the distance must be
-        ok'''
-        for touchid in self.touches:
-            if ref.uid == touchid:
-                continue
-            type, touch = self.touches[touchid]
-            if type != 'up':
-                continue
-            if touch.is_double_tap:
+        ok. If many touches are available, the nearest is returned.'''
+        x, y = ref.sx, ref.sy
+        candidates = []
+        for touch in self._grid.query(x, y):
+            if touch.uid == ref.uid or touch.is_double_tap:
                 continue
-            distance = Vector.distance(
-                Vector(ref.sx, ref.sy),
-                Vector(touch.osxpos, touch.osypos))
-            if distance > self.double_tap_distance:
+            distance = hypot(x - touch.osxpos, y - touch.osypos)
+            if distance > self._double_tap_distance:
                 continue
-            touch.double_tap_distance = distance
-            return touch
-        return None
-
+            candidates.append((distance, touch.uid, touch))
+        if not candidates:
+            return None
+        distance, uid, touch = min(candidates)
+        touch.double_tap_distance = distance
+        return touch
 
     def process(self, events):
-        # first, check if a touch down have a double tap
-        for type, touch in events:
-            if type == 'down':
-                touch_double_tap = self.find_double_tap(touch)
-                if touch_double_tap:
-                    touch.is_double_tap = True
-                    touch.double_tap_time = touch.time_start - touch_double_tap.time_start
-                    touch.double_tap_distance = touch_double_tap.double_tap_distance
-
-            # add the touch internaly
-            self.touches[touch.uid] = (type, touch)
+        return self.process_batch(InputEventBatch(events)).events
 
-        # second, check if up-touch is timeout for double tap
-        time_current = getClock().get_time()
-        for touchid in list(self.touches.keys())[:]:
-            type, touch = self.touches[touchid]
-            if type != 'up':
+    def process_batch(self, batch):
+        touches = self._touches
+        # check in order if a touch down have a double tap, and add the
+        # touch up as candidates. moves are not interesting.
+        for type, touch in batch.events:
+            if type == 'move':
                 continue
-            if time_current - touch.time_start < self.double_tap_time:
+            if type == 'up':
+                touches[touch.uid] = (type, touch)
+                self._add_candidate(touch)
                 continue
-            del self.touches[touchid]
+            touch_double_tap = self.find_double_tap(touch)
+            if touch_double_tap:
+                touch.is_double_tap = True
+                touch.double_tap_time = touch.time_start - touch_double_tap.time_start
+                touch.double_tap_distance = touch_double_tap.double_tap_distance
+
+        # second, check if up-touch is timeout for double tap
+        expire = self._expire
+        if expire:
+            timeout = getClock().get_time() - self.double_tap_time
+            while expire and expire[0][0] <= timeout:
+                time_start, uid, touch = heappop(expire)
+                touches.pop(uid, None)
+                self._grid.remove(touch)
 
-        return events
+        return batch
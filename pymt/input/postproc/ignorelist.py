@@ -6,6 +6,7 @@ __all__ = ('InputPostprocIgnoreList', )
 
 from pymt.config import pymt_config
 from pymt.utils import strtotuple
+from pymt.input.postproc.batch import InputEventBatch
 
 class InputPostprocIgnoreList(object):
     '''
@@ -20,6 +21,8 @@ class InputPostprocIgnoreList(object):
     '''
     def __init__(self):
         self.ignore_list = strtotuple(pymt_config.get('pymt', 'ignore'))
+        # uid of the ignored touchs that are not ended
+        self._ignored = set()
 
     def collide_ignore(self, touch):
         x, y = touch.sx, touch.sy
@@ -29,12 +32,24 @@ class InputPostprocIgnoreList(object):
                 return True
 
     def process(self, events):
+        return self.process_batch(InputEventBatch(events)).events
+
+    def process_batch(self, batch):
         if not len(self.ignore_list):
-            return events
+            return batch
+        events = batch.events
+        ignored = self._ignored
         for type, touch in events:
-            if type != 'down':
-                continue
-            if self.collide_ignore(touch):
+            if type == 'down' and self.collide_ignore(touch):
                 touch.userdata['__ignore__'] = True
-        return [(type, touch) for type, touch in events \
-                if not '__ignore__' in touch.userdata]
+                ignored.add(touch.uid)
+        if not ignored:
+            return batch
+        processed = [event for event in events if event[1].uid not in ignored]
+        # the ended touchs can be forgotten
+        for type, touch in events:
+            if type == 'up':
+                ignored.discard(touch.uid)
+        if len(processed) == len(events):
+            return batch
+        return InputEventBatch(processed)
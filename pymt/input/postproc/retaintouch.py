@@ -4,9 +4,12 @@ Retain Touch: reuse touch to counter finger lost behavior
 
 __all__ = ('InputPostprocRetainTouch', )
 
-from pymt.config import pymt_config
-from pymt.vector import Vector
 import time
+from collections import deque
+from math import hypot
+from pymt.config import pymt_config
+from pymt.spatialindex import SpatialGrid
+from pymt.input.postproc.batch import InputEventBatch
 
 class InputPostprocRetainTouch(object):
     '''
@@ -25,62 +28,98 @@ class InputPostprocRetainTouch(object):
     def __init__(self):
         self.timeout = pymt_config.getint('pymt', 'retain_time') / 1000.0
         self.distance = pymt_config.getint('pymt', 'retain_distance') / 1000.0
-        self._available = []
+        # retained touchs, indexed by their position
+        self._available = SpatialGrid(cell_size=max(self.distance * 2, 0.001))
+        # (retain time, touch), in the order of retain time
+        self._expire = deque()
         self._links = {}
 
     def process(self, events):
+        return self.process_batch(InputEventBatch(events)).events
+
+    def _retain(self, touch, d):
+        distance = self.distance
+        touch.userdata['__retain_time'] = d
+        self._available.update(touch, touch.sx - distance, touch.sy - distance,
+                               distance * 2, distance * 2)
+        self._expire.append((d, touch))
+
+    def _find_nearest(self, touch):
+        # search the nearest retained touch of the same class
+        x, y = touch.sx, touch.sy
+        cls = touch.__class__
+        candidates = []
+        for touch2 in self._available.query(x, y):
+            if touch2.__class__ != cls:
+                continue
+            distance = hypot(x - touch2.sx, y - touch2.sy)
+            if distance > self.distance:
+                continue
+            candidates.append((distance, touch2.uid, touch2))
+        if not candidates:
+            return None
+        return min(candidates)[2]
+
+    def process_batch(self, batch):
         # check if module is disabled
         if self.timeout == 0:
-            return events
+            return batch
 
         d = time.time()
-        for type, touch in events[:]:
-            if type == 'up':
-                events.remove((type, touch))
-                if touch.uid in self._links:
-                    selection = self._links[touch.uid]
-                    selection.userdata['__retain_time'] = d
-                    self._available.append(selection)
-                    del self._links[touch.uid]
-                else:
-                    touch.userdata['__retain_time'] = d
-                    self._available.append(touch)
-            elif type == 'move':
-                if touch.uid in self._links:
-                    selection = self._links[touch.uid]
-                    selection.x = touch.x
-                    selection.y = touch.y
-                    selection.sx = touch.sx
-                    selection.sy = touch.sy
-                    events.remove((type, touch))
-                    events.append((type, selection))
-                else:
-                    pass
-            elif type == 'down':
-                # new touch, found the nearest one
-                selection = None
-                selection_distance = 99999
-                for touch2 in self._available:
-                    touch_distance = Vector(touch2.spos).distance(touch.spos)
-                    if touch_distance > self.distance:
-                        continue
-                    if touch2.__class__ != touch.__class__:
-                        continue
-                    if touch_distance < selection_distance:
-                        # eligible for continuation
-                        selection_distance = touch_distance
-                        selection = touch2
-                if selection is None:
+        links = self._links
+        available = self._available
+        events = batch.events
+        if events:
+            # events are done in order: up and down change the available
+            # touchs, and a move of a linked touch is replaced by a move of
+            # the retained touch.
+            processed = []
+            changed = False
+            for event in events:
+                type, touch = event
+                if type == 'move':
+                    if links:
+                        selection = links.get(touch.uid)
+                        if selection is not None:
+                            selection.x = touch.x
+                            selection.y = touch.y
+                            selection.sx = touch.sx
+                            selection.sy = touch.sy
+                            selection.time_event = touch.time_event
+                            event = (type, selection)
+                            changed = True
+                    processed.append(event)
+                    continue
+
+                if type == 'up':
+                    selection = links.pop(touch.uid, None)
+                    if selection is None:
+                        selection = touch
+                    self._retain(selection, d)
+                    changed = True
                     continue
 
-                self._links[touch.uid] = selection
-                self._available.remove(selection)
-                events.remove((type, touch))
+                # new touch, found the nearest one
+                if len(available):
+                    selection = self._find_nearest(touch)
+                    if selection is not None:
+                        links[touch.uid] = selection
+                        available.remove(selection)
+                        changed = True
+                        continue
+                processed.append(event)
+            if changed:
+                batch = InputEventBatch(processed)
 
-        for touch in self._available[:]:
-            t = touch.userdata['__retain_time']
-            if d - t > self.timeout:
-                self._available.remove(touch)
-                events.append(('up', touch))
+        # touchs are retained in time order, the expired one are at the
+        # start of the queue. the linked touchs are not available anymore.
+        expire = self._expire
+        expired = []
+        while expire and d - expire[0][0] > self.timeout:
+            t, touch = expire.popleft()
+            if touch in available and touch.userdata['__retain_time'] == t:
+                available.remove(touch)
+                expired.append(('up', touch))
+        batch.extend(expired)
 
-        return events
+        return batch
@@ -1,8 +1,118 @@
 '''
 Touch Provider: Abstract class for a provider
+
+Providers that read their device in a thread must not create or change the
+Touch objects from the thread. The thread push fixed size records in a
+:class:`TouchRingBuffer`, and the provider create/update the touches from the
+main thread, in update() ::
+
+    def start(self):
+        self.ringbuffer = TouchRingBuffer()
+        # start the thread...
+
+    def _thread_run(self):
+        # ...
+        self.ringbuffer.push(EVENT_DOWN, touch_id, x, y)
+        self.wakeup()
+
+    def update(self, dispatch_fn):
+        self.dispatch_ringbuffer(self.ringbuffer, dispatch_fn, MyTouch)
 '''
 
-__all__ = ('TouchProvider', )
+__all__ = ('TouchProvider', 'TouchRingBuffer')
+
+import time
+import numpy
+from pymt.input.postproc.batch import EVENT_DOWN, EVENT_MOVE, EVENT_UP
+
+_event_names = {EVENT_DOWN: 'down', EVENT_MOVE: 'move', EVENT_UP: 'up'}
+_nan = float('nan')
+
+class TouchRingBuffer(object):
+    '''Ring buffer of touch events, written by one thread and read by the main
+    thread. No lock is used: the writer only change the write index, and the
+    reader only change the read index.
+
+    Each record contain the touch id, the event type (EVENT_DOWN, EVENT_MOVE
+    or EVENT_UP), the position and optionally the pressure and the size (0-1)
+    of the touch, and the time of the event. Missing values are nan.
+
+    The writer thread is never blocked. When the buffer is full, the events
+    are dropped and counted in `dropped`. The last records are kept for the
+    down and up events: moves are dropped first.
+
+    :Parameters:
+        `size` : int, default to 1024
+            Maximum number of events in the buffer
+    '''
+
+    dtype = numpy.dtype([
+        ('id', numpy.int64), ('type', numpy.int8),
+        ('x', numpy.float64), ('y', numpy.float64),
+        ('pressure', numpy.float64),
+        ('size_w', numpy.float64), ('size_h', numpy.float64),
+        ('time', numpy.float64)])
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.records = numpy.zeros(size, dtype=TouchRingBuffer.dtype)
+        #: Number of events dropped because the buffer was full
+        self.dropped = 0
+        # moves can't use the last records of the buffer
+        self._move_limit = size - max(1, size // 8)
+        self._read = 0
+        self._write = 0
+
+    def __len__(self):
+        return self._write - self._read
+
+    def push(self, type, id, x=_nan, y=_nan, pressure=_nan,
+             size_w=_nan, size_h=_nan):
+        '''Add an event in the buffer. Must be called only from the writer
+        thread. Return False if the event have been dropped.'''
+        write = self._write
+        used = write - self._read
+        if used >= self.size or \
+           (type == EVENT_MOVE and used >= self._move_limit):
+            self.dropped += 1
+            return False
+        self.records[write % self.size] = (id, type, x, y, pressure,
+                                           size_w, size_h, time.time())
+        # publish the record only when it's written
+        self._write = write + 1
+        return True
+
+    def peek(self):
+        '''Return the events available, without copying them, as a list of one
+        or two views of the records (two if the events wrap around the end of
+        the buffer). The events stay in the buffer until :meth:`consume` is
+        called, so the writer thread doesn't overwrite them. Must be called
+        only from the reader thread.'''
+        read, write = self._read, self._write
+        if read == write:
+            return []
+        size = self.size
+        start = read % size
+        end = start + write - read
+        if end <= size:
+            return [self.records[start:end]]
+        return [self.records[start:], self.records[:end - size]]
+
+    def consume(self, count):
+        '''Remove the <count> first events of the buffer, after they have been
+        read with :meth:`peek`. Must be called only from the reader thread.'''
+        self._read += count
+
+    def pop(self):
+        '''Return all the events available as a list of tuples (id, type, x,
+        y, pressure, size_w, size_h, time), and remove them from the buffer.
+        Must be called only from the reader thread.'''
+        events = []
+        for records in self.peek():
+            events.extend(records.tolist())
+            self.consume(len(records))
+        return events
+
 
 class TouchProvider(object):
 
@@ -19,3 +129,61 @@ class TouchProvider(object):
 
     def update(self, dispatch_fn):
         pass
+
+    def wakeup(self):
+        '''Wake up the main loop if it's sleeping. Providers that read their
+        device in a thread must call it when new events are queued.'''
+        from pymt.base import getEventLoop
+        evloop = getEventLoop()
+        if evloop is not None:
+            evloop.wakeup()
+
+    def dispatch_ringbuffer(self, ringbuffer, dispatch_fn, touch_class):
+        '''Create or update the touches from the events of a
+        :class:`TouchRingBuffer`, and dispatch them. Must be called from
+        update().
+
+        The touches are created with touch_class(device, id, args), and moved
+        with touch.move(args). `args` is a dict with `id`, `x`, `y`, and
+        `pressure`, `size_w`, `size_h` if they are available. The same dict
+        is reused for all the events, the touch must not keep it.
+        '''
+        try:
+            touches = self._ringbuffer_touches
+        except AttributeError:
+            touches = self._ringbuffer_touches = {}
+        args = {}
+        for records in ringbuffer.peek():
+            # read the records by column, and release them for the writer
+            # thread before dispatching.
+            events = zip(records['id'].tolist(), records['type'].tolist(),
+                         records['x'].tolist(), records['y'].tolist(),
+                         records['pressure'].tolist(),
+                         records['size_w'].tolist(),
+                         records['size_h'].tolist(), records['time'].tolist())
+            ringbuffer.consume(len(records))
+            for tid, type, x, y, pressure, size_w, size_h, t in events:
+                args.clear()
+                args['id'] = tid
+                if x == x:
+                    args['x'] = x
+                    args['y'] = y
+                if pressure == pressure:
+                    args['pressure'] = pressure
+                if size_w == size_w and size_h == size_h:
+                    args['size_w'] = size_w
+                    args['size_h'] = size_h
+
+                if type == EVENT_DOWN:
+                    touch = touches[tid] = touch_class(self.device, tid, args)
+                else:
+                    touch = touches.get(tid)
+                    if touch is None:
+                        continue
+                    if 'x' in args:
+                        touch.move(args)
+                    if type == EVENT_UP:
+                        del touches[tid]
+                # the event is received when it's pushed by the thread
+                touch.time_event = t
+                dispatch_fn(_event_names[type], touch)
@@ -8,6 +8,8 @@ import os
 
 from pymt.input.providers.tuio import *
 from pymt.input.providers.mouse import *
+from pymt.input.providers.replay import *
+from pymt.input.providers.synthetic import *
 
 if sys.platform == 'win32' or 'PYMT_DOC' in os.environ:
     try:
@@ -65,10 +65,10 @@ if 'PYMT_DOC' in os.environ:
 
 else:
     import threading
-    import collections
     import struct
     import fcntl
-    from pymt.input.provider import TouchProvider
+    from pymt.input.provider import TouchProvider, TouchRingBuffer
+    from pymt.input.postproc.batch import EVENT_DOWN, EVENT_MOVE, EVENT_UP
     from pymt.input.factory import TouchFactory
     from pymt.logger import pymt_logger
 
@@ -185,13 +185,12 @@ else:
             if self.input_fn is None:
                 return
             self.uid = 0
-            self.queue = collections.deque()
+            self.ringbuffer = TouchRingBuffer()
             self.thread = threading.Thread(
                 target=self._thread_run,
                 kwargs=dict(
-                    queue=self.queue,
+                    ringbuffer=self.ringbuffer,
                     input_fn=self.input_fn,
-                    device=self.device,
                     default_ranges=self.default_ranges
                 ))
             self.thread.daemon = True
@@ -199,13 +198,13 @@ else:
 
         def _thread_run(self, **kwargs):
             input_fn = kwargs.get('input_fn')
-            queue = kwargs.get('queue')
-            device = kwargs.get('device')
+            push = kwargs.get('ringbuffer').push
             drs = kwargs.get('default_ranges').get
             touches = {}
-            touches_sent = []
+            touches_sent = set()
             point = {}
             l_points = []
+            nan = float('nan')
 
             # prepare some vars to get limit of some component
             range_min_position_x    = 0
@@ -218,27 +217,26 @@ else:
             invert_y                = int(bool(drs('invert_y', 0)))
 
             def process(points):
+                # the touches are created/updated in the main thread, just
+                # remember the last position of each touch, and push values
                 actives = [args['id'] for args in points]
                 for args in points:
                     tid = args['id']
-                    try:
-                        touch = touches[tid]
-                        if touch.sx == args['x'] and touch.sy == args['y']:
-                            continue
-                        touch.move(args)
-                        if tid not in touches_sent:
-                            queue.append(('down', touch))
-                            touches_sent.append(tid)
-                        queue.append(('move', touch))
-                    except KeyError:
-                        touch = HIDTouch(device, tid, args)
-                        touches[touch.id] = touch
-
-                for tid in list(touches.keys())[:]:
+                    pos = args['x'], args['y']
+                    last_pos = touches.get(tid)
+                    touches[tid] = pos
+                    if last_pos is None or last_pos == pos:
+                        continue
+                    values = (pos[0], pos[1], args.get('pressure', nan),
+                              args.get('size_w', nan), args.get('size_h', nan))
+                    if tid not in touches_sent:
+                        push(EVENT_DOWN, tid, *values)
+                        touches_sent.add(tid)
+                    push(EVENT_MOVE, tid, *values)
+                for tid in list(touches.keys()):
                     if tid not in actives:
-                        touch = touches[tid]
                         if tid in touches_sent:
-                            queue.append(('up', touch))
+                            push(EVENT_UP, tid)
                             touches_sent.remove(tid)
                         del touches[tid]
 
@@ -315,6 +313,7 @@ else:
                             l_points.append(point)
                         elif ev_code == SYN_REPORT:
                             process(l_points)
+                            self.wakeup()
                             l_points = []
 
                     elif ev_type == EV_MSC and ev_code in (MSC_RAW, MSC_SCAN):
@@ -351,12 +350,7 @@ else:
 
         def update(self, dispatch_fn):
             # dispatch all event from threads
-            try:
-                while True:
-                    event_type, touch = self.queue.popleft()
-                    dispatch_fn(event_type, touch)
-            except:
-                pass
+            self.dispatch_ringbuffer(self.ringbuffer, dispatch_fn, HIDTouch)
 
 
     TouchFactory.register('hidinput', HIDInputTouchProvider)
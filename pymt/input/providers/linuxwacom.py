@@ -54,10 +54,10 @@ if 'PYMT_DOC' in os.environ:
 
 else:
     import threading
-    import collections
     import struct
     import fcntl
-    from pymt.input.provider import TouchProvider
+    from pymt.input.provider import TouchProvider, TouchRingBuffer
+    from pymt.input.postproc.batch import EVENT_DOWN, EVENT_MOVE, EVENT_UP
     from pymt.input.factory import TouchFactory
     from pymt.logger import pymt_logger
 
@@ -184,13 +184,12 @@ else:
             if self.input_fn is None:
                 return
             self.uid = 0
-            self.queue = collections.deque()
+            self.ringbuffer = TouchRingBuffer()
             self.thread = threading.Thread(
                 target=self._thread_run,
                 kwargs=dict(
-                    queue=self.queue,
+                    ringbuffer=self.ringbuffer,
                     input_fn=self.input_fn,
-                    device=self.device,
                     default_ranges=self.default_ranges
                 ))
             self.thread.daemon = True
@@ -198,11 +197,11 @@ else:
 
         def _thread_run(self, **kwargs):
             input_fn = kwargs.get('input_fn')
-            queue = kwargs.get('queue')
-            device = kwargs.get('device')
+            push = kwargs.get('ringbuffer').push
             drs = kwargs.get('default_ranges').get
             touches = {}
-            touches_sent = []
+            touches_sent = set()
+            nan = float('nan')
             point = {}
             l_points = {}
 
@@ -218,27 +217,26 @@ else:
             reset_touch             = False
 
             def process(points):
+                # the touches are created/updated in the main thread, just
+                # remember the last position of each touch, and push values
                 actives = list(points.keys())
                 for args in points.values():
                     tid = args['id']
-                    try:
-                        touch = touches[tid]
-                    except KeyError:
-                        touch = LinuxWacomTouch(device, tid, args)
-                        touches[touch.id] = touch
-                    if touch.sx == args['x'] and touch.sy == args['y'] and tid in touches_sent:
+                    pos = args['x'], args['y']
+                    if touches.get(tid) == pos and tid in touches_sent:
                         continue
-                    touch.move(args)
+                    touches[tid] = pos
+                    values = (pos[0], pos[1], args.get('pressure', nan),
+                              args.get('size_w', nan), args.get('size_h', nan))
                     if tid not in touches_sent:
-                        queue.append(('down', touch))
-                        touches_sent.append(tid)
-                    queue.append(('move', touch))
+                        push(EVENT_DOWN, tid, *values)
+                        touches_sent.add(tid)
+                    push(EVENT_MOVE, tid, *values)
 
-                for tid in list(touches.keys())[:]:
+                for tid in list(touches.keys()):
                     if tid not in actives:
-                        touch = touches[tid]
                         if tid in touches_sent:
-                            queue.append(('up', touch))
+                            push(EVENT_UP, tid)
                             touches_sent.remove(tid)
                         del touches[tid]
 
@@ -331,11 +329,13 @@ else:
                                 reset_touch = False
                                 continue
                             process(l_points)
+                            self.wakeup()
                             changed = False
                         if reset_touch:
                             l_points.clear()
                             reset_touch = False
                             process(l_points)
+                            self.wakeup()
                         point = {}
                     elif ev_type == EV_MSC and ev_code == MSC_SERIAL:
                         touch_id = ev_value
@@ -363,12 +363,7 @@ else:
 
         def update(self, dispatch_fn):
             # dispatch all event from threads
-            try:
-                while True:
-                    event_type, touch = self.queue.popleft()
-                    dispatch_fn(event_type, touch)
-            except:
-                pass
+            self.dispatch_ringbuffer(self.ringbuffer, dispatch_fn, LinuxWacomTouch)
 
 
     TouchFactory.register('linuxwacom', LinuxWacomTouchProvider)
@@ -8,6 +8,7 @@ import ctypes
 import threading
 import collections
 import os
+import time
 from pymt.input.provider import TouchProvider
 from pymt.input.factory import TouchFactory
 from pymt.input.touch import Touch
@@ -195,6 +196,7 @@ class MacTouchProvider(TouchProvider):
         for tid in list(touches.keys())[:]:
             if tid not in actives:
                 touch = touches[tid]
+                touch.time_event = time.time()
                 _instance.queue.append(('up', touch))
                 del touches[tid]
 
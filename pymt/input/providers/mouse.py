@@ -17,6 +17,7 @@ be discarded. Put in your configuration ::
 __all__ = ('MouseTouchProvider', )
 
 from collections import deque
+from time import time
 from pymt.logger import pymt_logger
 from pymt.base import getCurrentTouches
 from pymt.input.provider import TouchProvider
@@ -94,6 +95,7 @@ class MouseTouchProvider(TouchProvider):
         if cur.id not in self.touches:
             return
         del self.touches[cur.id]
+        cur.time_event = time()
         self.waiting_event.append(('up', cur))
 
     def on_mouse_motion(self, x, y, modifiers):
@@ -65,7 +65,6 @@ if 'PYMT_DOC' in os.environ:
 
 else:
     import threading
-    import collections
     from pymt.lib.mtdev import Device, \
             MTDEV_TYPE_EV_ABS, MTDEV_CODE_SLOT, MTDEV_CODE_POSITION_X, \
             MTDEV_CODE_POSITION_Y, MTDEV_CODE_PRESSURE, \
@@ -73,7 +72,8 @@ else:
             MTDEV_CODE_TRACKING_ID, MTDEV_ABS_POSITION_X, \
             MTDEV_ABS_POSITION_Y, MTDEV_ABS_TOUCH_MINOR, \
             MTDEV_ABS_TOUCH_MAJOR
-    from pymt.input.provider import TouchProvider
+    from pymt.input.provider import TouchProvider, TouchRingBuffer
+    from pymt.input.postproc.batch import EVENT_DOWN, EVENT_MOVE, EVENT_UP
     from pymt.input.factory import TouchFactory
     from pymt.logger import pymt_logger
 
@@ -134,13 +134,12 @@ else:
             if self.input_fn is None:
                 return
             self.uid = 0
-            self.queue = collections.deque()
+            self.ringbuffer = TouchRingBuffer()
             self.thread = threading.Thread(
                 target=self._thread_run,
                 kwargs=dict(
-                    queue=self.queue,
+                    ringbuffer=self.ringbuffer,
                     input_fn=self.input_fn,
-                    device=self.device,
                     default_ranges=self.default_ranges
                 ))
             self.thread.daemon = True
@@ -148,33 +147,29 @@ else:
 
         def _thread_run(self, **kwargs):
             input_fn = kwargs.get('input_fn')
-            queue = kwargs.get('queue')
-            device = kwargs.get('device')
+            push = kwargs.get('ringbuffer').push
             drs = kwargs.get('default_ranges').get
-            touches = {}
-            touches_sent = []
+            touches_sent = set()
             point = {}
             l_points = {}
+            nan = float('nan')
 
             def process(points):
+                # the touches are created/updated in the main thread, just
+                # push the values
                 for args in points:
                     tid = args['id']
-                    try:
-                        touch = touches[tid]
-                    except KeyError:
-                        touch = MTDTouch(device, tid, args)
-                        touches[touch.id] = touch
-                    touch.move(args)
-                    action = 'move'
+                    action = EVENT_MOVE
                     if tid not in touches_sent:
-                        action = 'down'
-                        touches_sent.append(tid)
+                        action = EVENT_DOWN
+                        touches_sent.add(tid)
                     if 'delete' in args:
-                        action = 'up'
+                        action = EVENT_UP
                         del args['delete']
-                        del touches[touch.id]
-                        touches_sent.remove(tid)
-                    queue.append((action, touch))
+                        touches_sent.discard(tid)
+                    push(action, tid, args.get('x', nan), args.get('y', nan),
+                         args.get('pressure', nan), args.get('size_w', nan),
+                         args.get('size_h', nan))
 
             def normalize(value, vmin, vmax):
                 return (value - vmin) / float(vmax - vmin)
@@ -277,16 +272,12 @@ else:
                 # push all changes
                 if _changes:
                     process([l_points[x] for x in _changes])
+                    self.wakeup()
                     _changes.clear()
 
         def update(self, dispatch_fn):
             # dispatch all event from threads
-            try:
-                while True:
-                    event_type, touch = self.queue.popleft()
-                    dispatch_fn(event_type, touch)
-            except:
-                pass
+            self.dispatch_ringbuffer(self.ringbuffer, dispatch_fn, MTDTouch)
 
 
     TouchFactory.register('mtdev', MTDTouchProvider)
@@ -0,0 +1,146 @@
+'''
+Replay: replay a trace recorded with the recorder
+
+The trace is played at the recorded speed by default. With the `fast` option,
+one recorded frame is played at each frame, as fast as the application can
+go. Usefull to reproduce a session, or for benchmarking ::
+
+    [input]
+    # name = replay,<filename>[,fast]
+    replay = replay,session.trace,fast
+
+The events of the trace have already been processed by the postproc modules
+when they were recorded, and are processed again when replayed. You can
+remove the other input providers from the configuration to get a
+deterministic session.
+
+See :mod:`~pymt.input.recorder` for recording a trace.
+'''
+
+__all__ = ('ReplayTouchProvider', 'ReplayTouch')
+
+from time import time
+from pymt.logger import pymt_logger
+from pymt.clock import getClock
+from pymt.input.provider import TouchProvider
+from pymt.input.factory import TouchFactory
+from pymt.input.touch import Touch
+from pymt.input.recorder import load_trace
+from pymt.input.postproc.batch import EVENT_DOWN, EVENT_UP
+
+_event_names = ('down', 'move', 'up')
+
+#: Number of records searched at once for the end of a frame
+_search_chunk = 4096
+
+class ReplayTouch(Touch):
+    def depack(self, args):
+        self.sx, self.sy = args
+        super(ReplayTouch, self).depack(args)
+
+class ReplayTouchProvider(TouchProvider):
+    def __init__(self, device, args):
+        super(ReplayTouchProvider, self).__init__(device, args)
+        self.filename = None
+        self.fast = False
+        self.records = None
+        self.touches = {}
+        self.index = 0
+        self.start_time = None
+        self._next_event = None
+
+        # split arguments
+        args = args.split(',')
+        self.filename = args[0]
+        for arg in args[1:]:
+            if arg == '':
+                continue
+            elif arg == 'fast':
+                self.fast = True
+            else:
+                pymt_logger.error('Replay: unknown parameter <%s>' % arg)
+
+    def start(self):
+        '''Open the trace'''
+        try:
+            self.records = load_trace(self.filename)
+        except (IOError, ValueError):
+            pymt_logger.exception('Replay: unable to load <%s>' %
+                                  self.filename)
+            return
+        self.index = 0
+        self.start_time = None
+        pymt_logger.info('Replay: %d events to replay from %s' % (
+            len(self.records), self.filename))
+
+    def stop(self):
+        '''Close the trace'''
+        if self._next_event is not None:
+            self._next_event.cancel()
+            self._next_event = None
+        self.records = None
+
+    def _find_end(self, limit):
+        # index of the first record after the time limit. the trace can be
+        # huge, search only in the next records.
+        times = self.records['time']
+        index = self.index
+        count = len(times)
+        while index < count:
+            chunk = times[index:index + _search_chunk]
+            end = index + chunk.searchsorted(limit, 'right')
+            if end < index + len(chunk):
+                return end
+            index = end
+        return count
+
+    def _wakeup(self, dt):
+        self._next_event = None
+
+    def update(self, dispatch_fn):
+        records = self.records
+        if records is None or self.index >= len(records):
+            return
+
+        # the events are received when they are replayed, or at their
+        # recorded time in real time mode
+        times = records['time']
+        if self.fast:
+            end = self._find_end(times[self.index])
+            received = time()
+        else:
+            now = getClock().get_time()
+            if self.start_time is None:
+                self.start_time = now - times[self.index]
+            end = self._find_end(now - self.start_time)
+
+        touches = self.touches
+        for t, tid, type, sx, sy in records[self.index:end].tolist():
+            if type == EVENT_DOWN:
+                touch = touches[tid] = ReplayTouch(self.device, tid, [sx, sy])
+            else:
+                touch = touches.get(tid)
+                if touch is None:
+                    continue
+                if type != EVENT_UP or touch.sx != sx or touch.sy != sy:
+                    touch.move([sx, sy])
+                if type == EVENT_UP:
+                    del touches[tid]
+            touch.time_event = received if self.fast else self.start_time + t
+            dispatch_fn(_event_names[type], touch)
+        self.index = end
+
+        # don't let the main loop sleep after the time of the next event
+        if self._next_event is not None:
+            self._next_event.cancel()
+            self._next_event = None
+        if end >= len(records):
+            pymt_logger.info('Replay: end of %s' % self.filename)
+            return
+        timeout = 0
+        if not self.fast:
+            timeout = max(0, times[end] - (getClock().get_time() -
+                                           self.start_time))
+        self._next_event = getClock().schedule_once(self._wakeup, timeout)
+
+TouchFactory.register('replay', ReplayTouchProvider)
@@ -0,0 +1,237 @@
+'''
+Synthetic: generate touches, for testing and benchmarking without hardware
+
+The provider generate a workload of touch events, at a fixed rate (events per
+second). Available workloads:
+
+    * walk: fingers doing a random walk
+    * pinch: pairs of fingers doing a pinch + rotate (the number of fingers
+      is rounded to an even number)
+    * tap: fingers doing rapid taps (down, up, down at another place...)
+    * churn: fingers appearing and disappearing all the time, like the
+      alive/set messages of a TUIO tracker
+
+Configuration is done with `key=value` parameters ::
+
+    [input]
+    # name = synthetic,mode=<walk|pinch|tap|churn>,fingers=<n>,rate=<events/s>
+    synthetic = synthetic,mode=pinch,fingers=20,rate=2000
+
+Other parameters:
+
+    * seed: seed of the random generator (default 0), the same seed give
+      the same events
+    * speed: maximum distance of a move, in 0-1 (default 0.01)
+    * churn: probability that an event of the churn workload is a finger
+      replaced by a new one (default 0.1)
+
+The events generated in one frame are spread between the previous frame and
+the current one, as if they came from a real device: the `time_event` of the
+touches is the time where the event would have been received.
+'''
+
+__all__ = ('SyntheticTouchProvider', 'SyntheticTouch')
+
+import random
+import time
+from math import cos, sin, pi
+from pymt.logger import pymt_logger
+from pymt.input.provider import TouchProvider
+from pymt.input.factory import TouchFactory
+from pymt.input.touch import Touch
+
+class SyntheticTouch(Touch):
+    def depack(self, args):
+        self.sx, self.sy = args
+        super(SyntheticTouch, self).depack(args)
+
+class SyntheticTouchProvider(TouchProvider):
+    #: Available workloads
+    modes = ('walk', 'pinch', 'tap', 'churn')
+
+    def __init__(self, device, args):
+        super(SyntheticTouchProvider, self).__init__(device, args)
+        self.mode = 'walk'
+        self.fingers = 10
+        self.rate = 1000.
+        self.seed = 0
+        self.speed = 0.01
+        self.churn = 0.1
+        #: Number of events generated since the start
+        self.count = 0
+
+        # split arguments
+        options = {'mode': str, 'fingers': int, 'rate': float, 'seed': int,
+                   'speed': float, 'churn': float}
+        for arg in args.split(','):
+            if arg == '':
+                continue
+            key, value = (arg.split('=', 1) + [''])[:2]
+            if key not in options:
+                pymt_logger.error('Synthetic: unknown parameter <%s>' % arg)
+                continue
+            try:
+                setattr(self, key, options[key](value))
+            except ValueError:
+                pymt_logger.error('Synthetic: invalid value for <%s>' % arg)
+        if self.mode not in self.modes:
+            pymt_logger.error('Synthetic: unknown mode <%s>' % self.mode)
+            self.mode = 'walk'
+        if self.fingers < 1:
+            pymt_logger.error('Synthetic: invalid number of fingers <%d>' %
+                              self.fingers)
+            self.fingers = 10
+        if self.rate < 0:
+            pymt_logger.error('Synthetic: invalid rate <%s>' % self.rate)
+            self.rate = 1000.
+        if self.mode == 'pinch':
+            self.fingers += self.fingers % 2
+
+        self.touches = []
+        self.random = random.Random(self.seed)
+        self._counter = 0
+        self._step = 0
+        self._last_time = None
+        self._pending = 0.
+        self._pinchs = []
+        self._slots = []
+        self._dispatch_fn = None
+        self._time = 0.
+        self._dt = 0.
+
+    def start(self):
+        '''Start to generate events'''
+        self._last_time = None
+
+    def stop(self):
+        '''Stop to generate events'''
+        self._last_time = None
+
+    def update(self, dispatch_fn):
+        now = time.time()
+        if self._last_time is None:
+            self._last_time = now
+            return
+        # don't generate more than one second of events after a pause
+        pending = min(self._pending + (now - self._last_time) * self.rate,
+                      self.rate)
+        count = int(pending)
+        self._pending = pending - count
+        if count:
+            self.generate(count, self._last_time, now, dispatch_fn)
+        self._last_time = now
+
+    def generate(self, count, start, end, dispatch_fn):
+        '''Generate `count` events, with times spread between `start` and
+        `end`. The touches missing to have the configured number of fingers
+        are put down first, and are not counted.'''
+        self._dispatch_fn = dispatch_fn
+        self._time = start
+        self._dt = (end - start) / float(count) if count else 0
+        getattr(self, '_generate_%s' % self.mode)(count)
+        self._dispatch_fn = None
+
+    def _next_time(self):
+        self._time += self._dt
+        return self._time
+
+    def _down(self, x, y):
+        self._counter += 1
+        touch = SyntheticTouch(self.device, 'synthetic%d' % self._counter,
+                               [x, y])
+        touch.time_event = self._time
+        self.touches.append(touch)
+        self.count += 1
+        self._dispatch_fn('down', touch)
+        return touch
+
+    def _move(self, touch, x, y):
+        touch.move([x, y])
+        touch.time_event = self._next_time()
+        self.count += 1
+        self._dispatch_fn('move', touch)
+
+    def _up(self, touch):
+        touch.time_event = self._next_time()
+        self.touches.remove(touch)
+        self.count += 1
+        self._dispatch_fn('up', touch)
+
+    def _fill(self):
+        rnd = self.random.random
+        while len(self.touches) < self.fingers:
+            self._down(rnd(), rnd())
+
+    def _random_move(self, touch):
+        speed = self.speed
+        uniform = self.random.uniform
+        self._move(touch,
+                   min(1., max(0., touch.sx + uniform(-speed, speed))),
+                   min(1., max(0., touch.sy + uniform(-speed, speed))))
+
+    def _generate_walk(self, count):
+        self._fill()
+        touches = self.touches
+        for i in range(count):
+            self._step += 1
+            self._random_move(touches[self._step % len(touches)])
+
+    def _generate_pinch(self, count):
+        rnd = self.random.random
+        if not self._pinchs:
+            # center, radius, angle, phase of each pair
+            for i in range(self.fingers // 2):
+                self._pinchs.append([.2 + rnd() * .6, .2 + rnd() * .6,
+                                     .05 + rnd() * .1, rnd() * 2 * pi, 0.])
+            for cx, cy, radius, angle, phase in self._pinchs:
+                self._down(cx + radius * cos(angle), cy + radius * sin(angle))
+                self._down(cx - radius * cos(angle), cy - radius * sin(angle))
+        touches = self.touches
+        pinchs = self._pinchs
+        # each step move the 2 fingers of a pair
+        for i in range((count + 1) // 2):
+            self._step += 1
+            index = self._step % len(pinchs)
+            pinch = pinchs[index]
+            cx, cy, radius, angle, phase = pinch
+            pinch[3] = angle = angle + self.speed * 2
+            pinch[4] = phase = phase + self.speed * 4
+            radius *= 1 + .5 * sin(phase)
+            dx, dy = radius * cos(angle), radius * sin(angle)
+            self._move(touches[index * 2], cx + dx, cy + dy)
+            self._move(touches[index * 2 + 1], cx - dx, cy - dy)
+
+    def _generate_tap(self, count):
+        # each finger is down or up, a step change his state
+        rnd = self.random.random
+        slots = self._slots
+        if not slots:
+            slots.extend([None] * self.fingers)
+        for i in range(count):
+            self._step += 1
+            index = self._step % len(slots)
+            touch = slots[index]
+            if touch is None:
+                self._next_time()
+                slots[index] = self._down(rnd(), rnd())
+            else:
+                self._up(touch)
+                slots[index] = None
+
+    def _generate_churn(self, count):
+        self._fill()
+        rnd = self.random.random
+        choice = self.random.choice
+        generated = 0
+        while generated < count:
+            touch = choice(self.touches)
+            if rnd() < self.churn:
+                # the finger disappear from the alive set, another one appear
+                self._up(touch)
+                self._down(rnd(), rnd())
+                generated += 2
+            else:
+                self._random_move(touch)
+                generated += 1
+
+TouchFactory.register('synthetic', SyntheticTouchProvider)
@@ -114,10 +114,11 @@ class TuioTouchProvider(TouchProvider):
     def _osc_tuio_cb(self, *incoming):
         message = incoming[0]
         oscpath, types, args = message[0], message[1], message[2:]
-        self.tuio_event_q.appendleft([oscpath, args, types])
+        self.tuio_event_q.appendleft([oscpath, args, types,
+                                      osc.getMessageTime()])
 
     def _update(self, dispatch_fn, value):
-        oscpath, args, types = value
+        oscpath, args, types, received = value
         command = args[0]
 
         # verify commands
@@ -130,12 +131,14 @@ class TuioTouchProvider(TouchProvider):
             if id not in self.touches[oscpath]:
                 # new touch
                 touch = TuioTouchProvider.__handlers__[oscpath](self.device, id, args[2:])
+                touch.time_event = received
                 self.touches[oscpath][id] = touch
                 dispatch_fn('down', touch)
             else:
                 # update a current touch
                 touch = self.touches[oscpath][id]
                 touch.move(args[2:])
+                touch.time_event = received
                 dispatch_fn('move', touch)
 
         # alive event, check for deleted touch
@@ -150,6 +153,7 @@ class TuioTouchProvider(TouchProvider):
                         to_delete.append(touch)
 
             for touch in to_delete:
+                touch.time_event = received
                 dispatch_fn('up', touch)
                 del self.touches[oscpath][touch.id]
 
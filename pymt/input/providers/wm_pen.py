@@ -26,6 +26,7 @@ if 'PYMT_DOC' in os.environ:
 
 else:
     from collections import deque
+    from time import time
     from ctypes import wintypes, Structure, windll, byref, c_int16, \
             c_int, c_long, WINFUNCTYPE
     from pymt.input.provider import TouchProvider
@@ -66,14 +67,14 @@ else:
             y = abs(1.0 - y)
 
             if msg == WM_LBUTTONDOWN:
-                self.pen_events.appendleft(('down', x, y))
+                self.pen_events.appendleft(('down', x, y, time()))
                 self.pen_status = True
 
             if msg == WM_MOUSEMOVE and self.pen_status:
-                self.pen_events.appendleft(('move', x, y))
+                self.pen_events.appendleft(('move', x, y, time()))
 
             if msg == WM_LBUTTONUP:
-                self.pen_events.appendleft(('up', x, y))
+                self.pen_events.appendleft(('up', x, y, time()))
                 self.pen_status = False
 
         def _pen_wndProc( self, hwnd, msg, wParam, lParam ):
@@ -105,7 +106,7 @@ else:
             while True:
 
                 try:
-                    type, x, y = self.pen_events.pop()
+                    type, x, y, received = self.pen_events.pop()
                 except:
                     break
 
@@ -115,6 +116,7 @@ else:
                 if  type == 'move':
                     self.pen.move([x, y])
 
+                self.pen.time_event = received
                 dispatch_fn(type, self.pen)
 
         def stop(self):
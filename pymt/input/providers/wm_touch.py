@@ -37,6 +37,7 @@ else:
     from ctypes import wintypes, windll, WINFUNCTYPE, c_long, c_int, \
             Structure, pointer, sizeof, byref
     from collections import deque
+    from time import time
     from pymt.input.provider import TouchProvider
     from pymt.input.factory import TouchFactory
 
@@ -119,7 +120,7 @@ else:
 
             while True:
                 try:
-                    t = self.touch_events.pop()
+                    received, t = self.touch_events.pop()
                 except:
                     break
 
@@ -132,14 +133,17 @@ else:
                     self.uid += 1
                     self.touches[t.id] = WM_Touch(self.device,
                                                   self.uid, [x, y, t.size()])
+                    self.touches[t.id].time_event = received
                     dispatch_fn('down', self.touches[t.id] )
 
                 if t.event_type == 'move' and t.id in self.touches:
                     self.touches[t.id].move([x, y, t.size()])
+                    self.touches[t.id].time_event = received
                     dispatch_fn('move', self.touches[t.id] )
 
                 if t.event_type == 'up'  and t.id in self.touches:
                     self.touches[t.id].move([x, y, t.size()])
+                    self.touches[t.id].time_event = received
                     dispatch_fn('up', self.touches[t.id] )
                     del self.touches[t.id]
 
@@ -178,8 +182,9 @@ else:
                                             wParam,
                                             pointer(touches),
                                             sizeof(TOUCHINPUT))
+            received = time()
             for i in range(wParam):
-                self.touch_events.appendleft(touches[i])
+                self.touch_events.appendleft((received, touches[i]))
             return True
 
 
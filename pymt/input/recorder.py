@@ -0,0 +1,121 @@
+'''
+Recorder: record the input events in a binary trace, for replaying them
+
+InputRecorder is a postproc module that write every event coming out of the
+postproc modules in a trace file, with the time of the frame. The trace can
+be replayed later with the `replay` input provider, to reproduce a session
+without the hardware ::
+
+    from pymt import *
+    recorder = InputRecorder('session.trace')
+    getEventLoop().add_postproc_module(recorder)
+
+    # ...
+
+    recorder.close()
+
+The recorder must be the last postproc module to record the final events.
+The `recorder` module (`-m recorder:filename=session.trace`) do it for you.
+
+Trace format
+------------
+
+A trace start with the magic string `PYMTTRC1`, followed by fixed size
+records, little endian, without padding:
+
+    ========= ======= ====================================================
+    Field     Type    Description
+    ========= ======= ====================================================
+    time      float64 Time of the event, in seconds since the first event
+    id        uint32  Uniq id of the touch (touch.uid)
+    type      uint8   EVENT_DOWN, EVENT_MOVE or EVENT_UP
+    sx        float32 Position of the touch, in 0-1
+    sy        float32
+    ========= ======= ====================================================
+
+The file can be read without loading it in memory with :func:`load_trace`.
+'''
+
+__all__ = ('InputRecorder', 'load_trace', 'TRACE_MAGIC', 'trace_dtype')
+
+import numpy
+from pymt.clock import getClock
+from pymt.logger import pymt_logger
+from pymt.input.postproc.batch import InputEventBatch
+
+#: Magic string at the start of a trace file, with the version of the format
+TRACE_MAGIC = b'PYMTTRC1'
+
+#: Numpy dtype of a trace record
+trace_dtype = numpy.dtype([
+    ('time', '<f8'), ('id', '<u4'), ('type', 'u1'),
+    ('sx', '<f4'), ('sy', '<f4')])
+
+def load_trace(filename):
+    '''Load a trace file, and return his records as a numpy array. The file is
+    memory mapped, not read.
+
+    :Parameters:
+        `filename` : str
+            Filename of the trace
+
+    Raise ValueError if the file is not a trace.
+    '''
+    with open(filename, 'rb') as fd:
+        magic = fd.read(len(TRACE_MAGIC))
+        fd.seek(0, 2)
+        size = fd.tell()
+    if magic != TRACE_MAGIC:
+        raise ValueError('%s is not an input trace' % filename)
+    count = (size - len(TRACE_MAGIC)) // trace_dtype.itemsize
+    if count == 0:
+        return numpy.zeros(0, dtype=trace_dtype)
+    return numpy.memmap(filename, dtype=trace_dtype, mode='r',
+                        offset=len(TRACE_MAGIC), shape=(count, ))
+
+
+class InputRecorder(object):
+    '''Postproc module that record the events in a trace file. The events are
+    not changed.
+
+    :Parameters:
+        `filename` : str
+            Filename of the trace. The file is overwritten.
+    '''
+    def __init__(self, filename):
+        self.filename = filename
+        self.fd = open(filename, 'wb')
+        self.fd.write(TRACE_MAGIC)
+        #: Number of events recorded
+        self.count = 0
+        self.start_time = None
+        pymt_logger.info('Recorder: Record input events in %s' % filename)
+
+    def process(self, events):
+        return self.process_batch(InputEventBatch(events)).events
+
+    def process_batch(self, batch):
+        if not len(batch) or self.fd is None:
+            return batch
+        now = getClock().get_time()
+        if self.start_time is None:
+            self.start_time = now
+        records = numpy.empty(len(batch), dtype=trace_dtype)
+        records['time'] = now - self.start_time
+        records['id'] = batch.ids
+        records['type'] = batch.types
+        pos = batch.pos
+        records['sx'] = pos[:, 0]
+        records['sy'] = pos[:, 1]
+        self.fd.write(records.tobytes())
+        self.count += len(records)
+        return batch
+
+    def close(self):
+        '''Flush and close the trace file'''
+        if self.fd is None:
+            return
+        self.fd.close()
+        self.fd = None
+        pymt_logger.info('Recorder: %d events recorded in %s' % (
+            self.count, self.filename))
@@ -41,12 +41,22 @@ If you're only interested in a certain kind of touches, check the profile::
 __all__ = ('Touch', )
 
 import weakref
+from time import time
 from inspect import isroutine
 from copy import copy
+from operator import attrgetter
+from pymt.logger import pymt_logger
 from pymt.utils import SafeList
 from pymt.clock import getClock
 from pymt.vector import Vector
 
+#: coordinates saved by default in push()
+_default_attrs = (
+    'x', 'y', 'z',
+    'dxpos', 'dypos', 'dzpos',
+    'oxpos', 'oypos', 'ozpos')
+_get_default_attrs = attrgetter(*_default_attrs)
+
 
 class TouchMetaclass(type):
     def __new__(mcs, name, bases, attrs):
@@ -56,6 +66,15 @@ class TouchMetaclass(type):
                 __attrs__.extend(base.__attrs__)
         if '__attrs__' in attrs:
             __attrs__.extend(attrs['__attrs__'])
+        # declared attributes are stored in slots. The base Touch have a
+        # __dict__, so any other attribute can still be set.
+        if '__slots__' not in attrs:
+            slotted = set()
+            for base in bases:
+                for cls in base.__mro__:
+                    slotted.update(cls.__dict__.get('__slots__', ()))
+            attrs['__slots__'] = tuple(x for x in attrs.get('__attrs__', ())
+                                       if x not in slotted and x not in attrs)
         attrs['__attrs__'] = tuple(__attrs__)
         return super(TouchMetaclass, mcs).__new__(mcs, name, bases, attrs)
 
@@ -63,6 +82,9 @@ class TouchMetaclass(type):
 class Touch(object, metaclass=TouchMetaclass):
     '''Abstract class to represent a touch, and support TUIO 1.0 definition.
 
+    Attributes listed in `__attrs__` are stored in slots, for subclasses too.
+    Other attributes can still be set on the touch.
+
     :Parameters:
         `id` : str
             uniq ID of the touch
@@ -78,8 +100,14 @@ class Touch(object, metaclass=TouchMetaclass):
          'oxpos', 'oypos', 'ozpos',
          'dsxpos', 'dsypos', 'dszpos',
          'osxpos', 'osypos', 'oszpos',
-         'time_start', 'is_double_tap',
+         'time_start', 'time_event', 'is_double_tap',
          'double_tap_time', 'userdata')
+    __slots__ = __attrs__ + (
+        '__dict__', '__weakref__', 'uid',
+        'grab_list', 'grab_exclusive_class', 'grab_state', 'grab_current')
+
+    #: Attributes saved by push() when no attributes are given
+    default_attrs = _default_attrs
 
     def __init__(self, device, id, args):
         if self.__class__ == Touch:
@@ -92,10 +120,6 @@ class Touch(object, metaclass=TouchMetaclass):
 
         # For push/pop
         self.attr = []
-        self.default_attrs = (
-            'x', 'y', 'z',
-            'dxpos', 'dypos', 'dzpos',
-            'oxpos', 'oypos', 'ozpos')
 
         # For grab
         self.grab_list = SafeList()
@@ -128,6 +152,10 @@ class Touch(object, metaclass=TouchMetaclass):
         self.osypos = None
         self.oszpos = None
         self.time_start = getClock().get_time()
+        # time (time.time()) where the last event of the touch have been
+        # received. providers that know when the device sent the event
+        # overwrite it.
+        self.time_event = time()
         self.is_double_tap = False
         self.double_tap_time = 0
         self.userdata = {}
@@ -180,6 +208,7 @@ class Touch(object, metaclass=TouchMetaclass):
 
     def move(self, args):
         '''Move the touch to another position.'''
+        self.time_event = time()
         self.dxpos = self.x
         self.dypos = self.y
         self.dzpos = self.z
@@ -218,14 +247,22 @@ class Touch(object, metaclass=TouchMetaclass):
         '''Push attributes values in `attrs` in the stack'''
         if attrs is None:
             attrs = self.default_attrs
-        values = [getattr(self, x) for x in attrs]
-        self.attr.append((attrs, values))
+        if attrs is _default_attrs:
+            # the coordinates block is saved in one tuple
+            self.attr.append((attrs, _get_default_attrs(self)))
+        else:
+            self.attr.append((attrs, [getattr(self, x) for x in attrs]))
 
     def pop(self):
         '''Pop attributes values from the stack'''
         attrs, values = self.attr.pop()
-        for i in range(len(attrs)):
-            setattr(self, attrs[i], values[i])
+        if attrs is _default_attrs:
+            (self.x, self.y, self.z,
+             self.dxpos, self.dypos, self.dzpos,
+             self.oxpos, self.oypos, self.ozpos) = values
+        else:
+            for attr, value in zip(attrs, values):
+                setattr(self, attr, value)
 
     def apply_transform_2d(self, transform):
         '''Apply a transformation on x, y, dxpos, dypos, oxpos, oypos'''
@@ -233,6 +270,18 @@ class Touch(object, metaclass=TouchMetaclass):
         self.dxpos, self.dypos = transform(self.dxpos, self.dypos)
         self.oxpos, self.oypos = transform(self.oxpos, self.oypos)
 
+    def apply_affine_2d(self, matrix):
+        '''Same as apply_transform_2d(), with an affine matrix
+        (a, b, c, d, e, f) : x' = a * x + b * y + c, y' = d * x + e * y + f
+        '''
+        a, b, c, d, e, f = matrix
+        x, y = self.x, self.y
+        self.x, self.y = a * x + b * y + c, d * x + e * y + f
+        x, y = self.dxpos, self.dypos
+        self.dxpos, self.dypos = a * x + b * y + c, d * x + e * y + f
+        x, y = self.oxpos, self.oypos
+        self.oxpos, self.oypos = a * x + b * y + c, d * x + e * y + f
+
     def copy_to(self, to):
         '''Copy some attribute to another touch object.'''
         for attr in self.__attrs__:
@@ -248,9 +297,12 @@ class Touch(object, metaclass=TouchMetaclass):
     def __repr__(self):
         out = []
         for x in dir(self):
-            v = getattr(self, x)
             if x[0] == '_':
                 continue
+            # unset slots are listed too
+            if not hasattr(self, x):
+                continue
+            v = getattr(self, x)
             if isroutine(v):
                 continue
             out.append('%s="%s"' % (x, v))
@@ -288,3 +340,12 @@ class Touch(object, metaclass=TouchMetaclass):
     xpos = property(lambda self: self.x)
     ypos = property(lambda self: self.y)
     blobID = property(lambda self: self.id)
+
+# install acceleration
+try:
+    from pymt.accelerate import accelerate, accelerate_method
+    if accelerate is not None:
+        accelerate_method(Touch, 'scale_for_screen',
+                          accelerate.touch_scale_for_screen)
+except ImportError as e:
+    pymt_logger.warning('Touch: Unable to use accelerate module <%s>' % e)
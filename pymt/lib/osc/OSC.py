@@ -101,9 +101,9 @@ class OSCMessage:
         return self.getBinary()
 
 def readString(data):
-    length   = string.find(data,"\0")
+    length   = data.find(b"\0")
     nextData = int(math.ceil((length+1) / 4.0) * 4)
-    return (data[0:length], data[nextData:])
+    return (data[0:length].decode('latin-1'), data[nextData:])
 
 
 def readBlob(data):
@@ -246,6 +246,117 @@ def decodeOSC(data):
     return decoded
 
 
+# Fast decoder: the arguments are read with struct.unpack_from() at an offset
+# of the packet, instead of slicing the rest of the packet for each argument.
+# Typetags are compiled once in a list of operations: a struct.Struct for a
+# run of fixed size arguments, "s" for a string, "b" for a blob.
+
+_int = struct.Struct(">i")
+_fixedTags = frozenset("ifd")
+_compiledTypetags = {}
+
+def compileTypetags(typetags):
+    """Return the list of operations to decode the arguments of typetags
+    (without the magic ,)"""
+    operations = []
+    fixed = ""
+    for tag in typetags:
+        if tag in _fixedTags:
+            fixed += tag
+            continue
+        if tag not in ("s", "b"):
+            raise KeyError(tag)
+        if fixed:
+            operations.append(struct.Struct(">" + fixed))
+            fixed = ""
+        operations.append(tag)
+    if fixed:
+        operations.append(struct.Struct(">" + fixed))
+    return operations
+
+
+def _readString(data, offset, end):
+    zero = data.find(b"\0", offset, end)
+    if zero < 0:
+        raise ValueError("unterminated OSC string")
+    return (data[offset:zero].decode("latin-1"),
+            offset + ((zero - offset) // 4 + 1) * 4)
+
+
+def _decodeMessage(data, offset, end):
+    address, offset = _readString(data, offset, end)
+    if offset >= end:
+        return []
+    typetags, offset = _readString(data, offset, end)
+    decoded = [address, typetags]
+    if typetags[:1] != ",":
+        print("Oops, typetag lacks the magic ,")
+        return decoded
+
+    operations = _compiledTypetags.get(typetags)
+    if operations is None:
+        operations = _compiledTypetags[typetags] = \
+            compileTypetags(typetags[1:])
+    for operation in operations:
+        if operation == "s":
+            value, offset = _readString(data, offset, end)
+            decoded.append(value)
+        elif operation == "b":
+            length = _int.unpack_from(data, offset)[0]
+            offset += 4
+            if offset + length > end:
+                raise ValueError("OSC blob too long")
+            decoded.append(data[offset:offset + length])
+            offset += ((length + 3) // 4) * 4
+        else:
+            if offset + operation.size > end:
+                raise ValueError("too few bytes for arguments")
+            decoded.extend(operation.unpack_from(data, offset))
+            offset += operation.size
+    return decoded
+
+
+def _decode(data, offset, end, messages):
+    # decode a packet. if messages is a list, the messages of bundles are
+    # added in it instead of being returned in nested lists.
+    if not data.startswith(b"#bundle\0", offset, end):
+        decoded = _decodeMessage(data, offset, end)
+        if messages is not None:
+            messages.append(decoded)
+        return decoded
+
+    decoded = []
+    offset += 16
+    while offset < end:
+        length = _int.unpack_from(data, offset)[0]
+        offset += 4
+        if length < 0 or offset + length > end:
+            raise ValueError("OSC bundle element too long")
+        element = _decode(data, offset, offset + length, messages)
+        if messages is None:
+            decoded.append(element)
+        offset += length
+    return decoded
+
+
+def fastDecodeOSC(data):
+    """Same as decodeOSC(), faster. Packets that can't be decoded are passed
+    to decodeOSC()."""
+    try:
+        return _decode(data, 0, len(data), None)
+    except (struct.error, ValueError):
+        return decodeOSC(data)
+
+
+def decodeOSCMessages(data):
+    """Decode an OSC packet, and return the list of the messages, the
+    messages of the bundles included. Raise ValueError or struct.error if the
+    packet can't be decoded."""
+    messages = []
+    _decode(data, 0, len(data), messages)
+    return messages
+
+
 class CallbackManager:
     """This utility class maps OSC addresses to callables.
 
@@ -260,8 +371,14 @@ class CallbackManager:
     def handle(self, data, source = None):
         """Given OSC data, tries to call the callback with the
         right address."""
-        decoded = decodeOSC(data)
-        self.dispatch(decoded, source)
+        try:
+            messages = decodeOSCMessages(data)
+        except (struct.error, ValueError):
+            # let the reference decoder handle (or complain about) it
+            self.dispatch(decodeOSC(data), source)
+            return
+        for message in messages:
+            self.dispatch(message, source)
 
     def dispatch(self, message, source = None):
         """Sends decoded OSC data to an appropriate calback"""
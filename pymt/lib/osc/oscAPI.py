@@ -49,10 +49,12 @@ except:
 outSocket      = 0
 oscThreads     = {}
 oscLock        = Lock()
+# reception time of the message being handled
+messageTime    = 0
 
 if use_multiprocessing:
     def _readQueue(thread_id=None):
-        global oscThreads
+        global oscThreads, messageTime
         for id in oscThreads:
             if thread_id is not None:
                 if id != thread_id:
@@ -60,7 +62,7 @@ if use_multiprocessing:
             thread = oscThreads[id]
             try:
                 while True:
-                    message = thread.queue.get_nowait()
+                    messageTime, message = thread.queue.get_nowait()
                     thread.addressManager.handle(message)
             except:
                 pass
@@ -74,8 +76,8 @@ if use_multiprocessing:
             self._isRunning = Value('b', True)
             self._haveSocket= Value('b', False)
 
-        def _queue_message(self, message):
-            self.queue.put(message)
+        def _queue_message(self, message, received):
+            self.queue.put((received, message))
 
         def _get_isRunning(self):
             return self._isRunning.value
@@ -100,7 +102,9 @@ else:
             self.isRunning  = True
             self.haveSocket = False
 
-        def _queue_message(self, message):
+        def _queue_message(self, message, received):
+            global messageTime
+            messageTime = received
             self.addressManager.handle(message)
 
 
@@ -165,6 +169,11 @@ def createBinaryMsg(oscAddress, dataArray):
 
     return m.getBinary()
 
+def getMessageTime():
+    '''Return the time (time.time()) where the message being handled by a
+    callback have been received from the socket'''
+    return messageTime
+
 def readQueue(thread_id=None):
     '''Read queues from all threads, and dispatch message.
     This must be call in the main thread.
@@ -220,7 +229,7 @@ class OSCServer(_OSCServer):
         while self.isRunning:
             try:
                 message = self.socket.recv(65535)
-                self._queue_message(message)
+                self._queue_message(message, time.time())
             except Exception as e:
                 if type(e) == socket.timeout:
                     continue
@@ -0,0 +1,105 @@
+'''
+Cache statistics: plot hit rate, evictions and memory of each cache category
+
+For each category, the overlay show the current count, memory usage and hit
+rate, and plot the last samples of the hit rate (green) and of the number of
+evictions + timeouts (red). Configuration ::
+
+    [modules]
+    cachestats = interval=1,history=60
+
+`interval` is the time between two samples, `history` the number of samples
+shown.
+'''
+
+from collections import deque
+from pymt.cache import Cache
+from pymt.clock import getClock
+from pymt.graphx import set_color, drawRectangle, drawLabel, drawLine
+from pymt.ui.widgets import MTWidget
+
+class CacheStats(MTWidget):
+    def __init__(self, **kwargs):
+        kwargs.setdefault('interval', 1.)
+        kwargs.setdefault('history', 60)
+        super(CacheStats, self).__init__(**kwargs)
+        self.interval = float(kwargs.get('interval'))
+        self.history = int(kwargs.get('history'))
+        self.samples = {}
+        self.last = {}
+        getClock().schedule_interval(self.sample, self.interval)
+
+    def sample(self, dt):
+        for category, stats in Cache.stats().items():
+            last = self.last.get(category)
+            self.last[category] = stats
+            if last is None:
+                continue
+            hits = stats['hits'] - last['hits']
+            misses = stats['misses'] - last['misses']
+            removed = stats['evictions'] + stats['timeouts'] - \
+                      last['evictions'] - last['timeouts']
+            hit_rate = None
+            if hits + misses:
+                hit_rate = hits / float(hits + misses)
+            if category not in self.samples:
+                self.samples[category] = deque(maxlen=self.history)
+            self.samples[category].append((hit_rate, max(0, removed)))
+
+    def on_update(self):
+        self.bring_to_front()
+
+    def draw(self):
+        lineheight = 50
+        graphw = 200
+        categories = sorted(self.last.keys())
+        height = lineheight * len(categories) + 10
+        width = graphw + 420
+
+        set_color(0, 0, 0, .8)
+        drawRectangle(pos=(0, 0), size=(width, height))
+
+        step = graphw / float(max(1, self.history - 1))
+        y = height - lineheight
+        for category in categories:
+            stats = self.last[category]
+            hit_rate = '-'
+            if stats['hit_rate'] is not None:
+                hit_rate = '%d%%' % (100 * stats['hit_rate'])
+            drawLabel('%s' % category, pos=(10, y + 25),
+                      font_size=12, center=False, nocache=True)
+            drawLabel('count=%d/%s mem=%dKB hit=%s' % (
+                        stats['count'], str(stats['limit']),
+                        stats['size'] / 1024, hit_rate),
+                      pos=(10, y + 8), font_size=10, center=False,
+                      nocache=True)
+
+            # graph background
+            x0 = width - graphw - 10
+            set_color(1, 1, 1, .1)
+            drawRectangle(pos=(x0, y + 5), size=(graphw, lineheight - 10))
+
+            samples = self.samples.get(category)
+            if samples:
+                h = lineheight - 10
+                maxremoved = max(1, max(x[1] for x in samples))
+                rates = []
+                removed = []
+                for index, (rate, count) in enumerate(samples):
+                    x = x0 + index * step
+                    if rate is not None:
+                        rates += [x, y + 5 + rate * h]
+                    removed += [x, y + 5 + count * h / float(maxremoved)]
+                set_color(1, .2, .2, .9)
+                drawLine(removed)
+                set_color(.2, 1, .2, .9)
+                drawLine(rates)
+            y -= lineheight
+
+def start(win, ctx):
+    ctx.w = CacheStats(**ctx.config)
+    win.add_widget(ctx.w)
+
+def stop(win, ctx):
+    getClock().unschedule(ctx.w.sample)
+    win.remove_widget(ctx.w)
@@ -129,23 +129,20 @@ def _on_draw():
         drawRectangle(size=win.size)
 
         y = 0
-        for x in Cache._categories:
+        for x, stats in Cache.stats().items():
             y += 25
-            cat = Cache._categories[x]
-            count = 0
+            count = stats['count']
+            limit = stats['limit']
             usage = '-'
-            limit = cat['limit']
-            timeout = cat['timeout']
-            try:
-                count = len(Cache._objects[x])
-            except:
-                pass
-            try:
+            if limit:
                 usage = 100 * count / limit
-            except:
-                pass
-            args = (x, usage, count, limit, timeout)
-            drawLabel('%s: usage=%s%% count=%d limit=%s timeout=%s' % args,
+            hit_rate = '-'
+            if stats['hit_rate'] is not None:
+                hit_rate = '%d%%' % (100 * stats['hit_rate'])
+            args = (x, usage, count, limit, stats['timeout'], hit_rate,
+                    stats['evictions'], stats['timeouts'])
+            drawLabel('%s: usage=%s%% count=%d limit=%s timeout=%s '
+                      'hit=%s evictions=%d timeouts=%d' % args,
                       pos=(20, 20 + y), font_size=20, center=False, nocache=True)
 
         return True
@@ -0,0 +1,167 @@
+'''
+Latency: measure the latency of input events, from the device to the screen
+
+Every touch have the time where his last event have been received from the
+device (touch.time_event). The latency of each event is measured at 3 stages:
+
+    * postproc: the event come out of the postproc modules
+    * dispatch: the event is dispatched to the first handler
+    * flip: the next window flip, after the event have been drawn
+
+An histogram of each stage is kept, and written in a file when the
+application leaves, with the part of events under the target latency ::
+
+    python app.py -m latency
+    python app.py -m latency:target=50,filename=latency.txt
+
+`target` is the target latency in milliseconds (default to 50), and
+`filename` the file where the report is written (default to
+latency-<appname>.txt).
+
+.. note::
+    The flip stage is the time where the frame is given to the graphic
+    driver. The display itself add its own latency.
+'''
+
+__all__ = ('InputLatencyTracer', 'start', 'stop')
+
+import atexit
+import os
+import sys
+from collections import deque
+from time import time
+from pymt.base import setLatencyTracer, getLatencyTracer
+from pymt.logger import pymt_logger
+
+class InputLatencyTracer(object):
+    '''Collect an histogram of the input latency at each stage.
+
+    :Parameters:
+        `resolution` : float, default to 0.001
+            Width of an histogram bucket, in seconds
+        `max_latency` : float, default to 1.
+            Latencies above are counted in the last bucket
+    '''
+
+    stages = ('postproc', 'dispatch', 'flip')
+
+    def __init__(self, resolution=0.001, max_latency=1.):
+        self.resolution = resolution
+        self.buckets = int(max_latency / resolution) + 1
+        #: stage -> list of counts
+        self.histograms = dict((stage, [0] * self.buckets)
+                               for stage in self.stages)
+        #: stage -> maximum latency seen
+        self.maximums = dict((stage, 0.) for stage in self.stages)
+        # time of events waiting for the next flip. without window, they
+        # are never flipped.
+        self._pending = deque(maxlen=100000)
+
+    def _add(self, stage, latency):
+        bucket = int(latency / self.resolution)
+        if bucket < 0:
+            bucket = 0
+        elif bucket >= self.buckets:
+            bucket = self.buckets - 1
+        self.histograms[stage][bucket] += 1
+        if latency > self.maximums[stage]:
+            self.maximums[stage] = latency
+
+    def postproc(self, events):
+        now = time()
+        add = self._add
+        pending = self._pending
+        for event, touch in events:
+            received = touch.time_event
+            add('postproc', now - received)
+            pending.append(received)
+
+    def dispatch(self, touch):
+        self._add('dispatch', time() - touch.time_event)
+
+    def flip(self):
+        now = time()
+        add = self._add
+        for received in self._pending:
+            add('flip', now - received)
+        self._pending.clear()
+
+    def count(self, stage):
+        '''Return the number of events measured at a stage'''
+        return sum(self.histograms[stage])
+
+    def percentiles(self, stage, values=(50, 95, 99)):
+        '''Return the percentiles of the latency (in seconds) at a stage. The
+        precision is the resolution of the histogram.'''
+        histogram = self.histograms[stage]
+        count = sum(histogram)
+        result = []
+        for p in values:
+            if not count:
+                result.append(0.)
+                continue
+            limit = min(count - 1, int(count * p / 100.))
+            total = 0
+            for bucket, value in enumerate(histogram):
+                total += value
+                if total > limit:
+                    break
+            result.append((bucket + 1) * self.resolution)
+        return result
+
+    def under(self, stage, latency):
+        '''Return the part (0-1) of events measured under a latency (in
+        seconds) at a stage'''
+        histogram = self.histograms[stage]
+        count = sum(histogram)
+        if not count:
+            return 0.
+        return sum(histogram[:int(latency / self.resolution)]) / float(count)
+
+    def report(self, target=.05):
+        '''Return the report as a string'''
+        lines = ['Input latency: target %dms' % (target * 1000), '',
+                 '%-12s %10s %10s %10s %10s %10s %10s' % (
+                     'Stage (ms)', 'Events', 'p50', 'p95', 'p99', 'max',
+                     'target')]
+        for stage in self.stages:
+            p50, p95, p99 = self.percentiles(stage)
+            lines.append('%-12s %10d %10.1f %10.1f %10.1f %10.1f %9.1f%%' % (
+                stage, self.count(stage), p50 * 1000., p95 * 1000.,
+                p99 * 1000., self.maximums[stage] * 1000.,
+                self.under(stage, target) * 100.))
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, filename, target=.05):
+        '''Write the report in a file'''
+        with open(filename, 'w') as fd:
+            fd.write(self.report(target))
+        pymt_logger.info('Latency: report written in %s' % filename)
+
+def _dump(ctx):
+    if getattr(ctx, 'tracer', None) is None:
+        return
+    try:
+        ctx.tracer.dump(ctx.filename, ctx.target)
+    except IOError:
+        pymt_logger.exception('Latency: unable to write report')
+
+def start(win, ctx):
+    appname = os.path.basename(sys.argv[0])
+    if appname == '':
+        appname = 'python'
+    elif appname[-3:] == '.py':
+        appname = appname[:-3]
+    ctx.config.setdefault('target', 50)
+    ctx.config.setdefault('filename', 'latency-%s.txt' % appname)
+    ctx.target = float(ctx.config.get('target')) / 1000.
+    ctx.filename = ctx.config.get('filename')
+    ctx.tracer = InputLatencyTracer()
+    setLatencyTracer(ctx.tracer)
+    atexit.register(_dump, ctx)
+
+def stop(win, ctx):
+    if getLatencyTracer() is ctx.tracer:
+        setLatencyTracer(None)
+    _dump(ctx)
+    ctx.tracer = None
@@ -0,0 +1,281 @@
+'''
+Profiler: measure the time spent in each phase of the main loop
+
+The profiler time every phase of a frame: clock tick, input providers, each
+postproc module, dispatch of input, window events, on_update, on_draw and
+on_flip. The last frames are kept in a ring buffer, and percentiles are
+written in a file when the application leaves ::
+
+    python app.py -m profiler
+    python app.py -m profiler:frames=1000,filename=profile.txt
+
+`frames` is the number of frames kept (default to 600), and `filename` the
+file where the report is written (default to profiler-<appname>.txt).
+`collapsed_filename` is the file of the collapsed stacks (default to
+profiler-<appname>.folded).
+
+The number of display lists compiled in each frame is also counted. A widget
+that is moved or redrawn without changing should not compile anything.
+
+With the `dispatch` option, the time spent in every event handler is also
+attributed to the widget that received the event. Inclusive and exclusive
+times per event type, widget class and id are added to the report, and the
+call stacks are written in a collapsed stack file, that can be read by
+flamegraph.pl ::
+
+    python app.py -m profiler:dispatch
+    flamegraph.pl profiler-app.folded > profile.svg
+
+The dispatch profiler can also be used directly ::
+
+    profiler = DispatchProfiler()
+    profiler.start()
+    # ...
+    profiler.stop()
+    profiler.dump_collapsed('profile.folded')
+'''
+
+__all__ = ('FrameProfiler', 'DispatchProfiler', 'start', 'stop')
+
+import atexit
+import os
+import sys
+from collections import deque
+from time import perf_counter
+from pymt.base import setFrameProfiler, getFrameProfiler, getEventLoop
+from pymt.event import EventDispatcher
+from pymt.logger import pymt_logger
+from pymt.graphx import GlDisplayList
+
+class FrameProfiler(object):
+    '''Collect the duration of each phase of the last frames.
+
+    :Parameters:
+        `frames` : int, default to 600
+            Number of frames to keep
+        `counters` : dict, default to None
+            Counters to read at each frame, as name -> function returning the
+            total value. The difference between the start and the end of a
+            frame is kept.
+    '''
+    def __init__(self, frames=600, counters=None):
+        self.frames = deque(maxlen=frames)
+        self.phases = []
+        self.counters = counters or {}
+        self._current = None
+        self._counters = {}
+        self._start = 0
+        self._last = 0
+
+    def frame_start(self):
+        self._current = {}
+        for name, counter in self.counters.items():
+            self._counters[name] = counter()
+        self._start = self._last = perf_counter()
+
+    def mark(self, phase):
+        current = self._current
+        if current is None:
+            return
+        now = perf_counter()
+        if phase not in current:
+            current[phase] = 0
+            if phase not in self.phases:
+                self.phases.append(phase)
+        current[phase] += now - self._last
+        self._last = now
+
+    def frame_end(self):
+        current = self._current
+        if current is None:
+            return
+        current['frame'] = perf_counter() - self._start
+        for name, counter in self.counters.items():
+            current[name] = counter() - self._counters.get(name, 0)
+        self.frames.append(current)
+        self._current = None
+
+    def percentiles(self, phase, values=(50, 95, 99)):
+        '''Return the percentiles of a phase duration (in seconds) or of a
+        counter over the recorded frames'''
+        durations = sorted(x.get(phase, 0) for x in self.frames)
+        if not durations:
+            return [0 for x in values]
+        count = len(durations)
+        return [durations[min(count - 1, int(count * p / 100.))]
+                for p in values]
+
+    def report(self):
+        '''Return the report as a string'''
+        lines = ['Frame profiler: %d frames' % len(self.frames), '',
+                 '%-40s %10s %10s %10s' % ('Phase (ms)', 'p50', 'p95', 'p99')]
+        for phase in self.phases + ['frame']:
+            p50, p95, p99 = self.percentiles(phase)
+            lines.append('%-40s %10.3f %10.3f %10.3f' % (
+                phase, p50 * 1000., p95 * 1000., p99 * 1000.))
+        if self.counters:
+            lines += ['', '%-40s %10s %10s %10s %10s %10s' % (
+                'Counter (per frame)', 'p50', 'p95', 'p99', 'max', 'total')]
+            for name in sorted(self.counters):
+                p50, p95, p99, pmax = self.percentiles(
+                    name, (50, 95, 99, 100))
+                total = sum(x.get(name, 0) for x in self.frames)
+                lines.append('%-40s %10d %10d %10d %10d %10d' % (
+                    name, p50, p95, p99, pmax, total))
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, filename):
+        '''Write the report in a file'''
+        with open(filename, 'w') as fd:
+            fd.write(self.report())
+        pymt_logger.info('Profiler: report written in %s' % filename)
+
+class DispatchProfiler(object):
+    '''Attribute the time spent in EventDispatcher.dispatch_event() to the
+    dispatcher that received the event.
+
+    While started, dispatch_event() is wrapped, whatever the implementation
+    used (python or accelerate module). For each (event type, class, id), the
+    number of calls, the inclusive time (with the dispatch done in children)
+    and the exclusive time are accumulated in `stats`. The exclusive time of
+    every call stack is accumulated in `stacks`.
+    '''
+    def __init__(self):
+        #: (event_type, classname, id) -> [calls, inclusive, exclusive]
+        self.stats = {}
+        #: collapsed call stack -> exclusive time
+        self.stacks = {}
+        self._original = None
+
+    def start(self):
+        '''Start to wrap EventDispatcher.dispatch_event()'''
+        if self._original is not None:
+            return
+        original = self._original = EventDispatcher.dispatch_event
+        stats = self.stats
+        stacks = self.stacks
+        # each entry is [path, start time, time spent in children]
+        stack = []
+
+        def dispatch_event(self, event_type, *args):
+            if event_type not in self._event_types:
+                return original(self, event_type, *args)
+            classname = self.__class__.__name__
+            wid = getattr(self, 'id', None)
+            if wid:
+                name = '%s:%s#%s' % (event_type, classname, wid)
+            else:
+                name = '%s:%s' % (event_type, classname)
+            if stack:
+                path = '%s;%s' % (stack[-1][0], name)
+            else:
+                path = name
+            frame = [path, perf_counter(), 0.]
+            stack.append(frame)
+            try:
+                return original(self, event_type, *args)
+            finally:
+                stack.pop()
+                inclusive = perf_counter() - frame[1]
+                exclusive = inclusive - frame[2]
+                if stack:
+                    stack[-1][2] += inclusive
+                key = (event_type, classname, wid)
+                value = stats.get(key)
+                if value is None:
+                    value = stats[key] = [0, 0., 0.]
+                value[0] += 1
+                value[1] += inclusive
+                value[2] += exclusive
+                stacks[path] = stacks.get(path, 0.) + exclusive
+
+        EventDispatcher.dispatch_event = dispatch_event
+
+    def stop(self):
+        '''Restore the original EventDispatcher.dispatch_event()'''
+        if self._original is None:
+            return
+        EventDispatcher.dispatch_event = self._original
+        self._original = None
+
+    def reset(self):
+        '''Clear all the collected data'''
+        self.stats.clear()
+        self.stacks.clear()
+
+    def report(self, count=50):
+        '''Return the <count> most expensive dispatch, sorted by exclusive
+        time, as a string'''
+        lines = ['Dispatch profiler', '',
+                 '%-50s %8s %12s %12s' % (
+                     'Event:Class#id', 'Calls', 'Incl (ms)', 'Excl (ms)')]
+        items = sorted(self.stats.items(), key=lambda x: -x[1][2])
+        for (event_type, classname, wid), value in items[:count]:
+            name = '%s:%s' % (event_type, classname)
+            if wid:
+                name += '#%s' % wid
+            lines.append('%-50s %8d %12.3f %12.3f' % (
+                name, value[0], value[1] * 1000., value[2] * 1000.))
+        return '\n'.join(lines) + '\n'
+
+    def dump_collapsed(self, filename):
+        '''Write the call stacks in the collapsed format used by flamegraph.
+        The value of each stack is the exclusive time, in microseconds.'''
+        with open(filename, 'w') as fd:
+            for path, value in sorted(self.stacks.items()):
+                value = int(value * 1000000)
+                if value > 0:
+                    fd.write('%s %d\n' % (path, value))
+        pymt_logger.info('Profiler: collapsed stacks written in %s' % filename)
+
+def _default_filename(ext):
+    appname = os.path.basename(sys.argv[0])
+    if appname == '':
+        appname = 'python'
+    elif appname[-3:] == '.py':
+        appname = appname[:-3]
+    return 'profiler-%s.%s' % (appname, ext)
+
+def _dump(ctx):
+    if getattr(ctx, 'profiler', None) is None:
+        return
+    try:
+        ctx.profiler.dump(ctx.filename)
+        evloop = getEventLoop()
+        if evloop is not None:
+            with open(ctx.filename, 'a') as fd:
+                fd.write('\nCoalesced input events: %d\n' %
+                         evloop.coalesced_events)
+        if ctx.dispatch is not None:
+            with open(ctx.filename, 'a') as fd:
+                fd.write('\n')
+                fd.write(ctx.dispatch.report())
+            ctx.dispatch.dump_collapsed(ctx.collapsed_filename)
+    except IOError:
+        pymt_logger.exception('Profiler: unable to write report')
+
+def _displaylist_compiled():
+    return GlDisplayList.compile_count
+
+def start(win, ctx):
+    ctx.config.setdefault('frames', 600)
+    ctx.config.setdefault('filename', _default_filename('txt'))
+    ctx.config.setdefault('collapsed_filename', _default_filename('folded'))
+    ctx.profiler = FrameProfiler(frames=int(ctx.config.get('frames')),
+        counters={'displaylist.compiled': _displaylist_compiled})
+    ctx.filename = ctx.config.get('filename')
+    ctx.collapsed_filename = ctx.config.get('collapsed_filename')
+    ctx.dispatch = None
+    if ctx.config.get('dispatch'):
+        ctx.dispatch = DispatchProfiler()
+        ctx.dispatch.start()
+    setFrameProfiler(ctx.profiler)
+    atexit.register(_dump, ctx)
+
+def stop(win, ctx):
+    if getFrameProfiler() is ctx.profiler:
+        setFrameProfiler(None)
+    if ctx.dispatch is not None:
+        ctx.dispatch.stop()
+    _dump(ctx)
+    ctx.profiler = None
@@ -0,0 +1,37 @@
+'''
+Recorder: record all the input events in a trace file, for replaying them.
+
+The events are recorded after the postproc modules. The trace can be replayed
+with the replay input provider ::
+
+    python main.py -m recorder:filename=session.trace
+
+    [input]
+    replay = replay,session.trace
+
+Default filename is input.trace.
+'''
+
+import pymt
+from pymt.input.recorder import InputRecorder
+
+def _add_recorder(ctx, *largs):
+    # must be added after the default postproc modules. They are added when
+    # the event loop is created, the module can be started before it.
+    evloop = pymt.getEventLoop()
+    if evloop is None:
+        pymt.getClock().schedule_once(ctx.add_recorder, 0)
+        return
+    evloop.add_postproc_module(ctx.recorder)
+
+def start(win, ctx):
+    ctx.recorder = InputRecorder(ctx.config.get('filename', 'input.trace'))
+    ctx.add_recorder = pymt.curry(_add_recorder, ctx)
+    _add_recorder(ctx)
+
+def stop(win, ctx):
+    pymt.getClock().unschedule(ctx.add_recorder)
+    evloop = pymt.getEventLoop()
+    if evloop is not None:
+        evloop.remove_postproc_module(ctx.recorder)
+    ctx.recorder.close()
@@ -0,0 +1,139 @@
+'''
+Spatial index: find quickly the objects that contain a point
+
+SpatialGrid is a uniform grid of square cells. Each object is registered with
+his bounding box, and stored in every cell covered by it. Looking for the
+objects under a point only visit one cell ::
+
+    grid = SpatialGrid(cell_size=128)
+    grid.update(widget, widget.x, widget.y, widget.width, widget.height)
+    for obj in grid.query(touch.x, touch.y):
+        print(obj)
+
+    # when the object move, just update it again
+    grid.update(widget, widget.x, widget.y, widget.width, widget.height)
+
+Objects covering more than `max_cells` cells are not stored in cells, but
+always tested by query().
+'''
+
+__all__ = ('SpatialGrid', )
+
+from math import floor
+
+class SpatialGrid(object):
+    '''Uniform grid to index objects by their bounding box.
+
+    :Parameters:
+        `cell_size` : int, default to 128
+            Size of a cell
+        `max_cells` : int, default to 256
+            Maximum number of cells used by an object. Bigger objects are
+            stored in a separated list.
+    '''
+
+    __slots__ = ('cell_size', 'max_cells', '_cells', '_items', '_large')
+
+    def __init__(self, cell_size=128, max_cells=256):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        # (cx, cy) -> set of objects
+        self._cells = {}
+        # object -> (x, y, x2, y2, cells)
+        self._items = {}
+        # objects not stored in cells
+        self._large = set()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, obj):
+        return obj in self._items
+
+    def _get_cells(self, x, y, x2, y2):
+        cell_size = self.cell_size
+        cx1 = int(floor(x / cell_size))
+        cy1 = int(floor(y / cell_size))
+        cx2 = int(floor(x2 / cell_size))
+        cy2 = int(floor(y2 / cell_size))
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.max_cells:
+            return None
+        return tuple((cx, cy) for cx in range(cx1, cx2 + 1)
+                              for cy in range(cy1, cy2 + 1))
+
+    def update(self, obj, x, y, width, height):
+        '''Add an object in the grid, or update his bounding box'''
+        x2 = x + width
+        y2 = y + height
+        if x2 < x:
+            x, x2 = x2, x
+        if y2 < y:
+            y, y2 = y2, y
+
+        item = self._items.get(obj)
+        if item is not None and item[:4] == (x, y, x2, y2):
+            return
+
+        try:
+            cells = self._get_cells(x, y, x2, y2)
+        except (OverflowError, ValueError):
+            # infinite or nan coordinates
+            cells = None
+
+        if item is not None:
+            if item[4] == cells:
+                self._items[obj] = (x, y, x2, y2, cells)
+                return
+            self._remove_cells(obj, item[4])
+
+        self._items[obj] = (x, y, x2, y2, cells)
+        if cells is None:
+            self._large.add(obj)
+            return
+        grid = self._cells
+        for cell in cells:
+            content = grid.get(cell)
+            if content is None:
+                grid[cell] = content = set()
+            content.add(obj)
+
+    def remove(self, obj):
+        '''Remove an object from the grid. No error is raised if the object
+        is not in the grid.'''
+        item = self._items.pop(obj, None)
+        if item is not None:
+            self._remove_cells(obj, item[4])
+
+    def _remove_cells(self, obj, cells):
+        if cells is None:
+            self._large.discard(obj)
+            return
+        grid = self._cells
+        for cell in cells:
+            content = grid[cell]
+            content.discard(obj)
+            if not content:
+                del grid[cell]
+
+    def clear(self):
+        '''Remove all the objects'''
+        self._cells.clear()
+        self._items.clear()
+        self._large.clear()
+
+    def query(self, x, y):
+        '''Return the list of objects whose bounding box contains the point
+        (x, y). The order of the list is undefined.'''
+        cell_size = self.cell_size
+        try:
+            cell = (int(floor(x / cell_size)), int(floor(y / cell_size)))
+        except (OverflowError, ValueError):
+            return []
+        result = []
+        items = self._items
+        for candidates in (self._cells.get(cell, ()), self._large):
+            for obj in candidates:
+                ox, oy, ox2, oy2, cells = items[obj]
+                if ox <= x <= ox2 and oy <= y <= oy2:
+                    result.append(obj)
+        return result
@@ -74,6 +74,20 @@ class bench_graphx_line:
         for x in range(1000):
             drawLine(lines)
 
+class bench_graphx_line_batch:
+    '''Graphx: draw lines (5000 x/y) 1000 times, batched'''
+    def __init__(self):
+        lines = []
+        w, h = window_size
+        for x in range(5000):
+            lines.extend([random() * w, random() * h])
+        self.lines = lines
+    def run(self):
+        lines = self.lines
+        for x in range(1000):
+            with gx_batch():
+                drawLine(lines)
+
 class bench_graphics_line:
     '''Graphics: draw lines (5000 x/y) 1000 times'''
     def __init__(self):
@@ -102,6 +116,21 @@ class bench_graphx_rectangle:
             for pos, size in rects:
                 drawRectangle(pos=pos, size=size)
 
+class bench_graphx_rectangle_batch:
+    '''Graphx: draw rectangle (5000 rect) 1000 times, batched'''
+    def __init__(self):
+        rects = []
+        w, h = window_size
+        for x in range(5000):
+            rects.append(((random() * w, random() * h), (random() * w, random() * h)))
+        self.rects = rects
+    def run(self):
+        rects = self.rects
+        for x in range(1000):
+            with gx_batch():
+                for pos, size in rects:
+                    drawRectangle(pos=pos, size=size)
+
 class bench_graphics_rectangle:
     '''Graphics: draw rectangle (5000 rect) 1000 times'''
     def __init__(self):
@@ -147,6 +176,21 @@ class bench_graphx_roundedrectangle:
             for pos, size in rects:
                 drawRoundedRectangle(pos=pos, size=size)
 
+class bench_graphx_roundedrectangle_batch:
+    '''Graphx: draw rounded rectangle (5000 rect) 1000 times, batched'''
+    def __init__(self):
+        rects = []
+        w, h = window_size
+        for x in range(5000):
+            rects.append(((random() * w, random() * h), (random() * w, random() * h)))
+        self.rects = rects
+    def run(self):
+        rects = self.rects
+        for x in range(1000):
+            with gx_batch():
+                for pos, size in rects:
+                    drawRoundedRectangle(pos=pos, size=size)
+
 
 class bench_graphics_roundedrectangle:
     '''Graphics: draw rounded rectangle (5000 rect) 1000 times'''
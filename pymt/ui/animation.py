@@ -114,7 +114,7 @@ class AnimationBase(object):
             kwargs = {}
             attr = getattr(self.widget, prop)
             try:
-                if type(attr) == dict and type(value) == dict:
+                if isinstance(attr, dict) and isinstance(value, dict):
                     for k, v in value.items():
                         attr[k] = v
                 else:
@@ -132,6 +132,9 @@ class AnimationBase(object):
             vstart, vend =  self._prop_list[prop]
             value = self._calculate_attribute_value(vstart, vend, t)
             self._set_value_from(value, prop)
+        # the animated property may not be tracked by the widget
+        if hasattr(self.widget, 'invalidate'):
+            self.widget.invalidate()
 
     def _calculate_attribute_value(self, vstart, vend, t):
         '''A recursive function to calculate the resultant value of property.'''
@@ -7,11 +7,17 @@ TextArea keystrokes :
     * ctrl + x: cut current selection into clipboard
     * ctrl + v: paste current clipboard text
     * ctrl + a: select all the text
+
+The text is splitted in lines, and the lines are measured with the glyph
+extents of the text provider: a label is rendered only when his line is
+visible. When the text is edited, only the paragraphs (text between 2 line
+breaks) touched by the edit are splitted again.
 '''
 
 __all__ = ('MTTextArea', )
 
 import re
+from bisect import bisect_left
 from pymt.cache import Cache
 from pymt.graphx import set_color, drawLine
 from pymt.base import getFrameDt, getWindow
@@ -36,6 +42,11 @@ class MTTextArea(MTTextInput):
     '''
     def __init__(self, **kwargs):
         self._glyph_size = {}
+        self._measure_label = None
+        self._line_starts = None
+        self._line_ends = None
+        self.line_widths = []
+        self.line_labels = []
         self._scroll_x = 0
         self._scroll_y = 5
         self._selection = False
@@ -85,7 +96,7 @@ class MTTextArea(MTTextInput):
         if self.autosize or self.autoheight:
             self.height = num * self.line_height + self.line_spacing * (num - 1)
         if (self.autosize or self.autowidth):
-            self.width = max(label.content_width for label in self.line_labels)
+            self.width = max(self.line_widths)
 
     def _get_value(self):
         lf = self.lines_flags
@@ -123,19 +134,81 @@ class MTTextArea(MTTextInput):
                       '''Get/set the (col,row) of the cursor''')
 
     def _refresh_lines(self, text=None):
-        '''Recreate all lines / flags / labels from current value
+        '''Recreate all lines / flags / widths from current value
         '''
         cursor_index = self.cursor_index
         text = text if type(text) in (str, str) else self.value
         self.lines, self.lines_flags = self._split_smart(text)
-        self.line_labels = list(map(self.create_line_label, self.lines))
-        self.line_height = self.line_labels[0].content_height
+        self.line_widths = list(map(self._line_width, self.lines))
+        self.line_labels = [None] * len(self.lines)
+        self._line_starts = None
+        self.line_height = self._line_extents(self.lines[0])[1]
         self.line_spacing = 2
         self._recalc_size()
         # now, if the text change, maybe the cursor is not as the same place as
         # before. so, try to set the cursor on the good place
         self.cursor = self.get_cursor_from_index(cursor_index)
 
+    def _get_paragraph(self, row):
+        '''Return the first row and the row after the end of the paragraph
+        containing a row
+        '''
+        lf = self.lines_flags
+        start = row
+        while start > 0 and not lf[start] & FL_IS_NEWLINE:
+            start -= 1
+        end = row + 1
+        while end < len(lf) and not lf[end] & FL_IS_NEWLINE:
+            end += 1
+        return start, end
+
+    def _replace_text(self, start, end, text):
+        '''Replace the text between the index start and end by a new text.
+        Only the paragraphs touched are splitted again.
+        '''
+        l = self.lines
+        lf = self.lines_flags
+        first = self._get_paragraph(self.get_cursor_from_index(start)[1])[0]
+        last = self._get_paragraph(self.get_cursor_from_index(end)[1])[1]
+        offset = self._get_line_starts()[first]
+        ptext = ''.join([('\n' if (lf[i] & FL_IS_NEWLINE and i != first)
+                          else '') + l[i] for i in range(first, last)])
+        ptext = ptext[:start - offset] + text + ptext[end - offset:]
+        lines, lines_flags = self._split_smart(ptext)
+        lines_flags[0] |= lf[first] & FL_IS_NEWLINE
+        l[first:last] = lines
+        lf[first:last] = lines_flags
+        self.line_widths[first:last] = list(map(self._line_width, lines))
+        self.line_labels[first:last] = [None] * len(lines)
+        self._line_starts = None
+
+    def _get_line_starts(self):
+        '''Return the index of the first character of each line in the text.
+        The index is rebuilt only after a change of the lines.
+        '''
+        if self._line_starts is None:
+            starts = []
+            ends = []
+            index = 0
+            lf = self.lines_flags
+            for row, line in enumerate(self.lines):
+                if lf[row] & FL_IS_NEWLINE:
+                    index += 1
+                starts.append(index)
+                index += len(line)
+                ends.append(index)
+            self._line_starts = starts
+            self._line_ends = ends
+        return self._line_starts
+
+    def _get_text_length(self):
+        '''Return the length of the value, without joining the lines
+        '''
+        self._get_line_starts()
+        if not self._line_ends:
+            return 0
+        return self._line_ends[-1]
+
     def _tokenize(self, text):
         '''Tokenize a text string from some delimiters
         '''
@@ -172,6 +245,10 @@ class MTTextArea(MTTextInput):
 
         # try to add each word on current line.
         for word in self._tokenize(text):
+            # the empty word at the end of a text would take a width of 1,
+            # and can wrap in an empty line
+            if not word:
+                continue
             is_newline = (word == '\n')
             w = glyph_size(word)
             # if we have more than the width, or if it's a newline,
@@ -187,7 +264,7 @@ class MTTextArea(MTTextInput):
             else:
                 x += w
                 line.append(word)
-        if line or flags & FL_IS_NEWLINE:
+        if line or flags & FL_IS_NEWLINE or not lines:
             lines.append(''.join(line))
             lines_flags.append(flags)
 
@@ -208,11 +285,14 @@ class MTTextArea(MTTextInput):
         '''
         if not self._selection:
             return
-        v = self.value
-        text = v[:self._selection_from] + v[self._selection_to:]
-        self.value = text
-        self.cursor = self.get_cursor_from_index(self._selection_from)
+        a, b = self._selection_from, self._selection_to
+        if a > b:
+            a, b = b, a
+        self._replace_text(a, b, '')
+        self.cursor = self.get_cursor_from_index(a)
         self.cancel_selection()
+        if a != b:
+            self.dispatch_event('on_text_change', self)
 
     def _update_selection(self, finished=False):
         '''Update selection text and order of from/to if finished is True.
@@ -236,14 +316,27 @@ class MTTextArea(MTTextInput):
         assert(idx < len(self.lines))
         self.lines.pop(idx)
         self.lines_flags.pop(idx)
+        self.line_widths.pop(idx)
         self.line_labels.pop(idx)
+        self._line_starts = None
         self.cursor = self.cursor
 
     def _set_line_text(self, line_num, text):
         '''Set current line with other text than the default one.
         '''
         self.lines[line_num] = text
-        self.line_labels[line_num] = self.create_line_label(text)
+        self.line_widths[line_num] = self._line_width(text)
+        self.line_labels[line_num] = None
+        self._line_starts = None
+
+    def get_line_label(self, line_num):
+        '''Get the label of a line, created only when needed
+        '''
+        label = self.line_labels[line_num]
+        if label is None:
+            label = self.create_line_label(self.lines[line_num])
+            self.line_labels[line_num] = label
+        return label
 
     def get_line_options(self):
         '''Get or create line options, to be used for Label creation
@@ -279,12 +372,24 @@ class MTTextArea(MTTextInput):
             Cache.append('textarea.label', cid, label)
         return label
 
+    def _line_extents(self, text):
+        '''Return the size of a line, as the size of his label, without
+        rendering it
+        '''
+        if self._measure_label is None:
+            self._measure_label = Label('', **self.get_line_options())
+        ntext = text.replace('\n', '').replace('\t', ' ' * self.tab_width)
+        w, h = self._measure_label.get_extents(ntext)
+        return max(1, int(w)), max(1, int(h))
+
+    def _line_width(self, text):
+        return self._line_extents(text)[0]
+
     def glyph_size(self, g):
         '''Get or add size of a glyph
         '''
         if g not in self._glyph_size:
-            l = self.create_line_label(g)
-            self._glyph_size[g] = l.content_width
+            self._glyph_size[g] = self._line_width(g)
         return self._glyph_size[g]
 
     def _init_glyph_sizes(self):
@@ -318,18 +423,10 @@ class MTTextArea(MTTextInput):
     def cursor_index(self):
         '''Return the cursor index in the text/value.
         '''
-        l = self.lines
-        if len(l) == 0:
+        if len(self.lines) == 0:
             return 0
-        lf = self.lines_flags
-        index, cr = self.cursor
-        for row in range(cr):
-            index += len(l[row])
-            if lf[row] & FL_IS_NEWLINE:
-                index += 1
-        if lf[cr] & FL_IS_NEWLINE:
-            index += 1
-        return index
+        cc, cr = self.cursor
+        return self._get_line_starts()[cr] + cc
 
     def cursor_offset(self):
         '''Get the cursor x offset on the current line
@@ -341,21 +438,13 @@ class MTTextArea(MTTextInput):
 
     def get_cursor_from_index(self, index):
         '''Return the (row, col) of the cursor from text index'''
-        index = boundary(0, len(self.value), index)
+        index = boundary(0, self._get_text_length(), index)
         if index <= 0:
             return 0, 0
-        lf = self.lines_flags
-        l = self.lines
-        i = 0
-        for row in range(len(l)):
-            ni = i + len(l[row])
-            if lf[row] & FL_IS_NEWLINE:
-                ni += 1
-                i += 1
-            if ni >= index:
-                return index - i, row
-            i = ni
-        return index, row
+        # first line ending after the index
+        starts = self._get_line_starts()
+        row = bisect_left(self._line_ends, index)
+        return index - starts[row], row
 
     def draw_cursor(self, x, y):
         '''Draw the cursor on the widget
@@ -394,17 +483,20 @@ class MTTextArea(MTTextInput):
         # selection
         selection_active = self._selection
 
-        # draw labels
-        labels = self.line_labels
+        # draw labels, only the visible lines are rendered
+        get_line_label = self.get_line_label
         is_active_input = self.is_active_input
         x = self.x + self.__padding_x
-        y = self.top - self.__padding_y + (self._scroll_y * dy)
         miny = self.y + self.__padding_y
         maxy = self.top - self.__padding_y
+        first = max(0, self._scroll_y)
+        last = min(len(self.lines),
+                   int(self._scroll_y + (maxy - miny) / dy) + 1)
+        y = maxy - (first - self._scroll_y) * dy
         draw_selection = self.draw_selection
-        for line_num, value in enumerate(self.lines):
+        for line_num in range(first, last):
             if miny <= y <= maxy:
-                label = labels[line_num]
+                label = get_line_label(line_num)
                 label.viewport_pos = sx, 0
                 label.pos = x, y
                 if selection_active:
@@ -480,35 +572,20 @@ class MTTextArea(MTTextInput):
     def insert_text(self, c):
         '''Insert new text on the current cursor position
         '''
-        if len(self.value) >= self.buffer_size:
+        if self._get_text_length() >= self.buffer_size:
             return
-        cc, cr = self.cursor
         ci = self.cursor_index
-        text = self.lines[cr]
-        new_text = text[:cc] + c + text[cc:]
-        self._set_line_text(cr, new_text)
-        self._refresh_lines()
+        self._replace_text(ci, ci, c)
         self.cursor = self.get_cursor_from_index(ci + len(c))
         self.dispatch_event('on_text_change', self)
 
     def do_backspace(self):
         '''Do backspace operation from the current cursor position
         '''
-        cc, cr = self.cursor
-        text = self.lines[cr]
         cursor_index = self.cursor_index
-        if cc == 0 and cr == 0:
+        if cursor_index == 0:
             return
-        if cc == 0:
-            text_last_line = self.lines[cr - 1]
-            self._set_line_text(cr - 1, text_last_line + text)
-            self._delete_line(cr)
-        else:
-            ch = text[cc-1]
-            new_text = text[:cc-1] + text[cc:]
-            self._set_line_text(cr, new_text)
-
-        self._refresh_lines()
+        self._replace_text(cursor_index - 1, cursor_index, '')
         self.cursor = self.get_cursor_from_index(cursor_index - 1)
         self.dispatch_event('on_text_change', self)
 
@@ -238,8 +238,10 @@ class MTScatter(MTWidget):
     def _get_transform(self):
         return self._transform
     def _set_transform(self, x):
+        self.invalidate()
         self._transform = x
         self.update_matrices()
+        self.invalidate()
     transform = property(_get_transform, _set_transform,
         doc='Get/Set transformation matrix (numpy matrix)')
 
@@ -268,6 +270,14 @@ class MTScatter(MTWidget):
         p = matrix_multiply(self._transform_inv, (x, y, 0, 1))
         return (p[0], p[1])
 
+    def to_local_affine(self):
+        if type(self).to_local is not MTScatter.to_local:
+            return super(MTScatter, self).to_local_affine()
+        # 2d part of the inverse matrix (z = 0)
+        m = self._transform_inv
+        return (float(m[0, 0]), float(m[0, 1]), float(m[0, 3]),
+                float(m[1, 0]), float(m[1, 1]), float(m[1, 3]))
+
     def apply_angle_scale_trans(self, angle, scale, trans, point=Vector(0, 0)):
         '''Update matrix transformation by adding new angle, scale and translate.
 
@@ -324,6 +334,11 @@ class MTScatter(MTWidget):
         function, or the drawing will failed.
         '''
         self._transform_inv = inverse_matrix(self._transform)
+        self.invalidate_transform()
+        # the bounding box changed, update the spatial index of the parent
+        index = getattr(self._parent, '_spatial_index', None)
+        if index is not None:
+            index.update(self)
         self._transform_gl = ascontiguousarray(self._transform.T,
                                                dtype='float32')
         self._transform_inv_gl = ascontiguousarray(self._transform.T,
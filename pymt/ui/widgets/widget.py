@@ -5,15 +5,21 @@ Widget: Base of every widget implementation.
 __all__ = ('getWidgetById', 'MTWidget')
 
 import weakref
+from pymt.base import getWindow
 from pymt.event import EventDispatcher
 from pymt.logger import pymt_logger
 from pymt.utils import SafeList
 from pymt.ui.factory import MTWidgetFactory
 from pymt.ui.colors import css_get_style
-from pymt.graphx import set_color, drawCSSRectangle
+from pymt.graphx import set_color, drawCSSRectangle, CSSStyle
+from pymt.spatialindex import SpatialGrid
 
 _id_2_widget = dict()
 
+#: Affine matrix (a, b, c, d, e, f) of the identity:
+#: x' = a * x + b * y + c, y' = d * x + e * y + f
+identity_affine = (1., 0., 0., 0., 1., 0.)
+
 def getWidgetById(widget_id):
     '''Get a widget by ID'''
     if widget_id not in _id_2_widget:
@@ -26,6 +32,100 @@ def getWidgetById(widget_id):
     return obj
 
 
+class _ChildIndexEntry(object):
+    '''Update the bounding box of one child in the spatial index of his
+    parent'''
+    __slots__ = ('grid', 'widget', 'order', '__weakref__')
+
+    def __init__(self, grid, widget, order):
+        self.grid = grid
+        self.widget = widget
+        self.order = order
+
+    def update(self, *largs):
+        pos, size = self.widget.bbox
+        self.grid.update(self.widget, pos[0], pos[1], size[0], size[1])
+
+
+class _ChildIndex(object):
+    '''Spatial index of the children of a widget, used to find the children
+    under a touch without testing all of them.
+
+    The bounding box of each child is updated from his on_move and on_resize
+    events, or with :meth:`update` when it change without them (like a
+    scatter transformation). The z-order of the children is tracked from
+    add_widget() calls.
+    '''
+    __slots__ = ('grid', 'entries', 'top', 'bottom')
+
+    #: events that can change the bounding box of a child
+    events = ('on_move', 'on_resize')
+
+    def __init__(self, children):
+        self.grid = SpatialGrid()
+        self.entries = {}
+        self.top = 0
+        self.bottom = 0
+        for w in children:
+            self.add(w)
+
+    def add(self, widget, front=True):
+        if widget in self.entries:
+            self.remove(widget)
+        if front:
+            self.top += 1
+            order = self.top
+        else:
+            self.bottom -= 1
+            order = self.bottom
+        entry = _ChildIndexEntry(self.grid, widget, order)
+        self.entries[widget] = entry
+        widget.push_handlers(**self._get_handlers(widget, entry))
+        entry.update()
+
+    def remove(self, widget):
+        entry = self.entries.pop(widget, None)
+        if entry is None:
+            return
+        widget.remove_handlers(**self._get_handlers(widget, entry))
+        self.grid.remove(widget)
+
+    def update(self, widget):
+        '''Update the bounding box of a child'''
+        entry = self.entries.get(widget)
+        if entry is not None:
+            entry.update()
+
+    def clear(self):
+        for widget in list(self.entries.keys()):
+            self.remove(widget)
+
+    def pick(self, x, y):
+        '''Return the children whose bounding box contains (x, y), from the
+        top to the bottom'''
+        entries = self.entries
+        candidates = self.grid.query(x, y)
+        candidates.sort(key=lambda w: entries[w].order, reverse=True)
+        return candidates
+
+    def _get_handlers(self, widget, entry):
+        return dict((event, entry.update) for event in self.events
+                    if event in widget.event_types)
+
+
+def _compose_affine(m, p):
+    # return the matrix applying p, then m. None is unknown
+    if p is None or m is None:
+        return None
+    if p is identity_affine:
+        return m
+    if m is identity_affine:
+        return p
+    a, b, c, d, e, f = m
+    pa, pb, pc, pd, pe, pf = p
+    return (a * pa + b * pd, a * pb + b * pe, a * pc + b * pf + c,
+            d * pa + e * pd, d * pb + e * pe, d * pc + e * pf + f)
+
 class MTWidgetMetaclass(type):
     '''Metaclass to auto register new widget into :ref:`MTWidgetFactory`
     .. warning::
@@ -63,6 +163,10 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
             Add inline CSS
         `cls` : str, default is ''
             CSS class of this widget
+        `spatial_index` : bool, default is False
+            Index the children by bounding box, to test only the children
+            under the touch in on_touch_down. Use it only if every child
+            accept touch down inside his bounding box (see `bbox`).
 
     :Events:
         `on_update` ()
@@ -87,7 +191,8 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
                  '_parent_window_source', '_parent_window',
                  '_parent_layout_source', '_parent_layout',
                  '_size_hint', '_id', '_parent',
-                 '_visible', '_inline_style',
+                 '_visible', '_inline_style', '_spatial_index',
+                 '_affine_cache',
                  '__animationcache__',
                  '__weakref__')
 
@@ -109,6 +214,7 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
         kwargs.setdefault('draw_children', True)
         kwargs.setdefault('cls', '')
         kwargs.setdefault('style', {})
+        kwargs.setdefault('spatial_index', False)
 
         self._id = None
         if 'id' in kwargs:
@@ -125,18 +231,22 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
         self._parent              = None
         self._visible             = None
         self._size_hint           = kwargs.get('size_hint')
-
+        self._spatial_index       = None
+        self._affine_cache        = None
 
         #: List of children (SafeList)
         self.children             = SafeList()
         #: If False, childrens are not drawed. (deprecated)
         self.draw_children        = kwargs.get('draw_children')
         #: Dictionnary that contains the widget style
-        self.style = {}
+        self.style = CSSStyle()
 
         # apply visibility
         self.visible              = kwargs.get('visible')
 
+        # index children by position
+        self.spatial_index        = kwargs.get('spatial_index')
+
         # cache for get_parent_window()
         self._parent_layout         = None
         self._parent_layout_source  = None
@@ -178,6 +288,7 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
 
     def _set_parent(self, parent):
         self._parent = parent
+        self.invalidate_transform()
         self.dispatch_event('on_parent')
     def _get_parent(self):
         return self._parent
@@ -202,6 +313,7 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
         if self._visible == visible:
             return
         self._visible = visible
+        self.invalidate()
         # register or unregister event if the widget is visible or not
         if visible:
             for ev in MTWidget.visible_events:
@@ -224,14 +336,36 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
     size_hint = property(_get_size_hint, _set_size_hint,
                          doc='size_hint is used by layouts to determine size behaviour during layout')
 
+    def _set_spatial_index(self, value):
+        if bool(value) == (self._spatial_index is not None):
+            return
+        if value:
+            self._spatial_index = _ChildIndex(self.children)
+        else:
+            self._spatial_index.clear()
+            self._spatial_index = None
+    def _get_spatial_index(self):
+        return self._spatial_index is not None
+    spatial_index = property(_get_spatial_index, _set_spatial_index,
+        doc='True if the children are indexed by bounding box. When True, '
+            'on_touch_down is dispatched only to the children whose bounding '
+            'box contains the touch.')
+
+    def _get_bbox(self):
+        return self.pos, self.size
+    bbox = property(_get_bbox,
+        doc='Bounding box of the widget in parent coordinates, in '
+            '((x, y), (width, height)) format. Read only.')
+
     def apply_css(self, styles):
         '''Called at __init__ time to applied css attribute in current class.
         '''
         self.style.update(styles)
+        self.invalidate()
 
     def reload_css(self):
         '''Called when css want to be reloaded from scratch'''
-        self.style = {}
+        self.style = CSSStyle()
         style = css_get_style(widget=self)
         self.apply_css(style)
         if len(self._inline_style):
@@ -275,6 +409,54 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
             return (x - self.x, y - self.y)
         return (x, y)
 
+    def to_local_affine(self):
+        '''Return the affine matrix (a, b, c, d, e, f) doing the same thing as
+        to_local(), or None if the transformation is not affine or unknown.
+        Widgets overriding to_local() must override this method too, and call
+        invalidate_transform() when their transformation change.
+        '''
+        if type(self).to_local is MTWidget.to_local:
+            return identity_affine
+        return None
+
+    def to_widget_affine(self):
+        '''Return the affine matrix (a, b, c, d, e, f) doing the same thing as
+        to_widget(), or None if one of the transformations is unknown. The
+        matrix is composed from the window to the widget, and cached until the
+        transformation or the parent of the widget or of an ancestor change.
+        '''
+        cache = self._affine_cache
+        if cache is not None:
+            return cache[0]
+        if type(self).to_widget is not MTWidget.to_widget:
+            matrix = None
+        else:
+            matrix = self.to_local_affine()
+            parent = self.parent
+            if matrix is not None and parent:
+                parent_affine = getattr(parent, 'to_widget_affine', None)
+                matrix = _compose_affine(matrix, parent_affine and
+                                         parent_affine())
+        self._affine_cache = (matrix, )
+        return matrix
+
+    def invalidate_transform(self):
+        '''Invalidate the cached window to widget matrix of the widget and of
+        his children. Must be called when the transformation of the widget
+        change (see to_local_affine).
+        '''
+        # the matrix of a child is cached after the one of his parent, so
+        # under a widget without cache, no cached matrix depend on it.
+        if self._affine_cache is None:
+            return
+        stack = [self]
+        while stack:
+            widget = stack.pop()
+            widget._affine_cache = None
+            for child in widget.children:
+                if getattr(child, '_affine_cache', None) is not None:
+                    stack.append(child)
+
     def collide_point(self, x, y):
         '''Test if the (x,y) is in widget bounding box'''
         if not self.visible:
@@ -332,6 +514,37 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
             parent.remove_widget(self)
             parent.add_widget(self)
 
+    def invalidate(self, pos=None, size=None):
+        '''Ask the window to redraw the widget at the next frame. Changes of
+        position, size, style, visibility and children are tracked
+        automaticly: call it only if the look of the widget change for
+        another reason, and if the window redraw mode is not 'always'.
+
+        :Parameters:
+            `pos` : tuple, default to None
+                Position of the area to redraw, default to the widget position
+            `size` : tuple, default to None
+                Size of the area to redraw, default to the widget size
+        '''
+        if self._parent is None:
+            return
+        win = getWindow()
+        if win is None or win.redraw == 'always':
+            return
+        if win.redraw != 'scissor':
+            win.invalidate()
+            return
+        bpos, bsize = self.bbox
+        x, y = pos or bpos
+        w, h = size or bsize
+        points = [self.to_window(px, py) for px, py in (
+            (x, y), (x + w, y), (x, y + h), (x + w, y + h))]
+        x = min(p[0] for p in points)
+        y = min(p[1] for p in points)
+        w = max(p[0] for p in points) - x
+        h = max(p[1] for p in points) - y
+        win.invalidate((x, y, w, h))
+
     def hide(self):
         '''Hide the widget'''
         self.visible = False
@@ -366,6 +579,9 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
             w.parent = self
         except Exception:
             pass
+        if self._spatial_index is not None:
+            self._spatial_index.add(w, front)
+        w.invalidate()
 
     def add_widgets(self, *widgets):
         for w in widgets:
@@ -375,7 +591,10 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
     def remove_widget(self, w):
         '''Remove a widget from the children list'''
         if w in self.children:
+            w.invalidate()
             self.children.remove(w)
+            if self._spatial_index is not None:
+                self._spatial_index.remove(w)
 
     def on_animation_complete(self, *largs):
         pass
@@ -395,6 +614,11 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
             c.dispatch_event('on_move', x, y)
 
     def on_touch_down(self, touch):
+        if self._spatial_index is not None:
+            for w in self._spatial_index.pick(touch.x, touch.y):
+                if w.dispatch_event('on_touch_down', touch):
+                    return True
+            return
         for w in reversed(self.children[:]):
             if w.dispatch_event('on_touch_down', touch):
                 return True
@@ -435,48 +659,66 @@ class MTWidget(EventDispatcher, metaclass=MTWidgetMetaclass):
     # generate event for all baseobject methods
 
     def _set_pos(self, x):
+        old = self._pos
         if super(MTWidget, self)._set_pos(x):
+            self.invalidate(pos=old)
+            self.invalidate()
             self.dispatch_event('on_move', *self._pos)
             return True
     pos = property(EventDispatcher._get_pos, _set_pos)
 
     def _set_x(self, x):
+        old = self._pos
         if super(MTWidget, self)._set_x(x):
+            self.invalidate(pos=old)
+            self.invalidate()
             self.dispatch_event('on_move', *self._pos)
             return True
     x = property(EventDispatcher._get_x, _set_x)
 
     def _set_y(self, x):
+        old = self._pos
         if super(MTWidget, self)._set_y(x):
+            self.invalidate(pos=old)
+            self.invalidate()
             self.dispatch_event('on_move', *self._pos)
             return True
     y = property(EventDispatcher._get_y, _set_y)
 
     def _set_size(self, x):
+        old = self._size
         if super(MTWidget, self)._set_size(x):
+            self.invalidate(size=old)
+            self.invalidate()
             self.dispatch_event('on_resize', *self._size)
             return True
     size = property(EventDispatcher._get_size, _set_size)
 
     def _set_width(self, x):
+        old = self._size
         if super(MTWidget, self)._set_width(x):
+            self.invalidate(size=old)
+            self.invalidate()
             self.dispatch_event('on_resize', *self._size)
             return True
     width = property(EventDispatcher._get_width, _set_width)
 
     def _set_height(self, x):
+        old = self._size
         if super(MTWidget, self)._set_height(x):
+            self.invalidate(size=old)
+            self.invalidate()
             self.dispatch_event('on_resize', *self._size)
             return True
     height = property(EventDispatcher._get_height, _set_height)
 
 # install acceleration
 try:
-    import types
-    from pymt.accelerate import accelerate
+    from pymt.accelerate import accelerate, accelerate_method
     if accelerate is not None:
-        MTWidget.on_update = types.MethodType(accelerate.widget_on_update, None, MTWidget)
-        MTWidget.on_draw = types.MethodType(accelerate.widget_on_draw, None, MTWidget)
-        MTWidget.collide_point = types.MethodType(accelerate.widget_collide_point, None, MTWidget)
+        accelerate_method(MTWidget, 'on_update', accelerate.widget_on_update)
+        accelerate_method(MTWidget, 'on_draw', accelerate.widget_on_draw)
+        accelerate_method(MTWidget, 'collide_point',
+                          accelerate.widget_collide_point)
 except ImportError as e:
     pymt_logger.warning('Widget: Unable to use accelerate module <%s>' % e)
@@ -17,19 +17,22 @@ from OpenGL.GL import GL_VERSION, GL_FASTEST, GL_NICEST, GL_LINE_SMOOTH, \
         GL_MODELVIEW, GL_PROJECTION, \
         glGetString, glClear, glClearColor, glEnable, glHint, \
         glViewport, glMatrixMode, glLoadIdentity, glFrustum, glScalef, \
-        glTranslatef, glRotatef
+        glTranslatef, glRotatef, GL_SCISSOR_TEST, glScissor, glDisable
+from math import floor, ceil
 
 import pymt
 from pymt.utils import SafeList
 from pymt.logger import pymt_logger
 from pymt.base import getCurrentTouches, setWindow, touch_event_listeners
 from pymt.clock import getClock
-from pymt.graphx import set_color, drawCircle, drawLabel, drawRectangle, drawCSSRectangle
+from pymt.graphx import set_color, drawCircle, drawLabel, drawRectangle, drawCSSRectangle, \
+        CSSStyle
 from pymt.modules import pymt_modules
 from pymt.event import EventDispatcher
 from pymt.ui.colors import css_get_style
 from pymt.ui.factory import MTWidgetFactory
 from pymt.ui.widgets import MTWidget
+from pymt.ui.widgets.widget import identity_affine
 
 class BaseWindow(EventDispatcher):
     '''BaseWindow is a abstract window widget, for any window implementation.
@@ -60,6 +63,16 @@ class BaseWindow(EventDispatcher):
             Height of window
         `vsync`: bool
             Vsync window
+        `redraw`: str, default to 'always'
+            Redraw mode of the window. Can be one of :
+
+            * 'always': the window is redrawn every frame
+            * 'dirty': the window is redrawn only when something changed (a
+              widget moved, was resized, restyled, animated, added or
+              removed, or an input event was dispatched). Widgets that change
+              their look by themselves must call invalidate().
+            * 'scissor': like 'dirty', but only the changed area is redrawn.
+              Widgets must not draw outside their bounding box.
 
     :Styles:
         `bg-color`: color
@@ -71,6 +84,9 @@ class BaseWindow(EventDispatcher):
     _wallpaper = None
     _wallpaper_position = 'norepeat'
 
+    #: Redraw mode, one of 'always', 'dirty', 'scissor'
+    redraw = 'always'
+
     def __new__(cls, **kwargs):
         if cls.__instance is None:
             cls.__instance = EventDispatcher.__new__(cls)
@@ -95,6 +111,12 @@ class BaseWindow(EventDispatcher):
         self._size = (0, 0)
         self._rotation = 0
 
+        # dirty state, the area is (x, y, x2, y2) or None for the whole window
+        self._dirty = True
+        self._dirty_area = None
+        self._last_area = None
+        self._scissor = False
+
         # event subsystem
         self.register_event_type('on_flip')
         self.register_event_type('on_rotate')
@@ -116,7 +138,7 @@ class BaseWindow(EventDispatcher):
         setWindow(self)
 
         # apply styles for window
-        self.style = {}
+        self.style = CSSStyle()
         style = css_get_style(widget=self)
         self.apply_css(style)
 
@@ -183,11 +205,23 @@ class BaseWindow(EventDispatcher):
         else:
             params['left'] = pymt.pymt_config.getint('graphics', 'left')
 
+        if 'redraw' in kwargs:
+            self.redraw = kwargs.get('redraw')
+        else:
+            self.redraw = pymt.pymt_config.get('graphics', 'redraw')
+        if self.redraw not in ('always', 'dirty', 'scissor'):
+            pymt_logger.warning('Window: unknown redraw mode <%s>, '
+                                'use always' % self.redraw)
+            self.redraw = 'always'
+
         # show fps if asked
         self.show_fps = kwargs.get('show_fps')
         if pymt.pymt_config.getboolean('pymt', 'show_fps'):
             self.show_fps = True
 
+        # limit the fps (the window can change it)
+        getClock().max_fps = params['fps']
+
         # configure the window
         self.create_window(params)
 
@@ -225,6 +259,82 @@ class BaseWindow(EventDispatcher):
         '''Dispatch all events from windows'''
         pass
 
+    def invalidate(self, rect=None):
+        '''Ask to redraw the window at the next frame. This is done
+        automaticly by widgets, you need it only if the redraw mode is not
+        'always', and if something change without the knowledge of PyMT.
+
+        :Parameters:
+            `rect` : tuple, default to None
+                Area to redraw, in (x, y, width, height) format, in window
+                coordinates. Used only by the 'scissor' mode. If None, the
+                whole window is redrawn.
+        '''
+        if rect is None or self.redraw != 'scissor':
+            self._dirty_area = None
+        else:
+            x, y, w, h = rect
+            area = (x, y, x + w, y + h)
+            if not self._dirty:
+                self._dirty_area = area
+            elif self._dirty_area is not None:
+                a = self._dirty_area
+                self._dirty_area = (min(a[0], area[0]), min(a[1], area[1]),
+                                    max(a[2], area[2]), max(a[3], area[3]))
+        self._dirty = True
+
+    def need_redraw(self):
+        '''Return True if the window must be redrawn at this frame'''
+        return self._dirty or self.redraw == 'always'
+
+    def begin_redraw(self):
+        '''Called by the main loop before on_draw. Reset the dirty state, and
+        restrict the drawing to the dirty area in 'scissor' mode.'''
+        area = self._dirty_area
+        self._dirty = False
+        self._dirty_area = None
+        if self.redraw != 'scissor':
+            return
+
+        # the back buffer contain the frame before the last one, so the area
+        # changed since the last frame must be redrawn too.
+        last = self._last_area
+        self._last_area = area
+        if area is None or last is None:
+            return
+        area = (min(area[0], last[0]), min(area[1], last[1]),
+                max(area[2], last[2]), max(area[3], last[3]))
+
+        # convert to system coordinates
+        sw, sh = self.system_size
+        points = [self._to_system(area[0], area[1], sw, sh),
+                  self._to_system(area[2], area[3], sw, sh)]
+        x = max(0, int(floor(min(p[0] for p in points))) - 1)
+        y = max(0, int(floor(min(p[1] for p in points))) - 1)
+        x2 = min(sw, int(ceil(max(p[0] for p in points))) + 1)
+        y2 = min(sh, int(ceil(max(p[1] for p in points))) + 1)
+        if x2 <= x or y2 <= y:
+            x = y = x2 = y2 = 0
+        self._scissor = True
+        glEnable(GL_SCISSOR_TEST)
+        glScissor(x, y, x2 - x, y2 - y)
+
+    def end_redraw(self):
+        '''Called by the main loop after on_draw'''
+        if self._scissor:
+            self._scissor = False
+            glDisable(GL_SCISSOR_TEST)
+
+    def _to_system(self, x, y, sw, sh):
+        r = self._rotation
+        if r == 90:
+            return sw - y, x
+        elif r == 180:
+            return sw - x, sh - y
+        elif r == 270:
+            return y, sh - x
+        return x, y
+
     def apply_css(self, styles):
         '''Called at __init__ time to applied css attribute in current class.
         '''
@@ -232,7 +342,7 @@ class BaseWindow(EventDispatcher):
 
     def reload_css(self):
         '''Called when css want to be reloaded from scratch'''
-        self.style = {}
+        self.style = CSSStyle()
         style = css_get_style(widget=self)
         self.apply_css(style)
         if len(self._inline_style):
@@ -310,11 +420,13 @@ class BaseWindow(EventDispatcher):
         '''Add a widget on window'''
         self.children.append(w)
         w.parent = self
+        w.invalidate()
 
     def remove_widget(self, w):
         '''Remove a widget from window'''
         if not w in self.children:
             return
+        w.invalidate()
         self.children.remove(w)
         w.parent = None
 
@@ -375,6 +487,9 @@ class BaseWindow(EventDispatcher):
     def to_widget(self, x, y, initial=True, relative=False):
         return (x, y)
 
+    def to_widget_affine(self):
+        return identity_affine
+
     def to_window(self, x, y, initial=True, relative=False):
         return (x, y)
 
@@ -441,6 +556,7 @@ class BaseWindow(EventDispatcher):
     def on_resize(self, width, height):
         '''Event called when the window is resized'''
         self.update_viewport()
+        self.invalidate()
 
     def update_viewport(self):
         width, height = self.system_size
@@ -6,7 +6,6 @@ __all__ = ('MTWindowPygame', )
 
 import os
 import pymt
-from time import sleep, time
 from pymt.clock import getClock
 from pymt.ui.window import BaseWindow
 from pymt.exceptions import pymt_exception_manager, ExceptionManager
@@ -91,6 +90,13 @@ class MTWindowPygame(BaseWindow):
         if self._vsync and self._fps <= 0:
             self._fps = 60.
 
+        # FIXME: vsync is surely not 60 for everyone
+        # this is not a real vsync. this must be done by driver...
+        # but pygame can't do vsync on X11, and some people
+        # use hack to make it work under darwin...
+        # so limit the fps with the clock.
+        getClock().max_fps = self._fps
+
         # try to use mode with multisamples
         try:
             self._pygame_set_mode()
@@ -136,17 +142,6 @@ class MTWindowPygame(BaseWindow):
         pygame.display.flip()
         super(MTWindowPygame, self).flip()
 
-        # do software vsync if asked
-        # FIXME: vsync is surely not 60 for everyone
-        # this is not a real vsync. this must be done by driver...
-        # but pygame can't do vsync on X11, and some people
-        # use hack to make it work under darwin...
-        fps = self._fps
-        if fps > 0:
-            s = 1 / fps - (time() - getClock().get_time())
-            if s > 0:
-                sleep(s)
-
     def toggle_fullscreen(self):
         if self.flags & pygame.FULLSCREEN:
             self.flags &= ~pygame.FULLSCREEN
@@ -191,6 +186,7 @@ class MTWindowPygame(BaseWindow):
             # keyboard action
             elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
                 self._pygame_update_modifiers(event.mod)
+                self.invalidate()
                 # atm, don't handle keyup
                 if event.type == pygame.KEYUP:
                     self.dispatch_event('on_key_up', event.key,
@@ -208,9 +204,9 @@ class MTWindowPygame(BaseWindow):
             elif event.type == pygame.VIDEORESIZE:
                 pass
 
-            # ignored event
+            # window content may be lost
             elif event.type in (pygame.ACTIVEEVENT, pygame.VIDEOEXPOSE):
-                pass
+                self.invalidate()
 
             # unhandled event !
             else:
@@ -39,7 +39,7 @@ class WeakMethod(object):
             return None
         if self._obj is not None:
             # we have an instance: return a bound method
-            return instancemethod(self._func, self._obj(), self._class)
+            return instancemethod(self._func, self._obj())
         else:
             # we don't have an instance: return just the function
             return self._func
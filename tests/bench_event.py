@@ -37,6 +37,31 @@ Core optimization + accelerate module :
     MTScatterWidget: on_update : Time=0.691, FPS=1447.955
     MTScatterWidget: on_touch_*: Time=16.999, FPS=58.828
 
+The second part bench the dispatcher itself, on 1000 dispatchers having the
+same event types as MTWidget :
+
+Event 'default handler' -> dispatch on_update, no handler connected
+Event 'hidden widgets' -> dispatch on_draw on hidden widgets (unregistered)
+Event 'handler stack' -> dispatch on_update, 3 handlers connected to others
+                         events
+
+With Python 3.11.7 on linux, without accelerate module :
+
+Before dispatch tables (event types in a list, handler stack scan) :
+    default handler: Time=0.067, FPS=2991.696
+    hidden widgets: Time=0.036, FPS=5561.383
+    handler stack: Time=0.104, FPS=1924.302
+
+Dispatch tables (event types in a set, compiled handler stack) :
+    default handler: Time=0.068, FPS=2960.575
+    hidden widgets: Time=0.021, FPS=9638.975
+    handler stack: Time=0.092, FPS=2175.452
+
+Only the hidden widgets and the handler stack cases are faster. The default
+handler is still found with getattr(): calling a function stored in a table
+instead was measured at the same speed (0.196 vs 0.210s for 1000 dispatches
+on 1000 dispatchers).
+
 '''
 
 
@@ -55,9 +80,9 @@ touch = TestTouch(0, 'unknown', (150, 150))
 # override widget
 TestWidget = pymt.%s
 root = TestWidget()
-for x in xrange(10):
+for x in range(10):
     m = TestWidget()
-    for x in xrange(100):
+    for x in range(100):
         m.add_widget(TestWidget())
     root.add_widget(m)
 '''
@@ -79,3 +104,47 @@ for x in ('MTWidget', 'MTLabel', 'MTScatterWidget',):
     print('%s: on_update : Time=%.3f, FPS=%.3f' % (x, t, frames / t))
     t = timeit.Timer(stmt_on_touch_all, stmt_setup % x).timeit(number=frames)
     print('%s: on_touch_*: Time=%.3f, FPS=%.3f' % (x, t, frames / t))
+
+stmt_dispatcher_setup = '''
+import pymt
+
+events = ('on_update', 'on_draw', 'on_touch_up', 'on_touch_move',
+          'on_touch_down', 'on_animation_complete', 'on_resize',
+          'on_parent_resize', 'on_move', 'on_parent')
+
+def handler(*largs):
+    pass
+
+class TestDispatcher(pymt.EventDispatcher):
+    def __init__(self, visible=True, **kwargs):
+        super(TestDispatcher, self).__init__(**kwargs)
+        for event in events:
+            self.register_event_type(event)
+        if not visible:
+            for event in ('on_draw', 'on_touch_up', 'on_touch_move',
+                          'on_touch_down'):
+                self.unregister_event_type(event)
+
+for event in events:
+    setattr(TestDispatcher, event, handler)
+
+visible = [TestDispatcher() for x in range(1000)]
+hidden = [TestDispatcher(visible=False) for x in range(1000)]
+connected = [TestDispatcher() for x in range(1000)]
+for w in connected:
+    w.push_handlers(on_move=handler)
+    w.push_handlers(on_resize=handler)
+    w.push_handlers(on_parent=handler)
+'''
+
+stmt_dispatcher = (
+    ('default handler', "for w in visible: w.dispatch_event('on_update')"),
+    ('hidden widgets', "for w in hidden: w.dispatch_event('on_draw')"),
+    ('handler stack', "for w in connected: w.dispatch_event('on_update')"),
+)
+
+frames = 200
+
+for name, stmt in stmt_dispatcher:
+    t = timeit.Timer(stmt, stmt_dispatcher_setup).timeit(number=frames)
+    print('%s: Time=%.3f, FPS=%.3f' % (name, t, frames / t))
@@ -0,0 +1,87 @@
+'''
+Bench input
+
+This bench measure the path of an input event, from his generation by the
+synthetic provider to his dispatch to the listeners, through
+TouchEventLoop.dispatch_input() and the default postproc modules.
+
+Each workload run 240 frames at 60 FPS. The latency is the time between the
+generation of an event and his dispatch (so it include the wait for the next
+frame, 8ms in average at 60 FPS). Dispatch is the time passed in
+dispatch_input() for one frame.
+
+The latency of a coalesced move is counted from the last one. With tap and
+churn workloads, the up events are held by the retaintouch module until the
+retain time, this is why the latency explode.
+
+With Python 3.11.7 on linux, without accelerate module :
+
+    mode=walk,fingers=10,rate=1000  : Events=4010, Coalesced=1625, Dispatch=0.662ms, Latency mean=4.87ms p50=4.68ms p99=10.01ms max=12.30ms
+    mode=walk,fingers=40,rate=5000  : Events=20040, Coalesced=10400, Dispatch=1.180ms, Latency mean=5.02ms p50=4.99ms p99=10.78ms max=15.47ms
+    mode=pinch,fingers=20,rate=2000 : Events=8176, Coalesced=3356, Dispatch=0.563ms, Latency mean=4.33ms p50=4.06ms p99=9.85ms max=10.63ms
+    mode=tap,fingers=20,rate=2000   : Events=8000, Coalesced=0, Dispatch=1.690ms, Latency mean=90.32ms p50=11.06ms p99=450.53ms max=868.74ms
+    mode=churn,fingers=40,rate=5000 : Events=20068, Coalesced=8172, Dispatch=1.819ms, Latency mean=26.58ms p50=8.55ms p99=138.97ms max=288.23ms
+'''
+
+import os
+import time
+os.environ['PYMT_SHADOW_WINDOW'] = '0'
+
+import pymt
+from pymt import base
+from pymt.clock import getClock
+from pymt.input.postproc import pymt_postproc_modules
+from pymt.input.providers.synthetic import SyntheticTouchProvider
+
+workloads = (
+    'mode=walk,fingers=10,rate=1000',
+    'mode=walk,fingers=40,rate=5000',
+    'mode=pinch,fingers=20,rate=2000',
+    'mode=tap,fingers=20,rate=2000',
+    'mode=churn,fingers=40,rate=5000',
+)
+
+class LatencyListener(object):
+    def __init__(self):
+        self.latencies = []
+
+    def dispatch_event(self, event, touch):
+        self.latencies.append(time.time() - touch.time_event)
+
+def bench(args, frames=240, fps=60.):
+    provider = SyntheticTouchProvider('synthetic', args)
+    listener = LatencyListener()
+    loop = base.TouchEventLoop()
+    for mod in pymt_postproc_modules.values():
+        loop.add_postproc_module(mod.__class__())
+    base.pymt_providers[:] = [provider]
+    base.pymt_event_listeners[:] = [listener]
+
+    provider.start()
+    provider.update(None)
+    dispatch_time = 0
+    deadline = time.time()
+    for frame in range(frames):
+        deadline += 1. / fps
+        remaining = deadline - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+        getClock().tick()
+        start = time.time()
+        loop.dispatch_input()
+        dispatch_time += time.time() - start
+    provider.stop()
+
+    latencies = sorted(listener.latencies)
+    count = len(latencies)
+    if not count:
+        return
+    print('%-32s: Events=%d, Coalesced=%d, Dispatch=%.3fms, '
+          'Latency mean=%.2fms p50=%.2fms p99=%.2fms max=%.2fms' % (
+          args, provider.count, loop.coalesced_events,
+          dispatch_time * 1000. / frames,
+          sum(latencies) * 1000. / count, latencies[count // 2] * 1000.,
+          latencies[int(count * .99)] * 1000., latencies[-1] * 1000.))
+
+for args in workloads:
+    bench(args)
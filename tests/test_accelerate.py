@@ -0,0 +1,120 @@
+'''
+Accelerate module: check that every accelerated function give the same
+result as his python implementation.
+'''
+
+from .init import test, import_pymt_no_window
+
+def _get_accelerate():
+    import_pymt_no_window()
+    from pymt.accelerate import accelerate
+    return accelerate
+
+def unittest_accelerate_dispatch_event():
+    accelerate = _get_accelerate()
+    if accelerate is None:
+        return
+    from pymt import EventDispatcher
+    from pymt.accelerate import python_method
+
+    class MyEventDispatcher(EventDispatcher):
+        def on_test(self, *largs):
+            calls.append(('default', largs))
+
+    class Handler(object):
+        def __init__(self, name, ret=None):
+            self.name = name
+            self.ret = ret
+        def on_test(self, *largs):
+            calls.append((self.name, largs))
+            return self.ret
+
+    global calls
+    results = []
+    for dispatch_event in (python_method(EventDispatcher, 'dispatch_event'),
+                           accelerate.eventdispatcher_dispatch_event):
+        calls = []
+        ret = []
+        a = MyEventDispatcher()
+
+        # unknown event
+        ret.append(dispatch_event(a, 'on_test', 1))
+        a.register_event_type('on_test')
+
+        # default handler only
+        ret.append(dispatch_event(a, 'on_test', 1, 2))
+
+        # handler stack
+        h1 = Handler('h1')
+        h2 = Handler('h2', True)
+        h3 = Handler('h3')
+        a.push_handlers(on_test=h1.on_test)
+        ret.append(dispatch_event(a, 'on_test', 3))
+        a.push_handlers(on_test=h2.on_test)
+        a.push_handlers(on_test=h3.on_test)
+        ret.append(dispatch_event(a, 'on_test'))
+
+        # dead handler
+        del h3
+        ret.append(dispatch_event(a, 'on_test', 4))
+        results.append((calls, ret))
+
+    test(results[0] == results[1])
+
+def unittest_accelerate_widget():
+    accelerate = _get_accelerate()
+    if accelerate is None:
+        return
+    from pymt import MTWidget
+    from pymt.accelerate import python_method
+
+    global calls
+    results = []
+    for on_update, collide_point in (
+        (python_method(MTWidget, 'on_update'),
+         python_method(MTWidget, 'collide_point')),
+        (accelerate.widget_on_update, accelerate.widget_collide_point)):
+
+        calls = []
+        root = MTWidget()
+        for x in range(5):
+            w = MTWidget(id='acc%d' % x, pos=(x * 10, x * 10), size=(20, 20))
+            w.connect('on_update', lambda w=w: calls.append(w.id))
+            root.add_widget(w)
+        root.children[2].visible = False
+        on_update(root)
+
+        collide = []
+        for w in root.children:
+            for x in range(-5, 70, 5):
+                collide.append(collide_point(w, x, x + 1))
+        results.append((calls, collide))
+
+    test(results[0] == results[1])
+
+def unittest_accelerate_touch():
+    accelerate = _get_accelerate()
+    if accelerate is None:
+        return
+    from pymt import Touch
+    from pymt.accelerate import python_method
+
+    class TestTouch(Touch):
+        def depack(self, args):
+            self.sx, self.sy = args
+            super(TestTouch, self).depack(args)
+
+    results = []
+    for scale_for_screen in (python_method(Touch, 'scale_for_screen'),
+                             accelerate.touch_scale_for_screen):
+
+        values = []
+        for rotation in (0, 90, 180, 270):
+            touch = TestTouch('test', 0, (.25, .75))
+            scale_for_screen(touch, 640, 480, rotation=rotation)
+            touch.move((.5, .5))
+            scale_for_screen(touch, 640, 480, p=10, rotation=rotation)
+            values.append((touch.pos, touch.dpos, touch.opos, touch.z))
+        results.append(values)
+
+    test(results[0] == results[1])
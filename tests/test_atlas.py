@@ -0,0 +1,68 @@
+'''
+Glyph atlas
+'''
+
+from .init import test, import_pymt_no_window
+
+class Rasterizer(object):
+    # every glyph is 7x12
+    def get_extents(self, text):
+        return 7 * len(text.replace('\n', '')), 12
+
+def _atlas(**kwargs):
+    from pymt.core.text.atlas import GlyphAtlas
+    options = {'font_size': 12, 'font_name': 'test', 'bold': False,
+               'italic': False}
+    return GlyphAtlas(options, rasterizer=Rasterizer(), **kwargs)
+
+def unittest_atlas_pack():
+    import_pymt_no_window()
+    atlas = _atlas(size=16, max_size=32)
+    atlas.add('ab')
+    test(atlas.glyphs['a'] == (0, 0, 7, 12))
+    test(atlas.glyphs['b'] == (8, 0, 7, 12))
+    test(atlas.get_extents('abba') == (28, 12))
+    test(atlas.generation == 0)
+
+    # no more place, the texture grow and the glyphs keep their place
+    atlas.add('c\nd')
+    test(atlas.height == 32)
+    test(atlas.generation == 1)
+    test(atlas.glyphs['a'] == (0, 0, 7, 12))
+    test(atlas.glyphs['c'] == (0, 13, 7, 12))
+    test(atlas.glyphs['\n'][2] == 0)
+    test(sorted(atlas._pending) == ['a', 'b', 'c', 'd'])
+
+    # at the maximum size, the atlas is cleared
+    test(atlas.add('e') is False)
+    test(atlas.generation == 2)
+    test(sorted(atlas.glyphs.keys()) == ['e'])
+
+    # a text with more glyphs than the cleared atlas can hold: the atlas is
+    # cleared only once, and the last glyphs are not drawn
+    atlas = _atlas(size=16, max_size=32)
+    test(atlas.add('abcdef') is False)
+    test(atlas.generation == 2)
+    test(atlas.glyphs['d'] == (8, 13, 7, 12))
+    test(atlas.glyphs['e'] == (0, 0, 7, 0))
+    test(atlas.glyphs['f'] == (0, 0, 7, 0))
+    test(atlas.get_extents('abcdef') == (42, 12))
+    test(atlas.add('abcdef') is True)
+
+def unittest_atlas_label():
+    import_pymt_no_window()
+    from pymt.core.text.atlas import AtlasLabel
+    atlas = _atlas()
+    label = AtlasLabel('ab\nc', atlas=atlas)
+    test(label.size == (14, 24))
+    # one quad per glyph, the first line on top
+    vertices = label._vertices.reshape(-1, 8)
+    test(len(vertices) == 3)
+    test(list(vertices[0]) == [0, 12, 7, 12, 7, 24, 0, 24])
+    test(list(vertices[2]) == [0, 0, 7, 0, 7, 12, 0, 12])
+
+    # changing the text don't add known glyphs
+    pending = list(atlas._pending)
+    label.label = 'cba'
+    test(atlas._pending == pending)
+    test(label.size == (21, 12))
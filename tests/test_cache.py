@@ -0,0 +1,103 @@
+'''
+Cache
+'''
+
+from .init import test, import_pymt_no_window
+
+def unittest_cache_limit():
+    import_pymt_no_window()
+    from pymt.cache import Cache
+    Cache.register('test.limit', limit=2)
+    Cache.append('test.limit', 'a', 1)
+    Cache.append('test.limit', 'b', 2)
+
+    # access a, so b become the least recently used
+    test(Cache.get('test.limit', 'a') == 1)
+    Cache.append('test.limit', 'c', 3)
+    test(Cache.get('test.limit', 'b') is None)
+    test(Cache.get('test.limit', 'a') == 1)
+    test(Cache.get('test.limit', 'c') == 3)
+    test(len(Cache._objects['test.limit']) == 2)
+
+def unittest_cache_size():
+    import_pymt_no_window()
+    from pymt.cache import Cache
+    Cache.register('test.size', max_size=10)
+    Cache.append('test.size', 'a', 'aaaa')
+    Cache.append('test.size', 'b', 'bbbb')
+    test(Cache.get_size('test.size') == 8)
+    Cache.append('test.size', 'c', 'cccc')
+    test(Cache.get('test.size', 'a') is None)
+    test(Cache.get_size('test.size') == 8)
+    Cache.append('test.size', 'd', None, size=6)
+    test(Cache.get('test.size', 'b') is None)
+    test(Cache.get('test.size', 'c') == 'cccc')
+    test(Cache.get_size('test.size') == 10)
+    Cache.remove('test.size', 'd')
+    test(Cache.get_size('test.size') == 4)
+
+def unittest_cache_timeout():
+    import_pymt_no_window()
+    from pymt.cache import Cache
+    from pymt.clock import getClock
+    Cache.register('test.timeout', timeout=1)
+    Cache.append('test.timeout', 'a', 1)
+    Cache.append('test.timeout', 'b', 2, timeout=10)
+    now = getClock().get_time()
+
+    # simulate the clock
+    getClock()._last_tick = now + 2
+    Cache._purge_by_timeout(0)
+    test(Cache.get('test.timeout', 'a') is None)
+    test(Cache.get('test.timeout', 'b') == 2)
+
+    getClock()._last_tick = now + 20
+    Cache._purge_by_timeout(0)
+    test(Cache.get('test.timeout', 'b') is None)
+    getClock()._last_tick = now
+
+def unittest_cache_stats():
+    import_pymt_no_window()
+    from pymt.cache import Cache
+    Cache.register('test.stats', limit=1)
+    Cache.append('test.stats', 'a', 1)
+    Cache.get('test.stats', 'a')
+    Cache.get('test.stats', 'b')
+    Cache.append('test.stats', 'b', 2)
+    stats = Cache.stats('test.stats')
+    test(stats['count'] == 1)
+    test(stats['hits'] == 1)
+    test(stats['misses'] == 1)
+    test(stats['hit_rate'] == .5)
+    test(stats['evictions'] == 1)
+    test('test.stats' in Cache.stats())
+    Cache.reset_stats('test.stats')
+    test(Cache.stats('test.stats')['hit_rate'] is None)
+
+def unittest_cache_release():
+    import_pymt_no_window()
+    import gc
+    import weakref
+    from pymt.cache import Cache
+
+    class Obj(object):
+        pass
+
+    # removed and evicted objects must not be kept alive by the timeouts
+    Cache.register('test.release', limit=1, timeout=10)
+    obj = Obj()
+    ref = weakref.ref(obj)
+    Cache.append('test.release', 'a', obj)
+    del obj
+    Cache.remove('test.release', 'a')
+    gc.collect()
+    test(ref() is None)
+
+    obj = Obj()
+    ref = weakref.ref(obj)
+    Cache.append('test.release', 'a', obj)
+    del obj
+    Cache.append('test.release', 'b', Obj())
+    gc.collect()
+    test(ref() is None)
+    test(Cache.get('test.release', 'b') is not None)
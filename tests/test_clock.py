@@ -0,0 +1,163 @@
+'''
+Clock
+'''
+
+from .init import test, import_pymt_no_window
+
+def unittest_clock_schedule():
+    import_pymt_no_window()
+    from pymt.clock import Clock
+
+    global counter
+    counter = {'once': 0, 'interval': 0, 'far': 0}
+
+    def once(dt):
+        counter['once'] += 1
+
+    def interval(dt):
+        counter['interval'] += 1
+
+    def far(dt):
+        counter['far'] += 1
+
+    clock = Clock()
+    clock.schedule_once(once)
+    clock.schedule_interval(interval, 0)
+    clock.schedule_interval(far, 3600)
+
+    clock.tick()
+    clock.tick()
+    test(counter['once'] == 1)
+    test(counter['interval'] == 2)
+    test(counter['far'] == 0)
+    test(clock.get_next_deadline() is not None)
+
+def unittest_clock_unschedule():
+    import_pymt_no_window()
+    from pymt.clock import Clock
+
+    global counter
+    counter = [0]
+
+    def callback(dt):
+        counter[0] += 1
+
+    class Obj(object):
+        def callback(self, dt):
+            counter[0] += 1
+
+    clock = Clock()
+
+    # unschedule by callback
+    clock.schedule_interval(callback, 0)
+    clock.unschedule(callback)
+    clock.tick()
+    test(counter[0] == 0)
+
+    # unschedule bound method, with another instance still scheduled
+    a, b = Obj(), Obj()
+    clock.schedule_interval(a.callback, 0)
+    clock.schedule_interval(b.callback, 0)
+    # each instance have his own handles
+    test(len(clock._handles) == 2)
+    clock.unschedule(a.callback)
+    clock.tick()
+    test(counter[0] == 1)
+
+    # unschedule by handle
+    clock.unschedule(b.callback)
+    event = clock.schedule_interval(callback, 0)
+    event.cancel()
+    clock.tick()
+    test(counter[0] == 1)
+    test(clock.get_next_deadline() is None)
+    test(clock._handles == {})
+
+def unittest_clock_weakmethod():
+    import_pymt_no_window()
+    from pymt.clock import Clock
+
+    global counter
+    counter = [0]
+
+    class Obj(object):
+        def callback(self, dt):
+            counter[0] += 1
+
+    clock = Clock()
+    a = Obj()
+    clock.schedule_interval(a.callback, 0)
+    clock.tick()
+    test(counter[0] == 1)
+
+    # object is gone, the event must be removed
+    del a
+    clock.tick()
+    test(counter[0] == 1)
+    test(clock.get_next_deadline() is None)
+
+def unittest_clock_return_false():
+    import_pymt_no_window()
+    from pymt.clock import Clock
+
+    global counter
+    counter = [0]
+
+    def callback(dt):
+        counter[0] += 1
+        return False
+
+    clock = Clock()
+    clock.schedule_interval(callback, 0)
+    clock.tick()
+    clock.tick()
+    test(counter[0] == 1)
+
+def unittest_clock_max_fps():
+    import_pymt_no_window()
+    import time
+    from pymt.clock import Clock
+
+    clock = Clock()
+    test(clock.get_next_timeout() is None)
+    clock.schedule_once(lambda dt: None, 10)
+    test(9 < clock.get_next_timeout() <= 10)
+
+    # 5 frames at 50 fps take at least 80ms
+    clock.max_fps = 50
+    clock.tick()
+    start = time.time()
+    for x in range(4):
+        clock.tick()
+    test(time.time() - start >= 0.075)
+
+    # no limit
+    clock.max_fps = 0
+    start = time.time()
+    for x in range(4):
+        clock.tick()
+    test(time.time() - start < 0.075)
+
+def unittest_clock_order():
+    import_pymt_no_window()
+    from pymt.clock import Clock
+
+    called = []
+    def make_callback(index):
+        def callback(dt):
+            called.append(index)
+        return callback
+
+    # events with the same deadline are called in the scheduling order
+    clock = Clock()
+    for index in range(20):
+        clock.schedule_once(make_callback(index), 0)
+    clock.tick()
+    test(called == list(range(20)))
+
+    del called[:]
+    for index in range(20):
+        clock.schedule_interval(make_callback(index), 0)
+    clock.tick()
+    clock.tick()
+    test(called == list(range(20)) * 2)
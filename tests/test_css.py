@@ -45,3 +45,23 @@ def unittest_css_multiclass():
     ''')
     l = MTLabel(label = 'test', cls=('test1', 'test2'))
     test(l.style['font-size'] == 24)
+
+def unittest_css_fingerprint():
+    import_pymt_no_window()
+    from pymt import MTWidget
+    from pymt.graphx.css import CSSStyle, css_style_fingerprint
+    style = CSSStyle({'bg-color': [1, 0, 0, 1], 'draw-border': 1})
+    fingerprint = style.fingerprint
+    hash(fingerprint)
+    test(style.fingerprint is fingerprint)
+    test(css_style_fingerprint(dict(style)) == fingerprint)
+    style['bg-color'] = [0, 1, 0, 1]
+    test(style.fingerprint != fingerprint)
+    style['bg-color'] = [1, 0, 0, 1]
+    test(style.fingerprint == fingerprint)
+    del style['draw-border']
+    test(style.fingerprint != fingerprint)
+    w = MTWidget()
+    fingerprint = w.style.fingerprint
+    w.apply_css({'bg-color': (0, 0, 1, 1)})
+    test(w.style.fingerprint != fingerprint)
@@ -0,0 +1,78 @@
+'''
+Event loop
+'''
+
+from .init import test, import_pymt_no_window
+
+def unittest_eventloop_coalesce():
+    import_pymt_no_window()
+    from pymt.base import TouchEventLoop
+
+    class Touch(object):
+        def __init__(self, uid):
+            self.uid = uid
+
+    class Recorder(object):
+        def process(self, events):
+            self.events = events
+            return []
+
+    loop = TouchEventLoop()
+    recorder = Recorder()
+    loop.add_postproc_module(recorder)
+
+    a, b = Touch(1), Touch(2)
+    for event, touch in (('down', a), ('move', a), ('down', b), ('move', a),
+                         ('move', b), ('move', a), ('up', a), ('move', b)):
+        loop._dispatch_input(event, touch)
+    loop.dispatch_input()
+
+    # duplicated moves are removed, order of each touch is kept
+    test(recorder.events == [('down', a), ('move', a), ('down', b),
+                             ('move', b), ('up', a)])
+    test(loop.coalesced_events == 3)
+
+    # next frame start with an empty queue
+    loop._dispatch_input('move', b)
+    loop.dispatch_input()
+    test(recorder.events == [('move', b)])
+    test(loop.coalesced_events == 3)
+
+def unittest_eventloop_latency():
+    import_pymt_no_window()
+    import time
+    from pymt.base import TouchEventLoop, setLatencyTracer
+    from pymt.modules.latency import InputLatencyTracer
+
+    class Touch(object):
+        grab_exclusive_class = None
+        grab_state = False
+        def __init__(self, uid, received):
+            self.uid = uid
+            self.time_event = received
+            self.grab_list = []
+
+    tracer = InputLatencyTracer()
+    loop = TouchEventLoop()
+    now = time.time()
+    a, b = Touch(1, now - 0.0205), Touch(2, now - 0.0105)
+    loop._dispatch_input('down', a)
+    loop._dispatch_input('down', b)
+    setLatencyTracer(tracer)
+    try:
+        loop.dispatch_input()
+    finally:
+        setLatencyTracer(None)
+
+    test(tracer.count('postproc') == 2)
+    test(tracer.count('dispatch') == 2)
+    test(tracer.count('flip') == 0)
+    p0, p100 = tracer.percentiles('postproc', (0, 100))
+    test(0.01 < p0 < 0.02 and 0.02 < p100 < 0.03)
+    test(tracer.under('dispatch', 0.015) == 0.5)
+
+    # events wait the next flip
+    tracer.flip()
+    test(tracer.count('flip') == 2)
+    tracer.flip()
+    test(tracer.count('flip') == 2)
@@ -71,3 +71,53 @@ def unittest_dispatcher():
     test('nohandler' and not testpass)
 
 
+
+def unittest_dispatcher_stack():
+    import_pymt_no_window()
+    from pymt import EventDispatcher
+
+    class MyEventDispatcher(EventDispatcher):
+        def on_test(self, *largs):
+            calls.append('default')
+
+    class Handler(object):
+        def __init__(self, name, stop=False):
+            self.name = name
+            self.stop = stop
+        def on_test(self, *largs):
+            calls.append(self.name)
+            return self.stop
+
+    global calls
+    calls = []
+
+    a = MyEventDispatcher()
+    a.register_event_type('on_test')
+    h1 = Handler('h1')
+    h2 = Handler('h2')
+    a.push_handlers(on_test=h1.on_test)
+    a.push_handlers(on_test=h2.on_test)
+
+    # top of the stack first, then the default handler
+    a.dispatch_event('on_test')
+    test(calls == ['h2', 'h1', 'default'])
+
+    # handler returning True stop the propagation
+    calls = []
+    h3 = Handler('h3', stop=True)
+    a.push_handlers(on_test=h3.on_test)
+    test(a.dispatch_event('on_test') == True)
+    test(calls == ['h3'])
+
+    # dead handlers are removed
+    calls = []
+    del h3
+    a.dispatch_event('on_test')
+    test(calls == ['h2', 'h1', 'default'])
+
+    # unregistered event is not dispatched
+    calls = []
+    a.unregister_event_type('on_test')
+    a.dispatch_event('on_test')
+    test(calls == [])
+    test('on_test' not in a.event_types)
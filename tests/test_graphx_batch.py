@@ -0,0 +1,62 @@
+'''
+Graphx batch
+'''
+
+from .init import test, import_pymt_no_window, import_pymt_window
+
+def unittest_graphx_batch_runs():
+    import_pymt_no_window()
+    from OpenGL.GL import GL_QUADS, GL_POLYGON, GL_LINE_LOOP, GL_LINES, \
+            GL_TRIANGLES, GL_POINTS
+    from pymt.graphx.batch import GraphxBatch
+
+    batch = GraphxBatch()
+    batch.color = (1, 0, 0, 1)
+    # a quad is drawn with 2 triangles
+    test(batch.add(GL_QUADS, (0, 0, 10, 0, 10, 10, 0, 10)))
+    batch.color = (0, 1, 0, .5)
+    test(batch.add(GL_POLYGON, (0, 0, 10, 0, 10, 10, 5, 15, 0, 10)))
+    # a loop of 4 points is drawn with 4 segments
+    test(batch.add(GL_LINE_LOOP, (0, 0, 10, 0, 10, 10, 0, 10), linewidth=2))
+    test(batch.add(GL_LINES, (0, 0, 10, 10),
+                   colors=(1, 1, 1, 1, 0, 0, 0, 1), linewidth=2))
+    test(batch.add(GL_LINES, (0, 0, 10, 10), linewidth=3))
+
+    runs = batch._runs
+    test([(mode, width) for mode, width, v, c in runs] == [
+        (GL_TRIANGLES, None), (GL_LINES, 2), (GL_LINES, 3)])
+    test([sum(len(v) for v in run[2]) for run in runs] == [6 + 9, 8 + 2, 2])
+    test(runs[0][2][0].tolist() == [[0, 0], [10, 0], [10, 10],
+                                    [0, 0], [10, 10], [0, 10]])
+    test(runs[0][3][0].tolist() == [[1, 0, 0, 1]] * 6)
+    test(runs[0][3][1].tolist() == [[0, 1, 0, .5]] * 9)
+    test(runs[1][2][0][-2:].tolist() == [[0, 10], [0, 0]])
+    test(runs[1][3][1].tolist() == [[1, 1, 1, 1], [0, 0, 0, 1]])
+    test(batch.primitive_count == 5)
+
+    # unsupported primitives are not batched
+    batch._runs = []
+    test(not batch.add(GL_POINTS, (0, 0)))
+
+def unittest_graphx_batch_draw():
+    import_pymt_window()
+    from pymt import gx_batch, gx_color, set_color, drawRectangle, drawLine
+    from OpenGL.GL import GL_TRIANGLES, GL_LINES
+
+    set_color(1, 0, 0)
+    batch = gx_batch()
+    with batch:
+        drawRectangle(pos=(0, 0), size=(10, 10))
+        with gx_color(0, 1, 0):
+            drawLine((0, 0, 10, 10), width=2)
+        # the color is restored after gx_color
+        drawRectangle(pos=(10, 10), size=(10, 10))
+        runs = batch._runs
+        test([(mode, width) for mode, width, v, c in runs] == [
+            (GL_TRIANGLES, None), (GL_LINES, 2), (GL_TRIANGLES, None)])
+        test([c[0][0].tolist() for m, w, v, c in runs] == [
+            [1, 0, 0, 1], [0, 1, 0, 1], [1, 0, 0, 1]])
+        test(runs[2][2][0][0].tolist() == [10, 10])
+    # everything is drawn at the end of the batch
+    test(batch._runs == [])
+    test(batch.draw_count == 3)
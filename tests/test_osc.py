@@ -0,0 +1,46 @@
+'''
+OSC decoder
+'''
+
+from .init import test, import_pymt_no_window
+
+def _pad(data):
+    return data + b'\0' * (4 - len(data) % 4)
+
+def unittest_osc_fast_decoder():
+    import_pymt_no_window()
+    import struct
+    from pymt.lib.osc.OSC import decodeOSC, fastDecodeOSC, \
+            decodeOSCMessages, CallbackManager
+
+    alive = _pad(b'/tuio/2Dcur') + _pad(b',sii') + _pad(b'alive') + \
+            struct.pack('>ii', 1, 2)
+    cur = _pad(b'/tuio/2Dcur') + _pad(b',sifffff') + _pad(b'set') + \
+          struct.pack('>ifffff', 1, .5, .25, 0, 0, 0)
+    blob = _pad(b'/blob') + _pad(b',bd') + struct.pack('>i', 3) + b'abc\0' + \
+           struct.pack('>d', 1.5)
+    bundle = _pad(b'#bundle') + struct.pack('>q', 1)
+    for message in (alive, cur, blob):
+        bundle += struct.pack('>i', len(message)) + message
+
+    test(fastDecodeOSC(cur) == ['/tuio/2Dcur', ',sifffff', 'set', 1,
+                                .5, .25, 0., 0., 0.])
+    test(fastDecodeOSC(blob) == ['/blob', ',bd', b'abc', 1.5])
+    for packet in (alive, cur, blob, bundle):
+        test(fastDecodeOSC(packet) == decodeOSC(packet))
+
+    # bundles are flattened
+    test(decodeOSCMessages(bundle) == [decodeOSC(alive), decodeOSC(cur),
+                                       decodeOSC(blob)])
+
+    # truncated packets are given to the reference decoder
+    test(fastDecodeOSC(cur[:-4]) == decodeOSC(cur[:-4]))
+
+    received = []
+    manager = CallbackManager()
+    manager.add(lambda message, source: received.append(message[2]),
+                '/tuio/2Dcur')
+    manager.add(lambda message, source: received.append(message[2]),
+                '/blob')
+    manager.handle(bundle)
+    test(received == ['alive', 'set', b'abc'])
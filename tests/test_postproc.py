@@ -0,0 +1,131 @@
+'''
+Input postproc
+'''
+
+from .init import test, import_pymt_no_window
+
+class _Touch(object):
+    uid = 0
+    def __init__(self, sx, sy):
+        _Touch.uid += 1
+        self.uid = _Touch.uid
+        self.sx, self.sy = sx, sy
+        self.x, self.y = sx * 100, sy * 100
+        self.device = 'test'
+        self.time_event = 0
+        self.userdata = {}
+
+def _touches(*positions):
+    return [_Touch(*pos) for pos in positions]
+
+def unittest_postproc_batch():
+    import_pymt_no_window()
+    from pymt.input.postproc.batch import InputEventBatch, \
+            EVENT_DOWN, EVENT_MOVE, EVENT_UP
+
+    a, b, c = _touches((0.1, 0.2), (0.3, 0.4), (0.5, 0.6))
+    batch = InputEventBatch([('down', a), ('move', b), ('up', c)])
+    test(batch.types.tolist() == [EVENT_DOWN, EVENT_MOVE, EVENT_UP])
+    test(batch.ids.tolist() == [a.uid, b.uid, c.uid])
+    test(batch.pos.tolist() == [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]])
+
+    # select keep the columns
+    selected = batch.select(batch.pos[:, 0] > 0.2)
+    test(selected.events == [('move', b), ('up', c)])
+    test(selected.ids.tolist() == [b.uid, c.uid])
+
+    selected.replace(0, a)
+    test(selected.events == [('move', a), ('up', c)])
+    test(selected.pos[0].tolist() == [0.1, 0.2])
+
+    selected.extend([('down', b)])
+    test(selected.types.tolist() == [EVENT_MOVE, EVENT_UP, EVENT_DOWN])
+    test(len(selected) == 3)
+
+def unittest_postproc_dejitter():
+    import_pymt_no_window()
+    from pymt.input.postproc.dejitter import InputPostprocDejitter
+
+    mod = InputPostprocDejitter()
+    mod.jitterdist = 0.01
+    mod.ignore_devices = ['mouse']
+    a, b, c = _touches((0.5, 0.5), (0.2, 0.2), (0.8, 0.8))
+    c.device = 'mouse'
+    mod.process([('down', a), ('down', b), ('down', c)])
+
+    # only the touches that moved more than the jitter distance are kept
+    a.sx += 0.005
+    b.sx += 0.05
+    c.sx += 0.001
+    test(mod.process([('move', a), ('move', b), ('move', c)]) ==
+         [('move', b), ('move', c)])
+    a.sx += 0.01
+    test(mod.process([('move', a), ('up', b)]) == [('move', a), ('up', b)])
+    test(list(mod.last_touches.keys()) == [a.uid])
+
+    # the moves of a frame are checked one after the other, a touch without
+    # down is accepted
+    d, = _touches((0.3, 0.3))
+    a.sx += 0.005
+    test(mod.process([('move', d), ('move', a)]) == [('move', d)])
+    a.sx += 0.01
+    test(mod.process([('move', a), ('move', a)]) == [('move', a)])
+
+def unittest_postproc_ignorelist():
+    import_pymt_no_window()
+    from pymt.input.postproc.ignorelist import InputPostprocIgnoreList
+
+    mod = InputPostprocIgnoreList()
+    mod.ignore_list = [(0.1, 0.1, 0.15, 0.15)]
+    a, b = _touches((0.12, 0.12), (0.5, 0.5))
+    test(mod.process([('down', a), ('down', b)]) == [('down', b)])
+    test(mod.process([('move', a), ('move', b), ('up', a)]) == [('move', b)])
+
+def unittest_postproc_retaintouch():
+    import_pymt_no_window()
+    import time
+    from pymt.input.postproc.retaintouch import InputPostprocRetainTouch
+
+    mod = InputPostprocRetainTouch()
+    mod.timeout = 0.05
+    a, far = _touches((0.3, 0.3), (0.9, 0.9))
+    test(mod.process([('down', a), ('down', far)]) == [('down', a), ('down', far)])
+    test(mod.process([('up', a), ('up', far)]) == [])
+
+    # a new touch near the retained one continue it
+    b, c = _touches((0.31, 0.31), (0.6, 0.6))
+    test(mod.process([('down', b), ('down', c)]) == [('down', c)])
+    b.sx = 0.4
+    test(mod.process([('move', b)]) == [('move', a)])
+    test(a.sx == 0.4)
+
+    # the other retained touch expire
+    time.sleep(0.06)
+    test(mod.process([]) == [('up', far)])
+
+def unittest_postproc_doubletap():
+    import_pymt_no_window()
+    from pymt.input.postproc.doubletap import InputPostprocDoubleTap
+    from pymt.clock import getClock
+
+    mod = InputPostprocDoubleTap()
+    mod.double_tap_distance = 0.02
+    mod.double_tap_time = 3600
+    a, b, c, d = _touches((0.8, 0.8), (0.81, 0.8), (0.5, 0.5), (0.805, 0.8))
+    for touch in (a, b, c, d):
+        touch.osxpos, touch.osypos = touch.sx, touch.sy
+        touch.is_double_tap = False
+        touch.time_start = getClock().get_time()
+    mod.process([('down', a), ('down', b)])
+    mod.process([('up', a), ('up', b)])
+
+    # the nearest ended touch is used
+    mod.process([('down', d), ('down', c)])
+    test(d.is_double_tap)
+    test(abs(d.double_tap_distance - 0.005) < 1e-9)
+    test(not c.is_double_tap)
+
+    # ended touches are forgotten after the double tap time
+    mod.double_tap_time = 0
+    mod.process([])
+    test(mod.touches == {})
@@ -0,0 +1,128 @@
+'''
+Profiler
+'''
+
+from .init import test, import_pymt_no_window
+
+def unittest_profiler_counters():
+    import_pymt_no_window()
+    from pymt.modules.profiler import FrameProfiler
+
+    counter = [0]
+    profiler = FrameProfiler(frames=10,
+                             counters={'compiled': lambda: counter[0]})
+    for compiled in (3, 0, 0, 1):
+        profiler.frame_start()
+        counter[0] += compiled
+        profiler.mark('draw')
+        profiler.frame_end()
+
+    # the counter is kept per frame
+    test([x['compiled'] for x in profiler.frames] == [3, 0, 0, 1])
+    test(profiler.percentiles('compiled', (50, 100)) == [1, 3])
+    report = profiler.report()
+    test('Counter (per frame)' in report)
+    test('compiled' in report)
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.
+    def __call__(self):
+        return self.now
+
+def unittest_profiler_phases():
+    import_pymt_no_window()
+    import pymt.modules.profiler as profiler_module
+    from pymt.modules.profiler import FrameProfiler
+
+    clock = FakeClock()
+    perf_counter = profiler_module.perf_counter
+    profiler_module.perf_counter = clock
+    try:
+        profiler = FrameProfiler(frames=3)
+        # the 1st frame is dropped from the ring buffer
+        for draw in (9., 1., 2., 3.):
+            profiler.frame_start()
+            clock.now += .5
+            profiler.mark('input')
+            clock.now += draw
+            profiler.mark('draw')
+            # a phase marked twice in a frame is accumulated
+            clock.now += .25
+            profiler.mark('input')
+            profiler.frame_end()
+    finally:
+        profiler_module.perf_counter = perf_counter
+
+    test(len(profiler.frames) == 3)
+    test(profiler.phases == ['input', 'draw'])
+    test([x['input'] for x in profiler.frames] == [.75] * 3)
+    test([x['draw'] for x in profiler.frames] == [1., 2., 3.])
+    test([x['frame'] for x in profiler.frames] == [1.75, 2.75, 3.75])
+    test(profiler.percentiles('draw') == [2., 3., 3.])
+    test(profiler.percentiles('draw', (0, 100)) == [1., 3.])
+    test(profiler.percentiles('unknown') == [0, 0, 0])
+    # marks outside of a frame are ignored
+    profiler.mark('input')
+    test(len(profiler.frames) == 3)
+    report = profiler.report()
+    test('draw' in report and 'input' in report and 'frame' in report)
+
+def unittest_profiler_dispatch():
+    import_pymt_no_window()
+    import pymt.modules.profiler as profiler_module
+    from pymt.modules.profiler import DispatchProfiler
+    from pymt.event import EventDispatcher
+
+    clock = FakeClock()
+
+    class Child(EventDispatcher):
+        def __init__(self):
+            super(Child, self).__init__()
+            self.register_event_type('on_test')
+        def on_test(self):
+            clock.now += 2.
+
+    class Parent(EventDispatcher):
+        def __init__(self):
+            super(Parent, self).__init__()
+            self.register_event_type('on_test')
+            self.id = 'root'
+            self.child = Child()
+        def on_test(self):
+            clock.now += 1.
+            self.child.dispatch_event('on_test')
+            self.child.dispatch_event('on_test')
+            clock.now += 3.
+
+    parent = Parent()
+    perf_counter = profiler_module.perf_counter
+    profiler_module.perf_counter = clock
+    profiler = DispatchProfiler()
+    profiler.start()
+    try:
+        parent.dispatch_event('on_test')
+    finally:
+        profiler.stop()
+        profiler_module.perf_counter = perf_counter
+
+    # the time of the children is inclusive for the parent, not exclusive
+    test(profiler.stats[('on_test', 'Parent', 'root')] == [1, 8., 4.])
+    test(profiler.stats[('on_test', 'Child', None)] == [2, 4., 4.])
+    test(profiler.stacks == {
+        'on_test:Parent#root': 4.,
+        'on_test:Parent#root;on_test:Child': 4.})
+
+    import os
+    import tempfile
+    fd, filename = tempfile.mkstemp(suffix='.folded')
+    os.close(fd)
+    try:
+        profiler.dump_collapsed(filename)
+        with open(filename) as fd:
+            lines = fd.read().splitlines()
+    finally:
+        os.unlink(filename)
+    test(lines == ['on_test:Parent#root 4000000',
+                   'on_test:Parent#root;on_test:Child 4000000'])
+    test('Parent#root' in profiler.report())
@@ -0,0 +1,167 @@
+'''
+Input provider
+'''
+
+from .init import test, import_pymt_no_window
+
+def unittest_ringbuffer():
+    import_pymt_no_window()
+    from pymt.input.provider import TouchRingBuffer
+    from pymt.input.postproc.batch import EVENT_DOWN, EVENT_MOVE, EVENT_UP
+
+    rb = TouchRingBuffer(size=4)
+    test(rb.pop() == [])
+    for i in range(3):
+        rb.push(EVENT_DOWN, i, 0.1 * i, 0.5)
+    test([e[:4] for e in rb.pop()] ==
+         [(0, EVENT_DOWN, 0., 0.5), (1, EVENT_DOWN, 0.1, 0.5),
+          (2, EVENT_DOWN, 0.2, 0.5)])
+
+    # the records wrap around the end of the buffer. the last record is
+    # kept for the down and up events.
+    for i in range(3):
+        test(rb.push(EVENT_MOVE, i, 0.5, 0.5))
+    test(not rb.push(EVENT_MOVE, 3, 0.5, 0.5))
+    test(rb.push(EVENT_UP, 3))
+    test(len(rb) == 4)
+
+    # when the buffer is full, the events are dropped without waiting
+    test(not rb.push(EVENT_UP, 4))
+    test(rb.dropped == 2)
+
+    # the records are read in place, and stay until they are consumed
+    views = rb.peek()
+    test(len(views) == 2)
+    test([i for v in views for i in v['id'].tolist()] == [0, 1, 2, 3])
+    test(views[0].base is rb.records)
+    test(len(rb) == 4)
+    rb.consume(4)
+    test(len(rb) == 0)
+
+    rb.push(EVENT_UP, 0)
+    x, y = rb.pop()[0][2:4]
+    test(x != x and y != y)
+
+def unittest_dispatch_ringbuffer():
+    import_pymt_no_window()
+    from pymt.input.provider import TouchProvider, TouchRingBuffer
+    from pymt.input.postproc.batch import EVENT_DOWN, EVENT_MOVE, EVENT_UP
+
+    class _Touch(object):
+        def __init__(self, device, id, args):
+            self.device, self.id = device, id
+            self.moves = []
+            self.depack(args)
+        def depack(self, args):
+            self.sx, self.sy = args['x'], args['y']
+            self.pressure = args.get('pressure')
+        def move(self, args):
+            self.moves.append((args['x'], args['y']))
+            self.depack(args)
+
+    class _Provider(TouchProvider):
+        pass
+
+    provider = _Provider('test', None)
+    rb = TouchRingBuffer()
+    rb.push(EVENT_DOWN, 7, 0.1, 0.2, 0.5)
+    rb.push(EVENT_MOVE, 7, 0.3, 0.4)
+    rb.push(EVENT_MOVE, 8, 0.3, 0.4)
+    rb.push(EVENT_UP, 7)
+
+    dispatched = []
+    provider.dispatch_ringbuffer(rb, lambda *x: dispatched.append(x), _Touch)
+    test([t for t, touch in dispatched] == ['down', 'move', 'up'])
+    touch = dispatched[0][1]
+    test(all(t is touch for _, t in dispatched))
+    test(touch.device == 'test' and touch.id == 7)
+    test(touch.moves == [(0.3, 0.4)])
+    test(touch.pressure is None)
+    test(provider._ringbuffer_touches == {})
+
+def unittest_record_replay():
+    import_pymt_no_window()
+    import os
+    import time
+    import tempfile
+    from pymt.input.recorder import InputRecorder, load_trace
+    from pymt.input.providers.replay import ReplayTouchProvider
+    from pymt.input.postproc.batch import InputEventBatch
+    from pymt.clock import getClock
+
+    class _Touch(object):
+        def __init__(self, uid, sx, sy):
+            self.uid, self.sx, self.sy = uid, sx, sy
+
+    fd, filename = tempfile.mkstemp(suffix='.trace')
+    os.close(fd)
+    try:
+        a, b = _Touch(1, 0.25, 0.5), _Touch(2, 0.75, 0.5)
+        recorder = InputRecorder(filename)
+        batch = InputEventBatch([('down', a), ('down', b)])
+        test(recorder.process_batch(batch) is batch)
+        a.sx = 0.5
+        time.sleep(0.01)
+        getClock().tick()
+        recorder.process([('move', a), ('up', a), ('up', b)])
+        recorder.close()
+
+        records = load_trace(filename)
+        test(len(records) == 5)
+        test(records['id'].tolist() == [1, 2, 1, 1, 2])
+        test(records['sx'].tolist() == [0.25, 0.75, 0.5, 0.5, 0.75])
+
+        # in fast mode, one recorded frame is replayed per update
+        provider = ReplayTouchProvider('replay', filename + ',fast')
+        provider.start()
+        events = []
+        dispatch = lambda event, touch: events.append((event, touch.id, touch.sx))
+        provider.update(dispatch)
+        test(events == [('down', 1, 0.25), ('down', 2, 0.75)])
+        provider.update(dispatch)
+        test(events[2:] == [('move', 1, 0.5), ('up', 1, 0.5), ('up', 2, 0.75)])
+        test(provider.touches == {})
+        provider.stop()
+    finally:
+        os.unlink(filename)
+
+def unittest_synthetic():
+    import_pymt_no_window()
+    from pymt.input.providers.synthetic import SyntheticTouchProvider
+
+    def run(args, count):
+        provider = SyntheticTouchProvider('synthetic', args)
+        events = []
+        provider.generate(count, 10., 11., lambda event, touch:
+                          events.append((event, touch.id, touch.sx, touch.sy,
+                                         touch.time_event)))
+        return provider, events
+
+    # fingers are put down first, then moved
+    provider, events = run('mode=walk,fingers=4', 8)
+    test([e[0] for e in events] == ['down'] * 4 + ['move'] * 8)
+    test(len(provider.touches) == 4)
+    test(all(0 <= e[2] <= 1 and 0 <= e[3] <= 1 for e in events))
+    test(events[-1][4] == 11.)
+
+    # same seed, same events
+    test(run('mode=walk,fingers=4', 8)[1] == events)
+    test(run('mode=walk,fingers=4,seed=1', 8)[1] != events)
+
+    provider, events = run('mode=pinch,fingers=3', 4)
+    test(len(provider.touches) == 4)
+
+    # taps alternate down and up
+    provider, events = run('mode=tap,fingers=2', 4)
+    test([e[0] for e in events] == ['down', 'down', 'up', 'up'])
+    test(provider.touches == [])
+
+    provider, events = run('mode=churn,fingers=5,churn=1', 4)
+    test([e[0] for e in events[5:]] == ['up', 'down', 'up', 'down'])
+    test(len(provider.touches) == 5)
+
+    # invalid values fall back to the defaults
+    for mode in SyntheticTouchProvider.modes:
+        provider, events = run('mode=%s,fingers=0,rate=-1' % mode, 4)
+        test(provider.fingers >= 1 and provider.rate == 1000.)
+        test(len(events) >= 4)
@@ -0,0 +1,34 @@
+'''
+Spatial index
+'''
+
+from .init import test, import_pymt_no_window
+
+def unittest_spatialgrid():
+    import_pymt_no_window()
+    from pymt.spatialindex import SpatialGrid
+
+    grid = SpatialGrid(cell_size=10)
+    grid.update('a', 0, 0, 15, 15)
+    grid.update('b', 12, 12, 20, 20)
+    grid.update('c', -100, -100, 5000, 5000)
+    test(len(grid) == 3)
+    test(sorted(grid.query(5, 5)) == ['a', 'c'])
+    test(sorted(grid.query(14, 14)) == ['a', 'b', 'c'])
+    test(sorted(grid.query(25, 25)) == ['b', 'c'])
+
+    # move and remove
+    grid.update('a', 100, 100, 10, 10)
+    test(sorted(grid.query(5, 5)) == ['c'])
+    test(sorted(grid.query(105, 105)) == ['a', 'c'])
+    grid.remove('c')
+    grid.remove('c')
+    test('c' not in grid)
+    test(grid.query(5, 5) == [])
+
+    # negative size
+    grid.update('d', 50, 50, -20, -20)
+    test(grid.query(40, 40) == ['d'])
+    grid.clear()
+    test(len(grid) == 0)
+    test(grid.query(40, 40) == [])
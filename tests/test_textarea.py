@@ -168,3 +168,45 @@ def unittest_mttextarea_basics():
     test(len(t.lines) == 12)
     test(int(t.height) == 322)
     test(int(t.width) == 809)
+
+def unittest_mttextarea_edit():
+    t = instance()
+    test(t is not None)
+    if t is None:
+        return
+
+    t.value = 'first paragraph, long enough to be wrapped\nsecond\nthird'
+    t.cursor = t.get_cursor_from_index(len('first paragraph, long'))
+    t.insert_text(' text\nnew')
+    t.cursor = t.get_cursor_from_index(len(t.value))
+    t.do_backspace()
+    value = 'first paragraph, long text\nnew enough to be wrapped\nsecond\nthir'
+    test(t.value == value)
+
+    # the lines edited in place are the same as a full layout
+    ref = instance()
+    ref.value = value
+    test(t.lines == ref.lines)
+    test(t.lines_flags == ref.lines_flags)
+    test(t.line_widths == ref.line_widths)
+
+    # labels are created only when the lines are drawn
+    test(t.line_labels.count(None) == len(t.lines))
+
+def unittest_mttextarea_edit_relayout():
+    # a paragraph ending with a delimiter must not wrap in an empty line
+    # when it's splitted alone. try all the widths to hit the limit.
+    for width in range(40, 200):
+        t = instance(size=(width, 100))
+        if t is None:
+            test(False)
+            return
+        t.value = 've\nyxwrdrword, \na\nverv '
+        t.cursor = t.get_cursor_from_index(3)
+        t.insert_text('a')
+        ref = instance(size=(width, 100))
+        ref.value = t.value
+        if t.lines != ref.lines or t.lines_flags != ref.lines_flags:
+            break
+    test(t.lines == ref.lines)
+    test(t.lines_flags == ref.lines_flags)
@@ -0,0 +1,52 @@
+'''
+Touch
+'''
+
+from .init import test, import_pymt_no_window
+
+def _touch_class():
+    from pymt.input.touch import Touch
+
+    class TestTouch(Touch):
+        __attrs__ = ('pressure', )
+        def depack(self, args):
+            self.sx, self.sy = args
+            super(TestTouch, self).depack(args)
+
+    return TestTouch
+
+def unittest_touch_push_pop():
+    import_pymt_no_window()
+    touch = _touch_class()('test', 1, (0.5, 0.25))
+    touch.scale_for_screen(400, 400)
+    test(touch.pos == (200, 100))
+
+    touch.push()
+    touch.apply_transform_2d(lambda x, y: (x - 10, y - 20))
+    test(touch.pos == (190, 80))
+    test(touch.opos == (190, 80))
+    touch.push(('x', ))
+    touch.x = 0
+    touch.pop()
+    test(touch.pos == (190, 80))
+    touch.pop()
+    test(touch.pos == (200, 100))
+    test(touch.opos == (200, 100))
+    test(touch.attr == [])
+
+def unittest_touch_attributes():
+    import_pymt_no_window()
+    TestTouch = _touch_class()
+    touch = TestTouch('test', 1, (0.5, 0.25))
+
+    # declared attributes are slots, others are still accepted
+    test('pressure' in TestTouch.__slots__)
+    test('pressure' in TestTouch.__attrs__)
+    touch.pressure = 1.
+    touch.custom = 'value'
+    test(touch.custom == 'value')
+
+    other = TestTouch('test', 2, (0, 0))
+    touch.copy_to(other)
+    test(other.pressure == 1.)
+    test(other.spos == (0.5, 0.25))
@@ -99,3 +99,176 @@ def unittest_coordinate_transform():
     # 100, 100 relative coordinate from child2 is 400, 400 in screen coordinate
     test(child2.to_window(100, 100, relative=True) == (400, 400))
 
+
+def unittest_spatial_index():
+    import_pymt_no_window()
+    from pymt import MTWidget
+
+    class Touch(object):
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    class Item(MTWidget):
+        def on_touch_down(self, touch):
+            calls.append(self.id)
+            return self.collide_point(touch.x, touch.y)
+
+    global calls
+    calls = []
+    root = MTWidget(spatial_index=True)
+    a = Item(id='a', pos=(0, 0), size=(100, 100))
+    b = Item(id='b', pos=(50, 50), size=(100, 100))
+    c = Item(id='c', pos=(500, 500), size=(100, 100))
+    root.add_widgets(a, b, c)
+
+    # only the children under the touch are tested, from top to bottom
+    test(root.dispatch_event('on_touch_down', Touch(75, 75)))
+    test(calls == ['b'])
+    calls = []
+    test(root.dispatch_event('on_touch_down', Touch(25, 25)))
+    test(calls == ['a'])
+
+    # z-order is updated
+    calls = []
+    a.bring_to_front()
+    root.dispatch_event('on_touch_down', Touch(75, 75))
+    test(calls == ['a'])
+
+    # index follow position and size
+    calls = []
+    c.pos = (0, 0)
+    b.size = (10, 10)
+    root.dispatch_event('on_touch_down', Touch(125, 125))
+    test(calls == [])
+    root.dispatch_event('on_touch_down', Touch(75, 75))
+    test(calls == ['a'])
+
+    # removed widget are not tested anymore
+    calls = []
+    root.remove_widget(a)
+    root.dispatch_event('on_touch_down', Touch(75, 75))
+    test(calls == ['c'])
+    a.pos = (1000, 1000)
+    test(a._event_stack is None)
+
+    # disable the index
+    calls = []
+    root.spatial_index = False
+    root.dispatch_event('on_touch_down', Touch(1000, 1000))
+    test(calls == ['c', 'b'])
+
+def unittest_spatial_index_scatter():
+    import_pymt_no_window()
+    from pymt import MTWidget, MTScatter
+
+    # a scatter update the index when his transformation change
+    root = MTWidget(spatial_index=True)
+    s = MTScatter(pos=(0, 0), size=(100, 100))
+    root.add_widget(s)
+    test(root._spatial_index.pick(50, 50) == [s])
+    s.pos = (500, 500)
+    test(root._spatial_index.pick(50, 50) == [])
+    test(root._spatial_index.pick(550, 550) == [s])
+
+def unittest_invalidate():
+    import_pymt_no_window()
+    from pymt import MTWidget, getWindow, setWindow
+
+    class Window(object):
+        redraw = 'scissor'
+        def __init__(self):
+            self.areas = []
+        def invalidate(self, rect=None):
+            self.areas.append(rect)
+        def to_window(self, x, y, initial=True, relative=False):
+            return (x, y)
+
+    oldwindow = getWindow()
+    win = Window()
+    setWindow(win)
+    try:
+        root = MTWidget()
+        root.parent = win
+        w = MTWidget(pos=(10, 10), size=(20, 20))
+
+        # widget outside of the tree are not redrawn
+        w.pos = (20, 20)
+        test(win.areas == [])
+
+        root.add_widget(w)
+        test(win.areas == [(20, 20, 20, 20)])
+
+        # old and new area are redrawn, nothing if no changes
+        win.areas = []
+        w.pos = (30, 20)
+        w.pos = (30, 20)
+        test(win.areas == [(20, 20, 20, 20), (30, 20, 20, 20)])
+        win.areas = []
+        w.width = 40
+        test(win.areas == [(30, 20, 20, 20), (30, 20, 40, 20)])
+
+        # visibility and removal
+        win.areas = []
+        w.visible = False
+        root.remove_widget(w)
+        test(len(win.areas) == 2)
+
+        # no dirty tracking in always mode
+        win.areas = []
+        win.redraw = 'always'
+        root.add_widget(w)
+        w.pos = (0, 0)
+        test(win.areas == [])
+    finally:
+        setWindow(oldwindow)
+
+def unittest_to_widget_affine():
+    import_pymt_no_window()
+    from pymt import MTWidget, MTScatter
+    from pymt.lib.transformations import rotation_matrix, scale_matrix
+
+    def apply(m, x, y):
+        return m[0] * x + m[1] * y + m[2], m[3] * x + m[4] * y + m[5]
+
+    def near(a, b):
+        return abs(a[0] - b[0]) < 1e-9 and abs(a[1] - b[1]) < 1e-9
+
+    root = MTWidget()
+    s1 = MTScatter(pos=(100, 50))
+    s1.apply_transform(rotation_matrix(0.5, (0, 0, 1)))
+    root.add_widget(s1)
+    s2 = MTScatter(pos=(30, -20))
+    s2.apply_transform(scale_matrix(2.))
+    s1.add_widget(s2)
+    w = MTWidget()
+    s2.add_widget(w)
+
+    # same result as to_widget, matrix is cached
+    m = w.to_widget_affine()
+    test(near(apply(m, 321., 123.), w.to_widget(321., 123.)))
+    test(w.to_widget_affine() is m)
+
+    # a change in a parent transformation invalidate it
+    s1.apply_transform(scale_matrix(0.5))
+    m = w.to_widget_affine()
+    test(near(apply(m, 321., 123.), w.to_widget(321., 123.)))
+
+    # only the widgets under the transformed scatter are invalidated
+    other = MTScatter()
+    root.add_widget(other)
+    o = MTWidget()
+    other.add_widget(o)
+    mo = o.to_widget_affine()
+    other.apply_transform(scale_matrix(2.))
+    test(w.to_widget_affine() is m)
+    test(o.to_widget_affine() is not mo)
+    test(near(apply(o.to_widget_affine(), 10., 20.), o.to_widget(10., 20.)))
+
+    # unknown transformations are not cached
+    class CustomWidget(MTWidget):
+        def to_local(self, x, y, **k):
+            return x * 2, y
+    c = CustomWidget()
+    s2.add_widget(c)
+    c.add_widget(w)
+    test(w.to_widget_affine() is None)